@@ -0,0 +1,237 @@
+"""
+Asynchronous Ingest -> Scoring -> Reporting Pipeline
+
+run_integrated_system handles one faculty member at a time, strictly in
+sequence: read the CSV, predict, write stress_output.txt, then let the
+expert system read it back. For whole rosters this module runs the same
+steps as four concurrent asyncio stages joined by bounded queues:
+
+    ingest   read (and validate) the CSV in chunks
+    infer    batched model inference
+    rules    WSS / formula level and wellness report rendering
+    write    append results and reports to their files
+
+Each stage runs its blocking work on its own single-thread executor, so
+file I/O, parsing and inference overlap (pandas parsing and the sklearn
+tree walk release the GIL). A full queue makes the upstream stage wait,
+so at most `queue_size` chunks per queue are in memory, and throughput
+is set by the slowest stage rather than the sum of all four.
+
+Usage:
+    python async_pipeline.py <workload.csv> <results.csv> [--reports reports.txt]
+                             [--format text|jsonl] [--chunk-size 20000] [--queue-size 4]
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from report_renderer import BatchReportRenderer
+from validation import FrameValidator, write_quarantine
+
+STAGES = ('ingest', 'infer', 'rules', 'write')
+_DONE = object()
+
+
+class PipelineStats:
+    """Rows processed and busy seconds per stage"""
+
+    def __init__(self):
+        self.rows = 0
+        self.rejected = 0
+        self.chunks = 0
+        self.busy = dict.fromkeys(STAGES, 0.0)
+        self.elapsed = 0.0
+
+    @property
+    def bottleneck(self):
+        return max(self.busy, key=self.busy.get)
+
+    def summary(self):
+        stages = ", ".join(f"{stage} {seconds:.2f}s" for stage, seconds in self.busy.items())
+        rate = self.rows / self.elapsed if self.elapsed > 0 else float('inf')
+        return (f"{self.rows} rows in {self.elapsed:.2f}s ({rate:,.0f}/sec); "
+                f"busy: {stages}; bottleneck: {self.bottleneck}")
+
+
+class AsyncScoringPipeline:
+    """
+    Bounded-queue pipeline from a workload CSV to results and reports
+
+    Args:
+        predictor: FacultyStressPredictor with a loaded model
+        renderer: BatchReportRenderer (default: a new one)
+        chunk_size: rows per chunk
+        queue_size: chunks buffered between two stages
+        validate: run FrameValidator on every chunk
+        quarantine: CSV receiving rejected rows
+    """
+
+    def __init__(self, predictor, renderer=None, chunk_size=20000, queue_size=4,
+                 validate=True, quarantine=None):
+        self.predictor = predictor
+        self.renderer = renderer or BatchReportRenderer()
+        self.chunk_size = chunk_size
+        self.queue_size = queue_size
+        self.validator = FrameValidator() if validate else None
+        self.quarantine = quarantine
+        self.stats = PipelineStats()
+
+    async def _timed(self, stage, executor, func, *args):
+        """Run blocking work on the stage's executor and account its time"""
+        loop = asyncio.get_running_loop()
+        start = time.perf_counter()
+        try:
+            return await loop.run_in_executor(executor, func, *args)
+        finally:
+            self.stats.busy[stage] += time.perf_counter() - start
+
+    def _read_chunk(self, reader):
+        chunk = next(reader, None)
+        if chunk is None or self.validator is None:
+            return chunk
+        result = self.validator.validate(chunk)
+        if result.rejected_count:
+            self.stats.rejected += result.rejected_count
+            if self.quarantine:
+                write_quarantine(result.rejected, self.quarantine)
+        return result.valid
+
+    async def _ingest(self, reader, executor, out):
+        while True:
+            chunk = await self._timed('ingest', executor, self._read_chunk, reader)
+            if chunk is None:
+                break
+            if len(chunk):
+                await out.put(chunk)
+        await out.put(_DONE)
+
+    async def _infer(self, executor, inbox, out):
+        while (chunk := await inbox.get()) is not _DONE:
+            labels = await self._timed('infer', executor, self.predictor.predict, chunk)
+            await out.put((chunk, labels))
+        await out.put(_DONE)
+
+    def _apply_rules(self, chunk, labels, fmt):
+        wss = self.predictor.calculate_wss_batch(chunk)
+        result = pd.DataFrame({
+            'Faculty_ID': chunk['Faculty_ID'].values,
+            'Stress_Level': labels,
+            'WSS': wss,
+            'Formula_Level': self.predictor.get_stress_levels_from_wss_batch(wss),
+        })
+        reports = None
+        if fmt is not None:
+            reports = "".join(self.renderer.iter_reports(zip(result['Faculty_ID'], labels), fmt))
+        return result, reports
+
+    async def _rules(self, executor, inbox, out, fmt):
+        while (item := await inbox.get()) is not _DONE:
+            result = await self._timed('rules', executor, self._apply_rules, *item, fmt)
+            await out.put(result)
+        await out.put(_DONE)
+
+    def _write(self, results_file, reports_file, result, reports, header):
+        buffer = io.StringIO()
+        result.to_csv(buffer, index=False, header=header)
+        results_file.write(buffer.getvalue())
+        if reports_file is not None:
+            reports_file.write(reports)
+
+    async def _write_stage(self, executor, inbox, results_file, reports_file):
+        header = True
+        while (item := await inbox.get()) is not _DONE:
+            result, reports = item
+            await self._timed('write', executor, self._write, results_file, reports_file,
+                              result, reports, header)
+            header = False
+            self.stats.rows += len(result)
+            self.stats.chunks += 1
+
+    async def run(self, input_path, results_path, reports_path=None, fmt='text'):
+        """
+        Score a workload CSV into a results CSV (and optional reports file)
+
+        Returns:
+            PipelineStats
+        """
+        start = time.perf_counter()
+        queues = [asyncio.Queue(self.queue_size) for _ in range(3)]
+        report_format = fmt if reports_path else None
+        with contextlib.ExitStack() as stack:
+            reader = stack.enter_context(pd.read_csv(input_path, chunksize=self.chunk_size))
+            results_file = stack.enter_context(open(results_path, 'w', newline='', encoding='utf-8'))
+            reports_file = None
+            if reports_path:
+                reports_file = stack.enter_context(
+                    open(reports_path, 'w', encoding='utf-8', buffering=1 << 20))
+            executors = {stage: ThreadPoolExecutor(1, thread_name_prefix=f'pipeline-{stage}')
+                         for stage in STAGES}
+            # Registered after the files, so the executors shut down before
+            # the files close: a cancelled stage's thread may still be using them
+            for executor in executors.values():
+                stack.callback(executor.shutdown, wait=True)
+            tasks = [
+                asyncio.create_task(self._ingest(reader, executors['ingest'], queues[0])),
+                asyncio.create_task(self._infer(executors['infer'], queues[0], queues[1])),
+                asyncio.create_task(self._rules(executors['rules'], queues[1], queues[2],
+                                                report_format)),
+                asyncio.create_task(self._write_stage(executors['write'], queues[2],
+                                                      results_file, reports_file)),
+            ]
+            try:
+                await asyncio.gather(*tasks)
+            except BaseException:
+                # A failed stage would leave its neighbours waiting on a queue
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+                raise
+        self.stats.elapsed = time.perf_counter() - start
+        return self.stats
+
+
+def run_pipeline(predictor, input_path, results_path, reports_path=None, fmt='text', **kwargs):
+    """Run AsyncScoringPipeline to completion from synchronous code"""
+    pipeline = AsyncScoringPipeline(predictor, **kwargs)
+    return asyncio.run(pipeline.run(input_path, results_path, reports_path, fmt))
+
+
+def main():
+    """Main entry point"""
+    from stress_predictor import FacultyStressPredictor
+
+    parser = argparse.ArgumentParser(description="Concurrent ingest/score/report pipeline")
+    parser.add_argument('input', help="Workload CSV with Faculty_ID")
+    parser.add_argument('output', help="Results CSV")
+    parser.add_argument('--reports', help="Also write wellness reports to this file")
+    parser.add_argument('--format', choices=('text', 'jsonl'), default='text')
+    parser.add_argument('--chunk-size', type=int, default=20000)
+    parser.add_argument('--queue-size', type=int, default=4)
+    parser.add_argument('--quarantine', help="Append rejected rows to this CSV")
+    parser.add_argument('--model', default='stress_model.joblib')
+    args = parser.parse_args()
+
+    predictor = FacultyStressPredictor()
+    with contextlib.redirect_stdout(sys.stderr):
+        predictor.load_model(args.model)
+    try:
+        stats = run_pipeline(predictor, args.input, args.output, args.reports, args.format,
+                             chunk_size=args.chunk_size, queue_size=args.queue_size,
+                             quarantine=args.quarantine)
+    except ValueError as e:
+        sys.exit(f"Error: {e}")
+    print(stats.summary())
+    if stats.rejected:
+        print(f"Rejected rows: {stats.rejected}")
+    print(f"Results saved to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
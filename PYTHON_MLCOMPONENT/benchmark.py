@@ -0,0 +1,317 @@
+"""
+Benchmark Suite for the Faculty Stress Detection Pipeline
+
+Runs every pipeline stage at increasing row counts and records wall time,
+throughput, peak RSS and traced allocations. Each (stage, rows) case runs
+in a fresh interpreter so memory figures are not polluted by earlier
+cases. Results are stored as JSON and can be compared against a saved
+baseline; the exit code is 1 if any case regressed beyond the threshold.
+
+Usage:
+    python benchmark.py [--sizes 250,10000,1000000,5000000] [--stages predict,train_model]
+                        [--repeat 3] [--output benchmark_results.json]
+                        [--baseline baseline.json] [--threshold 0.10]
+                        [--max-rows predict_with_details=10000] [--no-caps] [--no-alloc]
+
+Per-row stages (e.g. predict_with_details, generate_prolog_output) have
+default row caps so a full run finishes in reasonable time; larger sizes
+for those stages are recorded as skipped unless --no-caps or --max-rows
+raises the cap.
+"""
+
+import argparse
+import concurrent.futures
+import contextlib
+import json
+import multiprocessing
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_SIZES = [250, 10000, 1000000, 5000000]
+
+# Largest row count each stage runs at by default (None = no cap)
+DEFAULT_MAX_ROWS = {
+    'generate_faculty_data': 1000000,
+    'calculate_wss': 1000000,
+    'train_model': 1000000,
+    'predict': None,
+    'predict_with_details': 10000,
+    'generate_prolog_output': 10000,
+    'generate_report': 1000000,
+}
+STAGES = list(DEFAULT_MAX_ROWS)
+
+
+def make_workload_frame(rows):
+    """Reproducible labeled workload data of any size, tiled from the generator"""
+    from generate_dataset import generate_faculty_data
+
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        base = generate_faculty_data(250, balanced=True)
+    df = base.iloc[np.resize(np.arange(len(base)), rows)].reset_index(drop=True)
+    df['Faculty_ID'] = [f"F{i:07d}" for i in range(rows)]
+    return df
+
+
+def _setup_stage(stage, rows, work_dir):
+    """Build the inputs for a stage; returns a zero-argument callable to time"""
+    from generate_dataset import generate_faculty_data
+    from records import RecordBatch
+    from stress_predictor import FacultyStressPredictor
+    from wellness_expert_python import WellnessExpertSystem
+
+    if stage == 'generate_faculty_data':
+        return lambda: generate_faculty_data(rows, balanced=True)
+
+    predictor = FacultyStressPredictor()
+    df = make_workload_frame(rows)
+
+    if stage == 'calculate_wss':
+        return lambda: df.apply(predictor.calculate_wss, axis=1)
+
+    if stage == 'train_model':
+        X, y = df[predictor.feature_columns], df['Stress_Level']
+        return lambda: predictor.train_model(X, y, model_type='random_forest')
+
+    if stage == 'generate_report':
+        expert_system = WellnessExpertSystem()
+        records = list(zip(df['Faculty_ID'], df['Stress_Level'].str.lower()))
+
+        def run_reports():
+            for faculty_id, stress_level in records:
+                expert_system.generate_report(faculty_id, stress_level)
+        return run_reports
+
+    predictor.load_model(os.path.join(SCRIPT_DIR, 'stress_model.joblib'))
+    # Keep generate_prolog_output's writes inside the scratch directory
+    predictor.script_dir = os.path.join(work_dir, 'PYTHON_MLCOMPONENT')
+    os.makedirs(predictor.script_dir, exist_ok=True)
+
+    if stage == 'predict':
+        return lambda: predictor.predict(df)
+
+    if stage == 'predict_with_details':
+        records = list(RecordBatch.from_frame(df))
+
+        def run_details():
+            for record in records:
+                predictor.predict_with_details(record)
+        return run_details
+
+    if stage == 'generate_prolog_output':
+        records = list(zip(df['Faculty_ID'], df['Stress_Level']))
+
+        def run_outputs():
+            for faculty_id, stress_level in records:
+                predictor.generate_prolog_output(faculty_id, stress_level)
+        return run_outputs
+
+    raise ValueError(f"Unknown stage '{stage}'. Choose from: {', '.join(STAGES)}")
+
+
+def _max_rss_mb():
+    """Peak resident set size of this process so far, in MB (None on Windows)"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS reports bytes
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def run_case(stage, rows, repeat, trace_allocations):
+    """Measure one (stage, rows) case; runs inside a fresh worker process"""
+    import warnings
+    warnings.simplefilter('ignore')
+
+    work_dir = tempfile.mkdtemp(prefix='stress_bench_')
+    try:
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            run = _setup_stage(stage, rows, work_dir)
+            rss_before = _max_rss_mb()
+
+            timings = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                run()
+                timings.append(time.perf_counter() - start)
+            rss_peak = _max_rss_mb()
+
+            alloc_peak_mb = None
+            alloc_blocks = None
+            if trace_allocations:
+                tracemalloc.start()
+                run()
+                _, peak = tracemalloc.get_traced_memory()
+                snapshot = tracemalloc.take_snapshot()
+                tracemalloc.stop()
+                alloc_peak_mb = peak / (1024 * 1024)
+                alloc_blocks = sum(stat.count for stat in snapshot.statistics('filename'))
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    wall = min(timings)
+    return {
+        'stage': stage,
+        'rows': rows,
+        'status': 'ok',
+        'wall_s': round(wall, 6),
+        'wall_s_all': [round(t, 6) for t in timings],
+        'throughput_rows_per_s': round(rows / wall, 1) if wall > 0 else None,
+        'peak_rss_mb': None if rss_peak is None else round(rss_peak, 1),
+        'rss_growth_mb': None if rss_peak is None else round(rss_peak - rss_before, 1),
+        'alloc_peak_mb': None if alloc_peak_mb is None else round(alloc_peak_mb, 2),
+        'alloc_live_blocks': alloc_blocks,
+    }
+
+
+def run_suite(stages, sizes, max_rows, repeat=3, trace_allocations=True):
+    """Run every requested case, each in its own interpreter"""
+    results = []
+    context = multiprocessing.get_context('spawn')
+    for stage in stages:
+        for rows in sizes:
+            cap = max_rows.get(stage)
+            if cap is not None and rows > cap:
+                results.append({'stage': stage, 'rows': rows, 'status': 'skipped',
+                                'reason': f"above row cap {cap}"})
+                print(f"{stage:24s} {rows:>10,d}  skipped (cap {cap:,d})")
+                continue
+
+            with concurrent.futures.ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+                try:
+                    result = pool.submit(run_case, stage, rows, repeat, trace_allocations).result()
+                except Exception as e:
+                    result = {'stage': stage, 'rows': rows, 'status': 'error', 'reason': repr(e)}
+            results.append(result)
+            print(format_result(result))
+    return results
+
+
+def format_result(result):
+    """One-line summary of a case result"""
+    if result['status'] != 'ok':
+        return f"{result['stage']:24s} {result['rows']:>10,d}  {result['status']}: {result.get('reason', '')}"
+    alloc = '' if result['alloc_peak_mb'] is None else f"  alloc {result['alloc_peak_mb']:8.1f} MB"
+    if result['peak_rss_mb'] is None:
+        rss = "RSS      n/a"
+    else:
+        rss = f"RSS {result['peak_rss_mb']:8.1f} MB (+{result['rss_growth_mb']:.1f})"
+    return (f"{result['stage']:24s} {result['rows']:>10,d}  {result['wall_s']:9.4f}s  "
+            f"{result['throughput_rows_per_s']:>13,.0f} rows/s  {rss}{alloc}")
+
+
+def environment_info():
+    """Versions and host details stored with every result file"""
+    import sklearn
+    return {
+        'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'sklearn': sklearn.__version__,
+    }
+
+
+def compare_to_baseline(results, baseline, threshold):
+    """
+    Compare wall times against a baseline run
+
+    Args:
+        results: list of case results from this run
+        baseline: parsed baseline JSON (same layout as written by this script)
+        threshold: allowed relative slowdown, e.g. 0.10 for 10%
+
+    Returns:
+        List of (stage, rows, baseline_s, current_s, change) for regressions
+    """
+    previous = {
+        (r['stage'], r['rows']): r for r in baseline.get('results', []) if r.get('status') == 'ok'
+    }
+    regressions = []
+    print(f"\n{'='*70}")
+    print(f"Comparison against baseline (threshold {threshold:.0%})")
+    print(f"{'='*70}")
+    for result in results:
+        old = previous.get((result['stage'], result['rows']))
+        if result['status'] != 'ok' or old is None:
+            continue
+        change = result['wall_s'] / old['wall_s'] - 1 if old['wall_s'] > 0 else 0.0
+        flag = 'REGRESSION' if change > threshold else 'ok'
+        print(f"{result['stage']:24s} {result['rows']:>10,d}  {old['wall_s']:9.4f}s -> "
+              f"{result['wall_s']:9.4f}s  {change:+7.1%}  {flag}")
+        if change > threshold:
+            regressions.append((result['stage'], result['rows'], old['wall_s'], result['wall_s'], change))
+    return regressions
+
+
+def parse_max_rows(overrides, no_caps):
+    """Apply --max-rows stage=N overrides to the default caps"""
+    max_rows = {stage: None for stage in STAGES} if no_caps else dict(DEFAULT_MAX_ROWS)
+    for override in overrides:
+        stage, _, value = override.partition('=')
+        if stage not in max_rows or not value:
+            raise SystemExit(f"Invalid --max-rows '{override}'. Use stage=N with a stage from: {', '.join(STAGES)}")
+        max_rows[stage] = None if value.lower() == 'none' else int(value)
+    return max_rows
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description="Faculty stress pipeline benchmark suite")
+    parser.add_argument('--sizes', default=','.join(str(s) for s in DEFAULT_SIZES),
+                        help="Comma-separated row counts")
+    parser.add_argument('--stages', default=','.join(STAGES), help="Comma-separated stages")
+    parser.add_argument('--repeat', type=int, default=3, help="Timed runs per case (best is kept)")
+    parser.add_argument('--output', default='benchmark_results.json')
+    parser.add_argument('--baseline', help="Previous results JSON to compare against")
+    parser.add_argument('--threshold', type=float, default=0.10,
+                        help="Relative slowdown that counts as a regression")
+    parser.add_argument('--max-rows', action='append', default=[], metavar='STAGE=N',
+                        help="Override a stage's row cap (N or 'none')")
+    parser.add_argument('--no-caps', action='store_true', help="Run every stage at every size")
+    parser.add_argument('--no-alloc', action='store_true', help="Skip the tracemalloc pass")
+    args = parser.parse_args()
+
+    sizes = [int(s) for s in args.sizes.split(',') if s]
+    stages = [s for s in args.stages.split(',') if s]
+    unknown = [s for s in stages if s not in STAGES]
+    if unknown:
+        raise SystemExit(f"Unknown stage(s): {', '.join(unknown)}. Choose from: {', '.join(STAGES)}")
+
+    print("="*70)
+    print("  Faculty Stress Pipeline Benchmark")
+    print("="*70)
+    results = run_suite(stages, sizes, parse_max_rows(args.max_rows, args.no_caps),
+                        repeat=args.repeat, trace_allocations=not args.no_alloc)
+
+    report = {'environment': environment_info(), 'repeat': args.repeat, 'results': results}
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults saved to: {os.path.abspath(args.output)}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare_to_baseline(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) above {args.threshold:.0%}")
+            sys.exit(1)
+        print("\nNo regressions.")
+
+
+if __name__ == "__main__":
+    main()
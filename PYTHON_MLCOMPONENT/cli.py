@@ -0,0 +1,406 @@
+"""
+Faculty Stress Detector - Non-interactive Batch CLI
+
+Processes whole files (or stdin/stdout streams) in one process so that
+schedulers do not pay interpreter start-up and model load per faculty.
+Diagnostics and timing go to stderr; data goes to the output file or
+stdout.
+
+Usage:
+    python cli.py train [--data dataset_with_labels.csv] [--model-type random_forest]
+    python cli.py score <input.csv|-> <output.csv|-> [--probabilities] [--workers N]
+                        [--quarantine rejected.csv] [--drift-report drift.json]
+                        [--store prediction_store.npz] [--explain]
+    python cli.py report <results.csv|-> [--output reports.txt|-] [--format text|jsonl]
+    python cli.py evaluate [--data dataset_with_labels.csv]
+    python cli.py serve [--format text|jsonl] < workload_rows.csv
+    python cli.py pipeline <input.csv> <results.csv> [--reports reports.txt] [--format text|jsonl]
+
+Global options (before the subcommand):
+    --registry DIR           use the registry's current model; `serve` also
+                             hot-swaps to newly published versions
+    --metrics metrics.prom   write latency histograms and counters on exit
+    --profile                sample stacks for the whole run (or send SIGUSR1)
+
+`score` writes Faculty_ID,Stress_Level rows that `report` reads directly:
+    python cli.py score dataset.csv - | python cli.py report -
+"""
+
+import argparse
+import contextlib
+import csv
+import json
+import select
+import signal
+import sys
+import time
+
+import pandas as pd
+
+from async_pipeline import run_pipeline
+from drift_monitor import format_report as format_drift_report
+from explanations import explain_frame
+from incremental_scoring import IncrementalScorer
+from metrics import METRICS
+from model_registry import ModelRegistry, RegistryWatcher
+from parallel_scoring import ParallelScorer
+from report_renderer import BatchReportRenderer
+from validation import REASON_COLUMN, FrameValidator, write_quarantine
+from stress_predictor import FacultyStressPredictor
+from wellness_expert_python import WellnessExpertSystem
+
+DEFAULT_MODEL = 'stress_model.joblib'
+DEFAULT_DATA = 'dataset_with_labels.csv'
+
+
+def log(message):
+    """Print a diagnostic line to stderr"""
+    print(message, file=sys.stderr)
+
+
+def log_throughput(label, count, elapsed):
+    """Print item count, elapsed time and rate to stderr"""
+    rate = count / elapsed if elapsed > 0 else float('inf')
+    log(f"{label}: {count} in {elapsed:.3f}s ({rate:,.0f}/sec)")
+
+
+def load_predictor(args, follow=False):
+    """
+    Load the model once, keeping the predictor's chatter off stdout
+
+    With --registry the current registry version is used; follow=True
+    keeps a background watcher swapping in newly published versions.
+    """
+    predictor = FacultyStressPredictor()
+    start = time.perf_counter()
+    if args.registry:
+        watcher = RegistryWatcher(predictor, ModelRegistry(args.registry),
+                                  on_swap=lambda v: log(f"Model registry: now serving {v}"))
+        if not watcher.check():
+            sys.exit(f"Error: registry {args.registry} has no published model")
+        if follow:
+            watcher.start()
+    else:
+        with contextlib.redirect_stdout(sys.stderr):
+            predictor.load_model(args.model)
+    log(f"Model load: {time.perf_counter() - start:.3f}s")
+    return predictor
+
+
+def open_text(path, mode):
+    """Open a text file, '-' meaning stdin/stdout"""
+    if path == '-':
+        return contextlib.nullcontext(sys.stdin if 'r' in mode else sys.stdout)
+    return open(path, mode, newline='', encoding='utf-8')
+
+
+def cmd_train(args):
+    """Train a model from a labeled dataset and save it"""
+    predictor = FacultyStressPredictor()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(sys.stderr):
+        X, y = predictor.load_and_prepare_data(args.data)
+        predictor.train_model(X, y, model_type=args.model_type)
+        if not args.registry:
+            predictor.save_model(args.model)
+    if args.registry:
+        version = ModelRegistry(args.registry).publish(predictor.model, note=f"trained on {args.data}")
+        log(f"Published to {args.registry} as {version}")
+    log_throughput("Trained on rows", len(X), time.perf_counter() - start)
+
+
+def cmd_evaluate(args):
+    """Evaluate the saved model on a labeled dataset without retraining"""
+    predictor = load_predictor(args)
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(sys.stderr):
+        X, y = predictor.load_and_prepare_data(args.data)
+    predictor.evaluate_model(X, y)
+    log_throughput("Evaluated rows", len(X), time.perf_counter() - start)
+
+
+def cmd_score(args):
+    """Predict stress levels for every row of a workload CSV"""
+    if args.store and args.probabilities:
+        sys.exit("--store keeps labels only; it cannot be combined with --probabilities")
+    if args.explain and (args.store or args.workers > 1):
+        sys.exit("--explain scores every row in this process; drop --store and --workers")
+    predictor = load_predictor(args)
+    scorer = None
+    if args.workers > 1:
+        scorer = ParallelScorer(predictor.model, predictor.feature_columns, args.workers)
+    incremental = IncrementalScorer(predictor, args.store) if args.store else None
+
+    def predict_changed(rows):
+        # Pool scoring bypasses predictor.predict, which feeds the drift monitor
+        labels = scorer.predict(rows)
+        predictor.observe_drift(rows, labels)
+        return labels
+    validator = FrameValidator()
+    start = time.perf_counter()
+    count = 0
+    rejected = 0
+    try:
+        with open_text(args.input, 'r') as in_file, open_text(args.output, 'w') as out_file:
+            header = True
+            for chunk in pd.read_csv(in_file, chunksize=args.chunk_size):
+                if not args.no_validate:
+                    result = validator.validate(chunk)
+                    if result.rejected_count:
+                        rejected += result.rejected_count
+                        if args.quarantine:
+                            write_quarantine(result.rejected, args.quarantine)
+                    chunk = result.valid
+                if len(chunk) == 0:
+                    continue
+                if args.explain:
+                    # The explanation pass also yields the probabilities
+                    result = explain_frame(predictor, chunk)
+                    predictor.observe_drift(chunk, result['Stress_Level'].to_numpy())
+                    result.insert(0, 'Faculty_ID', chunk['Faculty_ID'].values)
+                    result.to_csv(out_file, index=False, header=header)
+                    header = False
+                    count += len(chunk)
+                    continue
+                if incremental is not None:
+                    labels = incremental.score(chunk, predict_changed if scorer is not None else None)
+                elif scorer is not None:
+                    labels, proba = scorer.predict_with_proba(chunk)
+                    classes = scorer.classes_
+                elif args.probabilities:
+                    # One forest pass gives both the labels and the probabilities
+                    proba = predictor.model.predict_proba(chunk[predictor.feature_columns])
+                    classes = predictor.model.classes_
+                    labels = classes[proba.argmax(axis=1)]
+                else:
+                    labels = predictor.predict(chunk)
+                if incremental is None and (scorer is not None or args.probabilities):
+                    # These paths bypass predictor.predict, which feeds the monitor itself
+                    predictor.observe_drift(chunk, labels)
+
+                result = pd.DataFrame({
+                    'Faculty_ID': chunk['Faculty_ID'].values,
+                    'Stress_Level': labels
+                })
+                if args.probabilities:
+                    for i, level in enumerate(classes):
+                        result[f'P_{level}'] = proba[:, i].round(4)
+                result.to_csv(out_file, index=False, header=header)
+                header = False
+                count += len(chunk)
+    finally:
+        if scorer is not None:
+            scorer.close()
+    if incremental is not None:
+        incremental.commit()
+        stats = incremental.stats
+        log(f"Incremental: {stats['unchanged']} unchanged, {stats['changed']} changed, "
+            f"{stats['new']} new (store: {args.store})")
+    log_throughput("Scored rows", count, time.perf_counter() - start)
+    if rejected:
+        destination = f" (written to {args.quarantine})" if args.quarantine else ""
+        log(f"Rejected rows: {rejected}{destination}")
+    if predictor.drift_monitor is not None:
+        drift = predictor.drift_monitor.report()
+        log(format_drift_report(drift))
+        if args.drift_report:
+            with open(args.drift_report, 'w') as f:
+                json.dump(drift, f, indent=2)
+            log(f"Drift report written to: {args.drift_report}")
+
+
+def cmd_report(args):
+    """Render wellness reports for a results CSV produced by `score`"""
+    renderer = BatchReportRenderer(WellnessExpertSystem())
+    start = time.perf_counter()
+    count = 0
+    with open_text(args.results, 'r') as in_file, open_text(args.output, 'w') as out_file:
+        records = ((row['Faculty_ID'], row['Stress_Level']) for row in csv.DictReader(in_file))
+        for report in renderer.iter_reports(records, args.format):
+            out_file.write(report)
+            count += 1
+    log_throughput("Reports written", count, time.perf_counter() - start)
+
+
+def cmd_pipeline(args):
+    """Score and report a workload CSV with overlapping asyncio stages"""
+    predictor = load_predictor(args)
+    try:
+        stats = run_pipeline(predictor, args.input, args.output, args.reports, args.format,
+                             chunk_size=args.chunk_size, queue_size=args.queue_size,
+                             quarantine=args.quarantine)
+    except ValueError as e:
+        sys.exit(f"Error: {e}")
+    log(f"Pipeline: {stats.summary()}")
+    if stats.rejected:
+        log(f"Rejected rows: {stats.rejected}")
+
+
+def _input_pending(stream):
+    """True if more input can be read from stream without blocking"""
+    try:
+        ready, _, _ = select.select([stream], [], [], 0)
+    except (ValueError, OSError, TypeError):
+        # Not a selectable stream (e.g. Windows console); assume more is coming
+        return True
+    return bool(ready)
+
+
+def cmd_serve(args):
+    """
+    Long-running mode: read workload CSV rows from stdin and emit a report
+    per row. Rows are predicted in micro-batches of whatever has arrived,
+    so a steady stream is scored in bulk while a lone row is not delayed.
+    Rows failing validation are reported on stderr (or appended to the
+    quarantine CSV) and the rest of the batch is still served.
+    """
+    predictor = load_predictor(args, follow=True)
+    renderer = BatchReportRenderer(WellnessExpertSystem())
+    render = renderer.render_text if args.format == 'text' else renderer.render_json
+    reader = csv.reader(sys.stdin)
+    header = next(reader, None)
+    if header is None:
+        return
+
+    missing = [col for col in ['Faculty_ID'] + predictor.feature_columns if col not in header]
+    if missing:
+        sys.exit(f"Error: input is missing required column(s): {', '.join(missing)}")
+    names = ['Faculty_ID'] + predictor.feature_columns
+    columns = [header.index(col) for col in names]
+    start = time.perf_counter()
+    count = 0
+    batch = []
+
+    def reject(rows):
+        if args.quarantine:
+            write_quarantine(rows, args.quarantine)
+        else:
+            for faculty_id, reason in zip(rows['Faculty_ID'], rows[REASON_COLUMN]):
+                print(f"Rejected {faculty_id}: {reason}", file=sys.stderr)
+
+    def flush_batch():
+        short = [row for row in batch if len(row) != len(header)]
+        if short:
+            rows = pd.DataFrame([row[:1] for row in short], columns=['Faculty_ID'])
+            rows[REASON_COLUMN] = f"expected {len(header)} fields"
+            reject(rows)
+        frame = pd.DataFrame([[row[i] for i in columns] for row in batch if len(row) == len(header)],
+                             columns=names)
+        # A fresh validator per batch: the stream may send the same faculty again later
+        result = FrameValidator().validate(frame)
+        if result.rejected_count:
+            reject(result.rejected)
+        valid = result.valid
+        if len(valid):
+            X = valid[predictor.feature_columns].astype(int)
+            for faculty_id, level in zip(valid['Faculty_ID'], predictor.predict(X)):
+                sys.stdout.write(render(faculty_id, level))
+            sys.stdout.flush()
+        batch.clear()
+
+    for row in reader:
+        if not row:
+            continue
+        batch.append(row)
+        count += 1
+        if len(batch) >= args.batch_size or not _input_pending(sys.stdin):
+            flush_batch()
+            renderer.refresh()
+    if batch:
+        flush_batch()
+    log_throughput("Served rows", count, time.perf_counter() - start)
+
+
+def build_parser():
+    """Build the argument parser with one subcommand per operation"""
+    parser = argparse.ArgumentParser(description="Faculty Stress Detector batch CLI")
+    parser.add_argument('--model', default=DEFAULT_MODEL,
+                        help="Model file (relative paths resolve to this directory)")
+    parser.add_argument('--registry', metavar='DIR',
+                        help="Model registry directory (overrides --model)")
+    parser.add_argument('--metrics', metavar='FILE',
+                        help="Write span/counter metrics on exit (.prom = Prometheus text, else JSON)")
+    parser.add_argument('--profile', action='store_true',
+                        help="Run the sampling profiler for the whole command "
+                             "(it can also be toggled at runtime with SIGUSR1)")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    train = subparsers.add_parser('train', help="Train and save the model")
+    train.add_argument('--data', default=DEFAULT_DATA)
+    train.add_argument('--model-type', choices=('random_forest', 'decision_tree'),
+                       default='random_forest')
+    train.set_defaults(func=cmd_train)
+
+    score = subparsers.add_parser('score', help="Predict a workload CSV")
+    score.add_argument('input', help="Workload CSV with Faculty_ID ('-' = stdin)")
+    score.add_argument('output', help="Results CSV ('-' = stdout)")
+    score.add_argument('--probabilities', action='store_true',
+                       help="Add a P_<level> column per stress level")
+    score.add_argument('--chunk-size', type=int, default=50000)
+    score.add_argument('--quarantine', metavar='FILE',
+                       help="Append rows failing validation, with reasons, to this CSV")
+    score.add_argument('--no-validate', action='store_true',
+                       help="Skip schema validation (trusted input)")
+    score.add_argument('--drift-report', metavar='FILE',
+                       help="Write input drift statistics against the training snapshot as JSON")
+    score.add_argument('--store', metavar='FILE',
+                       help="Prediction store; only rows new or changed since the last run are scored")
+    score.add_argument('--explain', action='store_true',
+                       help="Add probabilities, WSS points and top contributing features per row")
+    score.add_argument('--workers', type=int, default=1,
+                       help="Score across this many processes via shared memory")
+    score.set_defaults(func=cmd_score)
+
+    pipeline = subparsers.add_parser('pipeline', help="Score and report with concurrent stages")
+    pipeline.add_argument('input', help="Workload CSV with Faculty_ID")
+    pipeline.add_argument('output', help="Results CSV")
+    pipeline.add_argument('--reports', metavar='FILE', help="Also write wellness reports here")
+    pipeline.add_argument('--format', choices=('text', 'jsonl'), default='text')
+    pipeline.add_argument('--chunk-size', type=int, default=20000)
+    pipeline.add_argument('--queue-size', type=int, default=4,
+                          help="Chunks buffered between stages (bounds memory)")
+    pipeline.add_argument('--quarantine', metavar='FILE',
+                          help="Append rows failing validation, with reasons, to this CSV")
+    pipeline.set_defaults(func=cmd_pipeline)
+
+    report = subparsers.add_parser('report', help="Render reports for a results CSV")
+    report.add_argument('results', help="CSV with Faculty_ID,Stress_Level ('-' = stdin)")
+    report.add_argument('--output', default='-', help="Report file ('-' = stdout)")
+    report.add_argument('--format', choices=('text', 'jsonl'), default='text')
+    report.set_defaults(func=cmd_report)
+
+    evaluate = subparsers.add_parser('evaluate', help="Evaluate the saved model")
+    evaluate.add_argument('--data', default=DEFAULT_DATA)
+    evaluate.set_defaults(func=cmd_evaluate)
+
+    serve = subparsers.add_parser('serve', help="Predict and report rows streamed on stdin")
+    serve.add_argument('--format', choices=('text', 'jsonl'), default='text')
+    serve.add_argument('--batch-size', type=int, default=1000)
+    serve.add_argument('--quarantine', metavar='FILE',
+                       help="Append rows failing validation, with reasons, to this CSV "
+                            "(default: report them on stderr)")
+    serve.set_defaults(func=cmd_serve)
+
+    return parser
+
+
+def main():
+    """Main entry point"""
+    args = build_parser().parse_args()
+    if hasattr(signal, 'SIGUSR1'):
+        METRICS.install_signal_toggle(signal.SIGUSR1)
+    if args.profile:
+        METRICS.profiler.start()
+    try:
+        args.func(args)
+    finally:
+        METRICS.profiler.stop()
+        if METRICS.profiler.samples:
+            log(METRICS.profiler.report())
+        if args.metrics:
+            METRICS.write(args.metrics)
+            log(f"Metrics written to: {args.metrics}")
+
+
+if __name__ == "__main__":
+    main()
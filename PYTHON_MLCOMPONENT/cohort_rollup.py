@@ -0,0 +1,260 @@
+"""
+Streaming Department / Cohort Roll-ups
+
+Summarises scored rosters per department or cohort:
+
+    class distribution of the ML predictions
+    mean and percentile (median, p90) WSS
+    ML-vs-formula disagreement rate
+    top contributing WSS factors (features most often in their 3-point band)
+
+Every statistic is kept as a mergeable aggregate. These are counts per
+predicted class, counts of formula/ML disagreements, an exact WSS
+histogram (WSS is an integer from 9 to 27, so percentiles come out exact)
+and per-feature point sums. A roll-up over millions of rows therefore
+needs memory proportional to the number of groups, not rows. Shards can
+be rolled up separately, saved as JSON and merged.
+
+Usage:
+    python cohort_rollup.py compute <workload.csv> [--by Department] [--output summary.csv]
+                                    [--state shard.json] [--chunk-size 100000]
+    python cohort_rollup.py merge <shard.json> [<shard.json> ...] [--output summary.csv]
+"""
+
+import argparse
+import contextlib
+import json
+import sys
+
+import numpy as np
+import pandas as pd
+
+from validation import FEATURE_RANGES, STRESS_LEVELS
+
+FEATURE_COLUMNS = list(FEATURE_RANGES)
+MIN_WSS = len(FEATURE_COLUMNS)
+MAX_WSS = 3 * len(FEATURE_COLUMNS)
+WSS_BINS = MAX_WSS - MIN_WSS + 1
+ALL_GROUP = 'All'
+MISSING_GROUP = '(none)'
+TOP_FACTORS = 3
+
+
+class CohortRollup:
+    """
+    Mergeable per-group aggregates of scored rows
+
+    Args:
+        by: column holding the group (department/cohort); None rolls
+            everything into one 'All' group. Rows with no group value
+            are counted under '(none)'
+    """
+
+    def __init__(self, by=None):
+        self.by = by
+        self.groups = {}
+        n_features, n_levels = len(FEATURE_COLUMNS), len(STRESS_LEVELS)
+        self.class_counts = np.zeros((0, n_levels), dtype=np.int64)
+        self.disagreements = np.zeros(0, dtype=np.int64)
+        self.wss_histogram = np.zeros((0, WSS_BINS), dtype=np.int64)
+        self.feature_points = np.zeros((0, n_features), dtype=np.int64)
+        self.feature_high = np.zeros((0, n_features), dtype=np.int64)
+
+    def _group_indices(self, names):
+        """Row index of every group name, adding new groups as needed"""
+        new = [name for name in names if name not in self.groups]
+        if new:
+            for name in new:
+                self.groups[name] = len(self.groups)
+            grow = len(new)
+            self.class_counts = np.vstack([self.class_counts, np.zeros((grow, len(STRESS_LEVELS)), np.int64)])
+            self.disagreements = np.concatenate([self.disagreements, np.zeros(grow, np.int64)])
+            self.wss_histogram = np.vstack([self.wss_histogram, np.zeros((grow, WSS_BINS), np.int64)])
+            self.feature_points = np.vstack([self.feature_points,
+                                             np.zeros((grow, len(FEATURE_COLUMNS)), np.int64)])
+            self.feature_high = np.vstack([self.feature_high,
+                                           np.zeros((grow, len(FEATURE_COLUMNS)), np.int64)])
+        return np.array([self.groups[name] for name in names], dtype=np.int64)
+
+    def update(self, chunk, predictions, points, formula_levels):
+        """
+        Add a scored chunk
+
+        Args:
+            chunk: DataFrame with the group column (if any)
+            predictions: ML stress level per row
+            points: WSS points per row and feature
+                    (FacultyStressPredictor.calculate_wss_points_batch)
+            formula_levels: WSS formula stress level per row
+                    (FacultyStressPredictor.get_stress_levels_from_wss_batch)
+        """
+        if len(chunk) == 0:
+            return
+        if self.by is None:
+            codes, names = np.zeros(len(chunk), dtype=np.int64), [ALL_GROUP]
+        else:
+            codes, names = pd.factorize(chunk[self.by].fillna(MISSING_GROUP).astype(str), sort=False)
+            names = list(names)
+        group = self._group_indices(names)[codes]
+        n_groups = len(self.groups)
+
+        level_index = {level: i for i, level in enumerate(STRESS_LEVELS)}
+        predicted = pd.Series(predictions).map(level_index).to_numpy(dtype=np.int64)
+        formula = pd.Series(formula_levels).map(level_index).to_numpy(dtype=np.int64)
+        wss = points.sum(axis=1)
+
+        # One bincount per aggregate over (group, bucket) pairs
+        self.class_counts += np.bincount(group * len(STRESS_LEVELS) + predicted,
+                                         minlength=n_groups * len(STRESS_LEVELS)
+                                         ).reshape(n_groups, -1)
+        self.disagreements += np.bincount(group, weights=predicted != formula,
+                                          minlength=n_groups).astype(np.int64)
+        self.wss_histogram += np.bincount(group * WSS_BINS + (wss - MIN_WSS),
+                                          minlength=n_groups * WSS_BINS).reshape(n_groups, -1)
+        for f in range(len(FEATURE_COLUMNS)):
+            self.feature_points[:, f] += np.bincount(group, weights=points[:, f],
+                                                     minlength=n_groups).astype(np.int64)
+            self.feature_high[:, f] += np.bincount(group, weights=points[:, f] == 3,
+                                                   minlength=n_groups).astype(np.int64)
+
+    def merge(self, other):
+        """Add another roll-up's aggregates into this one"""
+        if other.by != self.by:
+            raise ValueError(f"Cannot merge roll-ups grouped by {other.by!r} and {self.by!r}")
+        rows = self._group_indices(list(other.groups))
+        self.class_counts[rows] += other.class_counts
+        self.disagreements[rows] += other.disagreements
+        self.wss_histogram[rows] += other.wss_histogram
+        self.feature_points[rows] += other.feature_points
+        self.feature_high[rows] += other.feature_high
+        return self
+
+    def to_state(self):
+        return {
+            'by': self.by,
+            'groups': list(self.groups),
+            'class_counts': self.class_counts.tolist(),
+            'disagreements': self.disagreements.tolist(),
+            'wss_histogram': self.wss_histogram.tolist(),
+            'feature_points': self.feature_points.tolist(),
+            'feature_high': self.feature_high.tolist(),
+        }
+
+    @classmethod
+    def from_state(cls, state):
+        rollup = cls(state['by'])
+        rollup._group_indices(state['groups'])
+        for key in ('class_counts', 'disagreements', 'wss_histogram', 'feature_points', 'feature_high'):
+            if state['groups']:
+                setattr(rollup, key, np.asarray(state[key], dtype=np.int64))
+        return rollup
+
+    def summary(self):
+        """
+        Compact summary table, one row per group (sorted by name)
+
+        Returns:
+            DataFrame with Rows, per-level counts and shares, WSS mean,
+            median and p90, disagreement rate and the top WSS factors
+        """
+        names = list(self.groups)
+        rows = self.class_counts.sum(axis=1)
+        safe_rows = np.maximum(rows, 1)
+        table = pd.DataFrame({self.by or 'Group': names, 'Rows': rows})
+        for i, level in enumerate(STRESS_LEVELS):
+            table[level] = self.class_counts[:, i]
+            table[f'{level}_Pct'] = (100 * self.class_counts[:, i] / safe_rows).round(1)
+
+        wss_values = np.arange(MIN_WSS, MAX_WSS + 1)
+        table['WSS_Mean'] = ((self.wss_histogram * wss_values).sum(axis=1) / safe_rows).round(2)
+        table['WSS_Median'] = _histogram_percentile(self.wss_histogram, 0.5)
+        table['WSS_P90'] = _histogram_percentile(self.wss_histogram, 0.9)
+        table['Disagreement_Pct'] = (100 * self.disagreements / safe_rows).round(1)
+
+        # Rank by how often a feature sits in its 3-point band, then by mean points
+        score = self.feature_high * (3 * int(safe_rows.max()) + 1) + self.feature_points
+        order = np.argsort(-score, axis=1, kind='stable')[:, :TOP_FACTORS]
+        names_array = np.asarray(FEATURE_COLUMNS)
+        table['Top_WSS_Factors'] = [
+            "; ".join(f"{names_array[f]} {100 * self.feature_high[g, f] / safe_rows[g]:.0f}%"
+                      for f in order[g] if self.feature_high[g, f])
+            for g in range(len(names))
+        ]
+        return table.sort_values(table.columns[0], kind='stable').reset_index(drop=True)
+
+
+def _histogram_percentile(histogram, q):
+    """Exact WSS percentile per group from its integer histogram"""
+    cumulative = histogram.cumsum(axis=1)
+    targets = np.ceil(q * cumulative[:, -1:]).clip(min=1)
+    index = (cumulative < targets).sum(axis=1)
+    result = (MIN_WSS + index).astype(float)
+    result[cumulative[:, -1] == 0] = np.nan
+    return result
+
+
+def rollup_csv(predictor, path, by=None, chunk_size=100000):
+    """
+    Score a workload CSV chunk by chunk and roll it up
+
+    Args:
+        predictor: FacultyStressPredictor with a loaded model
+        path: workload CSV
+        by: group column, or None for a single group
+        chunk_size: rows read and scored at a time
+
+    Returns:
+        CohortRollup
+    """
+    rollup = CohortRollup(by)
+    for chunk in pd.read_csv(path, chunksize=chunk_size):
+        points = predictor.calculate_wss_points_batch(chunk)
+        formula_levels = predictor.get_stress_levels_from_wss_batch(points.sum(axis=1))
+        rollup.update(chunk, predictor.predict(chunk), points, formula_levels)
+    return rollup
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description="Per-department stress roll-ups")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    compute = subparsers.add_parser('compute', help="Score a workload CSV and roll it up")
+    compute.add_argument('input')
+    compute.add_argument('--by', help="Group column, e.g. Department (default: one group)")
+    compute.add_argument('--chunk-size', type=int, default=100000)
+    compute.add_argument('--state', help="Also save the mergeable aggregates as JSON")
+    compute.add_argument('--output', help="Summary CSV (default: print)")
+    compute.add_argument('--model', default='stress_model.joblib')
+
+    merge = subparsers.add_parser('merge', help="Merge saved shard aggregates")
+    merge.add_argument('states', nargs='+')
+    merge.add_argument('--output', help="Summary CSV (default: print)")
+    args = parser.parse_args()
+
+    if args.command == 'compute':
+        from stress_predictor import FacultyStressPredictor
+        predictor = FacultyStressPredictor()
+        with contextlib.redirect_stdout(sys.stderr):
+            predictor.load_model(args.model)
+        rollup = rollup_csv(predictor, args.input, args.by, args.chunk_size)
+        if args.state:
+            with open(args.state, 'w') as f:
+                json.dump(rollup.to_state(), f)
+    else:
+        rollup = None
+        for path in args.states:
+            with open(path) as f:
+                shard = CohortRollup.from_state(json.load(f))
+            rollup = shard if rollup is None else rollup.merge(shard)
+
+    table = rollup.summary()
+    if args.output:
+        table.to_csv(args.output, index=False)
+        print(f"Summary saved to: {args.output}")
+    else:
+        print(table.to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,338 @@
+"""
+Input Drift Monitor for the Stress Prediction Model
+
+The model is trained once on the synthetic dataset; this module tells us
+when live submissions stop looking like that data. Every feature is a
+bounded integer (see validation.FEATURE_RANGES), so the monitor keeps one
+fixed-size count array per feature, plus counts of predicted classes and
+of rows where the ML prediction disagrees with the WSS formula. Memory is
+constant no matter how many rows are observed and no raw request is kept.
+Wide ranges such as Students_Total are grouped into at most MAX_BINS bins
+so that a small training set does not make them look drifted.
+
+A training snapshot with the same counts is stored on the fitted model
+(model.training_snapshot_) when it is trained, so it travels inside the
+joblib file. Drift is measured with the Population Stability Index and
+KL divergence of the live distributions against the snapshot.
+
+Usage:
+    python drift_monitor.py snapshot [--data dataset_with_labels.csv] [--model stress_model.joblib]
+    python drift_monitor.py check <workload.csv> [--model stress_model.joblib] [--output drift.json]
+"""
+
+import argparse
+import contextlib
+import json
+import sys
+import threading
+
+import numpy as np
+
+from validation import FEATURE_RANGES
+
+SNAPSHOT_VERSION = 1
+
+# Conventional PSI bands: < 0.1 stable, 0.1-0.25 moderate shift, > 0.25 major shift
+PSI_WARN = 0.10
+PSI_RETRAIN = 0.25
+# Absolute increase in the ML-vs-formula disagreement rate that warrants retraining
+DISAGREEMENT_RETRAIN = 0.10
+# Rows needed before drift is reported at all
+MIN_ROWS = 500
+# Wide ranges are grouped into equal-width bins to keep at most this many
+MAX_BINS = 16
+# Floor for empty bins so PSI/KL stay finite
+_EPSILON = 1e-4
+
+
+def bin_width(low, high):
+    """Integer values per histogram bin for a feature range"""
+    return -(-(high - low + 1) // MAX_BINS)
+
+
+def feature_histogram(values, low, high, width):
+    """
+    Count integer values into bins of `width` values starting at low,
+    plus one final out-of-range bin
+
+    Non-integer values are rounded to the nearest integer first.
+    """
+    bins = -(-(high - low + 1) // width)
+    values = np.rint(np.asarray(values, dtype=np.float64))
+    out_of_range = (values < low) | (values > high) | np.isnan(values)
+    index = np.where(out_of_range, bins, (np.where(out_of_range, low, values) - low) // width)
+    return np.bincount(index.astype(np.intp), minlength=bins + 1)
+
+
+def class_counts(predictions, classes):
+    """Count predictions per class, in `classes` order"""
+    predictions = np.asarray(predictions)
+    return np.array([np.count_nonzero(predictions == c) for c in classes], dtype=np.int64)
+
+
+def build_training_snapshot(X, predictions, formula_levels, feature_columns, classes):
+    """
+    Summarize the training distribution for later drift checks
+
+    Args:
+        X: DataFrame or 2-D array of training features (feature_columns order)
+        predictions: model predictions used as the class baseline
+        formula_levels: WSS formula stress levels for the same rows
+        feature_columns: feature names, in column order
+        classes: model classes
+
+    Returns:
+        Plain dict (safe to pickle alongside the model)
+    """
+    values = X[feature_columns].to_numpy() if hasattr(X, 'columns') else np.asarray(X)
+    predictions = np.asarray(predictions)
+    return {
+        'version': SNAPSHOT_VERSION,
+        'rows': int(len(values)),
+        'features': {
+            col: _feature_snapshot(values[:, i], col) for i, col in enumerate(feature_columns)
+        },
+        'classes': [str(c) for c in classes],
+        'predicted_classes': class_counts(predictions, classes).tolist(),
+        'disagreement_rate': float(np.mean(predictions != np.asarray(formula_levels)))
+        if len(predictions) else 0.0,
+    }
+
+
+def _feature_snapshot(values, column):
+    low, high = FEATURE_RANGES[column]
+    width = bin_width(low, high)
+    return {
+        'low': low,
+        'high': high,
+        'bin_width': width,
+        'counts': feature_histogram(values, low, high, width).tolist(),
+    }
+
+
+def _proportions(counts):
+    counts = np.asarray(counts, dtype=np.float64)
+    total = counts.sum()
+    p = counts / total if total else np.full(len(counts), 1.0 / len(counts))
+    p = np.maximum(p, _EPSILON)
+    return p / p.sum()
+
+
+def psi(expected_counts, actual_counts):
+    """Population Stability Index of actual against expected counts"""
+    e, a = _proportions(expected_counts), _proportions(actual_counts)
+    return float(np.sum((a - e) * np.log(a / e)))
+
+
+def kl_divergence(expected_counts, actual_counts):
+    """KL(actual || expected) in nats"""
+    e, a = _proportions(expected_counts), _proportions(actual_counts)
+    return float(np.sum(a * np.log(a / e)))
+
+
+class DriftMonitor:
+    """
+    Streaming drift statistics for scored rows
+
+    observe() is cheap (one bincount per feature) and thread-safe, so the
+    predictor can call it on every batch.
+    """
+
+    def __init__(self, snapshot, feature_columns, psi_warn=PSI_WARN,
+                 psi_retrain=PSI_RETRAIN, disagreement_retrain=DISAGREEMENT_RETRAIN,
+                 min_rows=MIN_ROWS):
+        if snapshot.get('version') != SNAPSHOT_VERSION:
+            raise ValueError(f"Unsupported training snapshot version: {snapshot.get('version')}")
+        self.snapshot = snapshot
+        self.feature_columns = list(feature_columns)
+        self.classes = list(snapshot['classes'])
+        self.psi_warn = psi_warn
+        self.psi_retrain = psi_retrain
+        self.disagreement_retrain = disagreement_retrain
+        self.min_rows = min_rows
+
+        # Bin layout of all features side by side in one flat count array,
+        # so a batch is histogrammed with a single bincount
+        features = [snapshot['features'][col] for col in self.feature_columns]
+        self._low = np.array([f['low'] for f in features], dtype=np.float64)
+        self._high = np.array([f['high'] for f in features], dtype=np.float64)
+        self._width = np.array([f['bin_width'] for f in features], dtype=np.float64)
+        sizes = np.array([len(f['counts']) for f in features])
+        self._overflow = sizes - 1
+        self._offsets = np.concatenate(([0], np.cumsum(sizes)[:-1]))
+        self._size = int(sizes.sum())
+
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Forget everything observed so far (e.g. after retraining)"""
+        with self._lock:
+            self.rows = 0
+            self.disagreements = 0
+            self._counts = np.zeros(self._size, dtype=np.int64)
+            self.class_counts = np.zeros(len(self.classes), dtype=np.int64)
+
+    @property
+    def feature_counts(self):
+        """Observed histogram per feature (last bin counts out-of-range values)"""
+        with self._lock:
+            counts = self._counts.copy()
+        return {
+            col: counts[start:start + self._overflow[i] + 1]
+            for i, (col, start) in enumerate(zip(self.feature_columns, self._offsets))
+        }
+
+    def observe(self, X, predictions, formula_levels):
+        """
+        Add a batch of scored rows
+
+        Args:
+            X: DataFrame or 2-D array of features (feature_columns order)
+            predictions: ML predictions for the rows
+            formula_levels: WSS formula stress levels for the rows
+        """
+        values = X[self.feature_columns].to_numpy() if hasattr(X, 'columns') else np.asarray(X)
+        if len(values) == 0:
+            return
+        predictions = np.asarray(predictions)
+        values = np.rint(values.astype(np.float64))
+        out_of_range = (values < self._low) | (values > self._high) | np.isnan(values)
+        index = (np.where(out_of_range, self._low, values) - self._low) // self._width
+        index = np.where(out_of_range, self._overflow, index) + self._offsets
+        counts = np.bincount(index.astype(np.intp).ravel(), minlength=self._size)
+        predicted = class_counts(predictions, self.classes)
+        disagreements = int(np.count_nonzero(predictions != np.asarray(formula_levels)))
+        with self._lock:
+            self._counts += counts
+            self.class_counts += predicted
+            self.disagreements += disagreements
+            self.rows += len(values)
+
+    def report(self):
+        """
+        Compare everything observed so far with the training snapshot
+
+        Returns:
+            dict with per-feature PSI/KL, class PSI, disagreement rates,
+            a status ('insufficient_data', 'stable', 'drifting' or
+            'retrain') and the reasons behind it
+        """
+        with self._lock:
+            rows = self.rows
+            disagreements = self.disagreements
+            counts = self._counts.copy()
+            predicted = self.class_counts.copy()
+
+        features = {}
+        for col, start in zip(self.feature_columns, self._offsets):
+            expected = self.snapshot['features'][col]['counts']
+            actual = counts[start:start + len(expected)]
+            features[col] = {
+                'psi': psi(expected, actual),
+                'kl': kl_divergence(expected, actual),
+                'out_of_range': int(actual[-1]),
+            }
+        class_psi = psi(self.snapshot['predicted_classes'], predicted)
+        disagreement_rate = disagreements / rows if rows else 0.0
+        baseline_disagreement = self.snapshot['disagreement_rate']
+
+        reasons = []
+        status = 'stable'
+        if rows < self.min_rows:
+            status = 'insufficient_data'
+        else:
+            for col, stats in features.items():
+                if stats['psi'] > self.psi_retrain:
+                    reasons.append(f"{col} PSI {stats['psi']:.3f} > {self.psi_retrain}")
+                elif stats['psi'] > self.psi_warn:
+                    reasons.append(f"{col} PSI {stats['psi']:.3f} > {self.psi_warn} (moderate)")
+            if class_psi > self.psi_retrain:
+                reasons.append(f"predicted class PSI {class_psi:.3f} > {self.psi_retrain}")
+            if disagreement_rate - baseline_disagreement > self.disagreement_retrain:
+                reasons.append(f"ML/formula disagreement {disagreement_rate:.1%} "
+                               f"vs {baseline_disagreement:.1%} at training")
+
+            major = (any(s['psi'] > self.psi_retrain for s in features.values())
+                     or class_psi > self.psi_retrain
+                     or disagreement_rate - baseline_disagreement > self.disagreement_retrain)
+            if major:
+                status = 'retrain'
+            elif reasons:
+                status = 'drifting'
+
+        return {
+            'rows_observed': rows,
+            'training_rows': self.snapshot['rows'],
+            'status': status,
+            'retrain_recommended': status == 'retrain',
+            'reasons': reasons,
+            'features': features,
+            'predicted_classes': dict(zip(self.classes, predicted.tolist())),
+            'predicted_class_psi': class_psi,
+            'disagreement_rate': disagreement_rate,
+            'training_disagreement_rate': baseline_disagreement,
+        }
+
+
+def format_report(report):
+    """Human-readable drift summary"""
+    lines = [
+        f"Drift status: {report['status'].upper()} "
+        f"({report['rows_observed']} rows observed, {report['training_rows']} at training)",
+        f"{'Feature':22s} {'PSI':>8s} {'KL':>8s} {'out-of-range':>13s}",
+    ]
+    for col, stats in report['features'].items():
+        lines.append(f"{col:22s} {stats['psi']:8.4f} {stats['kl']:8.4f} {stats['out_of_range']:13d}")
+    lines.append(f"Predicted class PSI: {report['predicted_class_psi']:.4f}")
+    lines.append(f"ML/formula disagreement: {report['disagreement_rate']:.1%} "
+                 f"(training {report['training_disagreement_rate']:.1%})")
+    for reason in report['reasons']:
+        lines.append(f"  - {reason}")
+    return "\n".join(lines)
+
+
+def main():
+    """Main entry point"""
+    import pandas as pd
+    from stress_predictor import FacultyStressPredictor
+
+    parser = argparse.ArgumentParser(description="Training-distribution drift monitor")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    snapshot = subparsers.add_parser('snapshot', help="Store a training snapshot in an existing model")
+    snapshot.add_argument('--data', default='dataset_with_labels.csv')
+    snapshot.add_argument('--model', default='stress_model.joblib')
+
+    check = subparsers.add_parser('check', help="Score a workload CSV and report drift")
+    check.add_argument('input', help="Workload CSV")
+    check.add_argument('--model', default='stress_model.joblib')
+    check.add_argument('--output', help="Write the report as JSON")
+    args = parser.parse_args()
+
+    predictor = FacultyStressPredictor()
+    with contextlib.redirect_stdout(sys.stderr):
+        predictor.load_model(args.model)
+
+    if args.command == 'snapshot':
+        with contextlib.redirect_stdout(sys.stderr):
+            X, _ = predictor.load_and_prepare_data(args.data)
+        predictor.attach_training_snapshot(X)
+        predictor.save_model(args.model)
+        return
+
+    if predictor.drift_monitor is None:
+        sys.exit("Model has no training snapshot; run 'python drift_monitor.py snapshot' first")
+    for chunk in pd.read_csv(args.input, chunksize=50000):
+        predictor.predict(chunk)
+    report = predictor.drift_monitor.report()
+    print(format_report(report))
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nReport saved to: {args.output}")
+    sys.exit(2 if report['retrain_recommended'] else 0)
+
+
+if __name__ == "__main__":
+    main()
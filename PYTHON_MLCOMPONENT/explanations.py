@@ -0,0 +1,222 @@
+"""
+Per-prediction Explanations
+
+Global feature importances cannot say why one faculty member was
+predicted High. This module gives two per-row explanations, both
+evaluated in batch:
+
+    WSS breakdown       the points (1-3) each feature adds to the
+                        Workload Stress Score
+    Path contributions  how much each feature moved the forest's class
+                        probabilities along the decision paths
+                        (treeinterpreter-style):
+                        P(class) = bias + sum of feature contributions
+
+For the path contributions, every split on the way from the root to a
+node adds value[child] - value[parent] to the feature the parent splits
+on. These sums are precomputed once per model for every node of the
+flattened forest (parallel_scoring.flatten_forest). Explaining a row then
+only needs the leaf it reaches in each tree (Tree.apply, the same walk as
+prediction). The leaves of a chunk of rows form a sparse indicator
+matrix (one entry per tree), and a single sparse product with the node
+table sums the contributions of all trees.
+
+Usage:
+    python explanations.py <input.csv> [--top 3] [--output explained.csv]
+"""
+
+import argparse
+import contextlib
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from parallel_scoring import flatten_forest, rebuild_trees
+
+
+def _node_contributions(arrays, tree_meta, n_features):
+    """
+    Cumulative per-feature contribution of the path to every node
+
+    Returns:
+        (table, bias): table has shape (total nodes, features, classes);
+        bias is the mean root value over all trees
+    """
+    nodes = arrays['nodes']
+    values = arrays['values'][:, 0, :]
+    total, n_classes = values.shape
+    table = np.zeros((total, n_features, n_classes))
+    offsets = np.array([meta[3] for meta in tree_meta])
+
+    # Child indices in global (flattened) coordinates
+    local_index = np.arange(total) - np.repeat(offsets, [meta[4] for meta in tree_meta])
+    tree_offset = np.arange(total) - local_index
+    internal = np.flatnonzero(nodes['left_child'] >= 0)
+    parents = np.concatenate([internal, internal])
+    children = np.concatenate([nodes['left_child'][internal], nodes['right_child'][internal]])
+    children = children + tree_offset[parents]
+
+    # Process one depth at a time so every parent is final before its children
+    frontier = offsets
+    while len(frontier):
+        is_parent = np.isin(parents, frontier)
+        p, c = parents[is_parent], children[is_parent]
+        table[c] = table[p]
+        table[c, nodes['feature'][p]] += values[c] - values[p]
+        frontier = c
+
+    bias = values[offsets].mean(axis=0)
+    return table / len(tree_meta), bias
+
+
+class ForestExplainer:
+    """
+    Batched path contributions for a RandomForest or DecisionTree
+
+    Args:
+        model: fitted RandomForestClassifier or DecisionTreeClassifier
+        feature_columns: feature names in training order
+    """
+
+    def __init__(self, model, feature_columns):
+        self.classes_ = np.asarray(model.classes_)
+        self.feature_columns = list(feature_columns)
+        arrays, tree_meta = flatten_forest(model)
+        self.trees = rebuild_trees(arrays, tree_meta)
+        self.offsets = [meta[3] for meta in tree_meta]
+        self.node_table, self.bias = _node_contributions(arrays, tree_meta, len(self.feature_columns))
+
+    def explain(self, faculty_data, chunk_rows=65536):
+        """
+        Class probabilities and per-feature contributions for every row
+
+        Args:
+            faculty_data: DataFrame with the feature columns, or a 2-D array
+                          whose columns are in feature_columns order
+            chunk_rows: rows walked through the trees at a time
+
+        Returns:
+            (proba, contributions): arrays of shape (rows x classes) and
+            (rows x features x classes); for every row
+            proba = bias + contributions.sum(axis=1)
+        """
+        if hasattr(faculty_data, 'columns'):
+            X = faculty_data[self.feature_columns].to_numpy(dtype=np.float32)
+        else:
+            X = np.ascontiguousarray(faculty_data, dtype=np.float32)
+        n_rows = len(X)
+        n_trees = len(self.trees)
+        n_features, n_classes = self.node_table.shape[1:]
+        table = self.node_table.reshape(len(self.node_table), -1)
+        contributions = np.empty((n_rows, n_features * n_classes))
+        for start in range(0, n_rows, chunk_rows):
+            chunk = X[start:start + chunk_rows]
+            leaves = np.empty((len(chunk), n_trees), dtype=np.int64)
+            for t, (tree, offset) in enumerate(zip(self.trees, self.offsets)):
+                leaves[:, t] = tree.apply(chunk) + offset
+            indicator = sparse.csr_matrix(
+                (np.ones(leaves.size), leaves.ravel(), np.arange(0, leaves.size + 1, n_trees)),
+                shape=(len(chunk), len(table)))
+            contributions[start:start + len(chunk)] = indicator @ table
+        contributions = contributions.reshape(n_rows, n_features, n_classes)
+        # Rounding can leave probabilities a hair outside [0, 1]
+        proba = np.clip(self.bias + contributions.sum(axis=1), 0.0, 1.0)
+        return proba, contributions
+
+    def top_factors(self, contributions, class_index, k=3):
+        """
+        Features pushing hardest towards the given class, per row
+
+        Args:
+            contributions: output of explain()
+            class_index: class column per row (array) or one int for all
+            k: factors per row
+
+        Returns:
+            list per row of (feature, contribution) pairs, largest first
+        """
+        toward = contributions[np.arange(len(contributions)), :, class_index]
+        names, scores = _top_columns(toward, self.feature_columns, k)
+        return [list(zip(row_names.tolist(), row_scores.tolist()))
+                for row_names, row_scores in zip(names, scores)]
+
+
+def _top_columns(scores, feature_columns, k):
+    """Feature names and scores of the k largest entries per row (ties keep feature order)"""
+    order = np.argsort(-scores, axis=1, kind='stable')[:, :k]
+    names = np.asarray(feature_columns)[order]
+    return names, np.take_along_axis(scores, order, axis=1)
+
+
+def explain_frame(predictor, df, top_k=3, explainer=None):
+    """
+    Predictions with WSS and model explanations as result columns
+
+    Args:
+        predictor: FacultyStressPredictor with a loaded model
+        df: DataFrame with the feature columns
+        top_k: factors listed per row
+        explainer: ForestExplainer to reuse (default: the predictor's)
+
+    Returns:
+        DataFrame with Stress_Level, P_<level>, WSS, then per rank i
+        WSS_Factor_i / WSS_Points_i (features scoring most WSS points) and
+        ML_Factor_i / ML_Contribution_i (features pushing the model most
+        towards the predicted level)
+    """
+    explainer = explainer or predictor.get_explainer()
+    proba, contributions = explainer.explain(df)
+    predicted = proba.argmax(axis=1)
+    points = predictor.calculate_wss_points_batch(df)
+    toward = contributions[np.arange(len(contributions)), :, predicted]
+
+    result = pd.DataFrame({'Stress_Level': explainer.classes_[predicted]}, index=df.index)
+    for i, level in enumerate(explainer.classes_):
+        result[f'P_{level}'] = proba[:, i].round(4)
+    result['WSS'] = points.sum(axis=1)
+    wss_names, wss_points = _top_columns(points, predictor.feature_columns, top_k)
+    ml_names, ml_scores = _top_columns(toward, predictor.feature_columns, top_k)
+    for i in range(wss_names.shape[1]):
+        result[f'WSS_Factor_{i + 1}'] = wss_names[:, i]
+        result[f'WSS_Points_{i + 1}'] = wss_points[:, i]
+    for i in range(ml_names.shape[1]):
+        result[f'ML_Factor_{i + 1}'] = ml_names[:, i]
+        result[f'ML_Contribution_{i + 1}'] = ml_scores[:, i].round(4)
+    return result
+
+
+def main():
+    """Main entry point"""
+    from stress_predictor import FacultyStressPredictor
+
+    parser = argparse.ArgumentParser(description="Explain stress predictions row by row")
+    parser.add_argument('input', help="Workload CSV with Faculty_ID")
+    parser.add_argument('--output', help="Write the explained results to this CSV")
+    parser.add_argument('--top', type=int, default=3)
+    parser.add_argument('--model', default='stress_model.joblib')
+    args = parser.parse_args()
+
+    predictor = FacultyStressPredictor()
+    with contextlib.redirect_stdout(sys.stderr):
+        predictor.load_model(args.model)
+    df = pd.read_csv(args.input)
+
+    start = time.perf_counter()
+    explainer = predictor.get_explainer()
+    result = explain_frame(predictor, df, args.top, explainer)
+    elapsed = time.perf_counter() - start
+    result.insert(0, 'Faculty_ID', df['Faculty_ID'].values)
+
+    print(f"Explained {len(df)} rows in {elapsed:.3f}s", file=sys.stderr)
+    if args.output:
+        result.to_csv(args.output, index=False)
+        print(f"Results saved to: {args.output}")
+    else:
+        print(result.head(10).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
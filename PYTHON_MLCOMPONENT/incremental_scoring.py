@@ -0,0 +1,269 @@
+"""
+Incremental Re-scoring of Faculty Rosters
+
+Nightly re-scoring used to predict every row even when only a handful of
+faculty updated their workload. A prediction store kept next to the
+results holds, per Faculty_ID (as a 64-bit key), a 64-bit fingerprint of the nine feature
+values and the last predicted stress level, together with the version
+(content hash) of the model that produced them. A re-score run hashes the
+incoming rows, reuses the stored prediction for every row whose ID and
+fingerprint match under the same model version, and runs inference only
+on new or changed rows. Loading a different model invalidates the store.
+
+The store is a NumPy .npz file (no pickled objects) replaced atomically
+on save.
+
+Usage:
+    python incremental_scoring.py <workload.csv> <results.csv> [--store prediction_store.npz]
+"""
+
+import argparse
+import contextlib
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_STORE = 'prediction_store.npz'
+
+_MIX_1 = np.uint64(0xBF58476D1CE4E5B9)
+_MIX_2 = np.uint64(0x94D049BB133111EB)
+_GOLDEN = np.uint64(0x9E3779B97F4A7C15)
+
+
+def _mix(h):
+    """splitmix64 finalizer, applied to a whole uint64 array"""
+    h = (h ^ (h >> np.uint64(30))) * _MIX_1
+    h = (h ^ (h >> np.uint64(27))) * _MIX_2
+    return h ^ (h >> np.uint64(31))
+
+
+def row_fingerprints(values):
+    """
+    64-bit fingerprint of each row of a feature matrix
+
+    Values are hashed through their float64 bit pattern, so 3 and 3.0 give
+    the same fingerprint and the column order matters.
+
+    Args:
+        values: 2-D array (rows x features)
+
+    Returns:
+        uint64 array with one fingerprint per row
+    """
+    bits = np.ascontiguousarray(values, dtype=np.float64).view(np.uint64)
+    # +0.0 and -0.0 compare equal but have different bit patterns
+    bits = np.where(bits == np.uint64(1 << 63), np.uint64(0), bits)
+    h = np.full(len(bits), _GOLDEN, dtype=np.uint64)
+    with np.errstate(over='ignore'):
+        for column in bits.T:
+            h = _mix(h * _GOLDEN + column)
+    return h
+
+
+def id_keys(ids):
+    """
+    Stable 64-bit key per Faculty_ID
+
+    Python's hash() is salted per process, so the IDs are hashed from
+    their UTF-32 code units instead. Trailing padding is skipped, making
+    the key independent of the array's string width.
+    """
+    ids = np.asarray(ids, dtype=str)
+    units = ids.view(np.uint32).reshape(len(ids), ids.dtype.itemsize // 4)
+    h = np.full(len(ids), _GOLDEN, dtype=np.uint64)
+    with np.errstate(over='ignore'):
+        for column in units.T.astype(np.uint64):
+            h = np.where(column != 0, _mix(h * _GOLDEN + column), h)
+    return h
+
+
+def last_occurrence(keys):
+    """Mask keeping only the last row of every repeated key"""
+    return ~pd.Index(keys).duplicated(keep='last')
+
+
+class PredictionStore:
+    """Last prediction and feature fingerprint per Faculty_ID key"""
+
+    def __init__(self, keys=(), fingerprints=(), labels=(), classes=(), model_version=None):
+        self.keys = np.asarray(keys, dtype=np.uint64)
+        self.fingerprints = np.asarray(fingerprints, dtype=np.uint64)
+        # Labels are stored as indices into classes
+        self.labels = np.asarray(labels, dtype=np.int8)
+        self.classes = np.asarray(classes, dtype=str)
+        self.model_version = model_version
+        self._index = None
+
+    def __len__(self):
+        return len(self.keys)
+
+    @classmethod
+    def load(cls, path):
+        """Read a store; a missing file gives an empty store"""
+        if not os.path.exists(path):
+            return cls()
+        with np.load(path, allow_pickle=False) as data:
+            version = str(data['model_version'])
+            keep = last_occurrence(data['keys'])
+            # Stores written before duplicate IDs were rejected may repeat keys
+            return cls(data['keys'][keep], data['fingerprints'][keep], data['labels'][keep],
+                       data['classes'], version or None)
+
+    def save(self, path):
+        """Write the store atomically (temp file + rename)"""
+        if not last_occurrence(self.keys).all():
+            raise ValueError("Prediction store keys must be unique (repeated Faculty_ID)")
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            np.savez(f, keys=self.keys, fingerprints=self.fingerprints, labels=self.labels,
+                     classes=self.classes, model_version=np.str_(self.model_version or ''))
+        os.replace(tmp_path, path)
+
+    def lookup(self, keys, fingerprints, model_version):
+        """
+        Find rows whose stored prediction is still valid
+
+        Args:
+            keys: id_keys of the incoming rows
+            fingerprints: row_fingerprints of the incoming rows
+            model_version: version of the model that would score them
+
+        Returns:
+            (found, reusable, labels): masks of rows whose ID is in the
+            store and of rows that can skip inference, and the stored
+            label index for each row (-1 where not reusable)
+        """
+        count = len(keys)
+        labels = np.full(count, -1, dtype=np.int8)
+        if not len(self):
+            return np.zeros(count, dtype=bool), np.zeros(count, dtype=bool), labels
+        if len(keys) == len(self) and np.array_equal(keys, self.keys):
+            # Same roster in the same order, the usual nightly case
+            positions = np.arange(count)
+        else:
+            if self._index is None:
+                self._index = pd.Index(self.keys)
+            positions = self._index.get_indexer(keys)
+        found = positions >= 0
+        if model_version is None or model_version != self.model_version:
+            # A different model may predict differently for every row
+            return found, np.zeros(count, dtype=bool), labels
+        reusable = found.copy()
+        reusable[found] = self.fingerprints[positions[found]] == fingerprints[found]
+        labels[reusable] = self.labels[positions[reusable]]
+        return found, reusable, labels
+
+
+class IncrementalScorer:
+    """
+    Scores a roster, running inference only for new or changed rows
+
+    Rows can be fed in several chunks; commit() then replaces the store
+    with the roster seen in this run, so faculty missing from the input
+    drop out of the store. A Faculty_ID seen more than once in a run is
+    stored once, with its last row.
+    """
+
+    def __init__(self, predictor, store_path=DEFAULT_STORE):
+        self.predictor = predictor
+        self.store_path = store_path
+        self.store = PredictionStore.load(store_path)
+        self.classes = np.asarray(predictor.model.classes_, dtype=str)
+        self.stats = {'rows': 0, 'unchanged': 0, 'changed': 0, 'new': 0}
+        self._keys, self._fingerprints, self._labels = [], [], []
+
+    def score(self, chunk, predict=None):
+        """
+        Predict stress levels for a chunk, reusing unchanged rows
+
+        Args:
+            chunk: DataFrame with Faculty_ID and the feature columns
+            predict: callable used for the changed rows
+                     (default: predictor.predict)
+
+        Returns:
+            NumPy array of stress levels, one per row
+        """
+        predict = predict or self.predictor.predict
+        keys = id_keys(chunk['Faculty_ID'].to_numpy())
+        fingerprints = row_fingerprints(chunk[self.predictor.feature_columns].to_numpy())
+        found, reusable, label_idx = self.store.lookup(keys, fingerprints,
+                                                       self.predictor.model_version)
+        changed = ~reusable
+        if changed.any():
+            # classes_ is sorted, so searchsorted maps labels to their index
+            label_idx[changed] = np.searchsorted(self.classes, predict(chunk[changed]))
+
+        self._keys.append(keys)
+        self._fingerprints.append(fingerprints)
+        self._labels.append(label_idx)
+        unchanged = int(np.count_nonzero(reusable))
+        new = int(np.count_nonzero(~found))
+        self.stats['rows'] += len(chunk)
+        self.stats['unchanged'] += unchanged
+        self.stats['new'] += new
+        self.stats['changed'] += len(chunk) - unchanged - new
+        return self.classes[label_idx]
+
+    def commit(self):
+        """Replace the store with this run's roster and predictions"""
+        concat = lambda parts, dtype: np.concatenate(parts) if parts else np.zeros(0, dtype)
+        keys = concat(self._keys, np.uint64)
+        keep = last_occurrence(keys)
+        store = PredictionStore(
+            keys[keep],
+            concat(self._fingerprints, np.uint64)[keep],
+            concat(self._labels, np.int8)[keep],
+            self.classes,
+            self.predictor.model_version,
+        )
+        store.save(self.store_path)
+        self.store = store
+        self._keys, self._fingerprints, self._labels = [], [], []
+        return store
+
+
+def rescore(predictor, df, store_path=DEFAULT_STORE):
+    """
+    Re-score a whole roster against the store and update the store
+
+    Returns:
+        (labels, stats) where stats counts rows, unchanged, changed and new
+    """
+    scorer = IncrementalScorer(predictor, store_path)
+    labels = scorer.score(df)
+    scorer.commit()
+    return labels, scorer.stats
+
+
+def main():
+    """Main entry point"""
+    from stress_predictor import FacultyStressPredictor
+
+    parser = argparse.ArgumentParser(description="Re-score only new or changed faculty rows")
+    parser.add_argument('input', help="Workload CSV with Faculty_ID")
+    parser.add_argument('output', help="Results CSV (Faculty_ID,Stress_Level)")
+    parser.add_argument('--store', default=DEFAULT_STORE, help="Prediction store (.npz)")
+    parser.add_argument('--model', default='stress_model.joblib')
+    args = parser.parse_args()
+
+    predictor = FacultyStressPredictor()
+    with contextlib.redirect_stdout(sys.stderr):
+        predictor.load_model(args.model)
+    df = pd.read_csv(args.input)
+
+    start = time.perf_counter()
+    labels, stats = rescore(predictor, df, args.store)
+    elapsed = time.perf_counter() - start
+    pd.DataFrame({'Faculty_ID': df['Faculty_ID'], 'Stress_Level': labels}).to_csv(args.output, index=False)
+
+    print(f"Rows: {stats['rows']}  unchanged: {stats['unchanged']}  changed: {stats['changed']}  "
+          f"new: {stats['new']}  ({elapsed:.3f}s)")
+    print(f"Results saved to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
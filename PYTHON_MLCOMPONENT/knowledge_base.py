@@ -0,0 +1,125 @@
+"""
+Shared Knowledge Base Loader
+Single source of truth for the Wellness Expert System facts and rules
+
+The facts (condition indicators) and rules (recommendations) live in
+knowledge_base.json. They are loaded once into an immutable, interned
+lookup structure that every WellnessExpertSystem instance in the process
+shares. The file's modification time is checked on access, so editing the
+JSON is picked up by long-running processes without a restart.
+
+The Visual Prolog clauses in WellnessExpert/wellness.cl are generated from
+the same file:
+    python knowledge_base.py --prolog
+"""
+
+import json
+import os
+import sys
+import threading
+from types import MappingProxyType
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_KNOWLEDGE_FILE = os.path.join(SCRIPT_DIR, 'knowledge_base.json')
+
+_cache = {}
+_cache_lock = threading.Lock()
+
+
+class KnowledgeBase:
+    """Immutable snapshot of the facts and rules loaded from one file"""
+
+    __slots__ = ('path', 'mtime_ns', 'facts', 'rules')
+
+    def __init__(self, path, mtime_ns, facts, rules):
+        self.path = path
+        self.mtime_ns = mtime_ns
+        self.facts = facts
+        self.rules = rules
+
+    @classmethod
+    def from_file(cls, path):
+        """Parse a knowledge base JSON file into a frozen KnowledgeBase"""
+        mtime_ns = os.stat(path).st_mtime_ns
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+
+        if 'facts' not in data or 'rules' not in data:
+            raise ValueError(f"Knowledge base {path} must define 'facts' and 'rules'")
+
+        return cls(path, mtime_ns, _freeze(data['facts']), _freeze(data['rules']))
+
+
+def _freeze(section):
+    """Intern every key/text and wrap each mapping in a read-only proxy"""
+    frozen = {}
+    for name, values in section.items():
+        frozen[sys.intern(name)] = MappingProxyType({
+            sys.intern(level): sys.intern(text) for level, text in values.items()
+        })
+    return MappingProxyType(frozen)
+
+
+def load_knowledge_base(path=None):
+    """
+    Return the shared KnowledgeBase for a file, reloading it if changed
+
+    Args:
+        path: knowledge base JSON file (defaults to knowledge_base.json)
+
+    Returns:
+        KnowledgeBase shared by every caller using the same file
+    """
+    path = os.path.abspath(path or DEFAULT_KNOWLEDGE_FILE)
+    kb = _cache.get(path)
+    if kb is not None and _mtime_ns(path) in (kb.mtime_ns, None):
+        return kb
+
+    with _cache_lock:
+        kb = _cache.get(path)
+        if kb is None or _mtime_ns(path) not in (kb.mtime_ns, None):
+            try:
+                kb = KnowledgeBase.from_file(path)
+            except (OSError, ValueError) as e:
+                # Keep serving the last good copy if an edit is half-written
+                if kb is None:
+                    raise
+                print(f"Warning: could not reload knowledge base {path}: {e}")
+                return kb
+            _cache[path] = kb
+    return kb
+
+
+def _mtime_ns(path):
+    """Modification time of a file, or None if it cannot be read"""
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def export_prolog_clauses(kb):
+    """Render the facts and rules as Visual Prolog clauses for wellness.cl"""
+    lines = []
+    for section in (kb.facts, kb.rules):
+        for name, values in section.items():
+            for level, text in values.items():
+                escaped = text.replace('\\', '\\\\').replace('"', '\\"')
+                lines.append(f'    {name}({level}, "{escaped}").')
+            lines.append('')
+    return "\n".join(lines)
+
+
+def main():
+    """Main entry point"""
+    kb = load_knowledge_base(sys.argv[2] if len(sys.argv) > 2 else None)
+    if len(sys.argv) > 1 and sys.argv[1] == '--prolog':
+        print(export_prolog_clauses(kb), end='')
+    else:
+        print(f"Knowledge base: {kb.path}")
+        print(f"Facts: {len(kb.facts)}")
+        print(f"Rules: {len(kb.rules)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,213 @@
+"""
+Concurrent Load-testing Harness for the Prediction Path
+
+Synthesizes faculty submissions with the same distributions as
+generate_dataset.generate_faculty_data and drives FacultyStressPredictor
+in-process at a configurable concurrency and (optionally) a fixed request
+rate. Throughput, p50/p99/p999 latency and error counts are reported per
+interval and for the whole run.
+
+With --rate the test is open-loop: requests are scheduled at fixed times
+and latency is measured from the scheduled start, so time spent queueing
+behind slow requests counts (no coordinated omission). Without --rate each
+of the --concurrency workers sends its next request as soon as the
+previous one finishes.
+
+Usage:
+    python load_test.py [--concurrency 8] [--rate 200] [--duration 30]
+                        [--operation predict_with_details|predict]
+                        [--interval 5] [--output load_test.json]
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from generate_dataset import generate_faculty_data
+from metrics import LatencyHistogram
+from records import RecordBatch
+from stress_predictor import FacultyStressPredictor
+
+OPERATIONS = ('predict_with_details', 'predict')
+
+
+def synthesize_records(count, seed=42):
+    """Faculty records drawn from generate_faculty_data's distributions"""
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        df = generate_faculty_data(count, balanced=True)
+    records = list(RecordBatch.from_frame(df))
+    np.random.default_rng(seed).shuffle(records)
+    return records
+
+
+class IntervalStats:
+    """Latency histogram and error count for one reporting interval"""
+
+    def __init__(self, start):
+        self.start = start
+        self.latency = LatencyHistogram()
+        self.errors = 0
+
+    def summary(self, elapsed):
+        requests = self.latency.count
+        return {
+            'start_s': round(self.start, 3),
+            'requests': requests,
+            'errors': self.errors,
+            'throughput_rps': round(requests / elapsed, 1) if elapsed > 0 else None,
+            'p50_ms': _ms(self.latency.quantile(0.50)),
+            'p99_ms': _ms(self.latency.quantile(0.99)),
+            'p999_ms': _ms(self.latency.quantile(0.999)),
+            'max_ms': _ms(self.latency.max if requests else None),
+        }
+
+
+def _ms(seconds):
+    return None if seconds is None else round(seconds * 1000, 3)
+
+
+class LoadTest:
+    def __init__(self, predictor, records, concurrency=8, rate=None,
+                 operation='predict_with_details', interval=5.0):
+        if operation not in OPERATIONS:
+            raise ValueError(f"Unknown operation '{operation}'. Use one of: {', '.join(OPERATIONS)}")
+        self.predictor = predictor
+        self.records = records
+        self.concurrency = concurrency
+        self.rate = rate
+        self.operation = getattr(predictor, operation)
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._next_record = 0
+
+    def _record(self):
+        with self._lock:
+            record = self.records[self._next_record % len(self.records)]
+            self._next_record += 1
+        return record
+
+    def _call(self, scheduled, run_start, intervals, overall):
+        """Issue one request and attribute its latency to an interval"""
+        failed = False
+        try:
+            self.operation(self._record())
+        except Exception:
+            failed = True
+        finished = time.perf_counter()
+        latency = finished - scheduled
+        index = int((finished - run_start) // self.interval)
+        with self._lock:
+            while len(intervals) <= index:
+                intervals.append(IntervalStats(len(intervals) * self.interval))
+            stats = intervals[index]
+        if failed:
+            with self._lock:
+                stats.errors += 1
+                overall.errors += 1
+        else:
+            stats.latency.observe(latency)
+            overall.latency.observe(latency)
+
+    def run(self, duration):
+        """
+        Generate load for `duration` seconds
+
+        Returns:
+            dict with per-interval and overall summaries
+        """
+        intervals = []
+        overall = IntervalStats(0.0)
+        run_start = time.perf_counter()
+        deadline = run_start + duration
+
+        if self.rate:
+            # Open loop: schedule requests at fixed times regardless of latency
+            period = 1.0 / self.rate
+            with ThreadPoolExecutor(self.concurrency) as pool:
+                sent = 0
+                while True:
+                    scheduled = run_start + sent * period
+                    if scheduled >= deadline:
+                        break
+                    delay = scheduled - time.perf_counter()
+                    if delay > 0:
+                        time.sleep(delay)
+                    pool.submit(self._call, scheduled, run_start, intervals, overall)
+                    sent += 1
+        else:
+            # Closed loop: each worker sends back-to-back requests
+            def worker():
+                while time.perf_counter() < deadline:
+                    self._call(time.perf_counter(), run_start, intervals, overall)
+
+            threads = [threading.Thread(target=worker) for _ in range(self.concurrency)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        elapsed = time.perf_counter() - run_start
+        interval_summaries = []
+        for stats in intervals:
+            span = min(self.interval, elapsed - stats.start)
+            interval_summaries.append(stats.summary(span))
+        return {
+            'config': {
+                'concurrency': self.concurrency,
+                'rate': self.rate,
+                'operation': self.operation.__name__,
+                'duration_s': duration,
+                'interval_s': self.interval,
+            },
+            'intervals': interval_summaries,
+            'overall': overall.summary(elapsed),
+        }
+
+
+def print_results(results):
+    """Print the per-interval table and the overall summary"""
+    print(f"\n{'t (s)':>7} {'req':>7} {'err':>5} {'rps':>9} {'p50 ms':>9} {'p99 ms':>9} {'p999 ms':>9}")
+    print("-"*60)
+    for row in results['intervals'] + [dict(results['overall'], start_s='total')]:
+        print(f"{row['start_s']!s:>7} {row['requests']:>7} {row['errors']:>5} "
+              f"{row['throughput_rps'] or 0:>9.1f} {row['p50_ms'] or 0:>9.3f} "
+              f"{row['p99_ms'] or 0:>9.3f} {row['p999_ms'] or 0:>9.3f}")
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description="Load test the stress prediction path")
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--rate', type=float, help="Target requests/sec (open loop)")
+    parser.add_argument('--duration', type=float, default=30.0, help="Seconds of load")
+    parser.add_argument('--interval', type=float, default=5.0, help="Reporting interval (s)")
+    parser.add_argument('--operation', choices=OPERATIONS, default='predict_with_details')
+    parser.add_argument('--records', type=int, default=5000, help="Synthetic record pool size")
+    parser.add_argument('--model', default='stress_model.joblib')
+    parser.add_argument('--output', help="Write results as JSON")
+    args = parser.parse_args()
+
+    predictor = FacultyStressPredictor()
+    predictor.load_model(args.model)
+    records = synthesize_records(args.records)
+
+    mode = f"{args.rate:g} req/s open loop" if args.rate else "closed loop"
+    print(f"Load test: {args.operation}, concurrency {args.concurrency}, {mode}, {args.duration:g}s")
+    results = LoadTest(predictor, records, args.concurrency, args.rate,
+                       args.operation, args.interval).run(args.duration)
+    print_results(results)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults saved to: {os.path.abspath(args.output)}")
+
+
+if __name__ == "__main__":
+    main()
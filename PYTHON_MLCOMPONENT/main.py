@@ -13,6 +13,13 @@ Usage:
 import os
 from stress_predictor import FacultyStressPredictor
 from wellness_expert_python import WellnessExpertSystem
+from validation import prompt_feature
+from incremental_scoring import DEFAULT_STORE, rescore
+from whatif_planner import WhatIfPlanner, format_plan
+from peer_index import PeerIndex
+from cohort_rollup import CohortRollup
+from percentile_index import build_index
+from records import FacultyRecord
 
 # Get the directory where this script is located
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -26,6 +33,30 @@ def print_banner():
     print("     Hybrid AI System: Python ML + Rule-Based Expert System")
     print("="*70 + "\n")
 
+def print_explanation(result):
+    """Show why the formula and the model scored this faculty member as they did"""
+    breakdown = ", ".join(f"{col} {pts}" for col, pts in result['wss_breakdown'].items() if pts > 1)
+    print(f"\nWSS points above baseline: {breakdown or 'none'}")
+    factors = ", ".join(f"{col} {value:+.2f}" for col, value in result['ml_factors'])
+    print(f"Features pushing towards {result['ml_prediction']}: {factors}")
+
+def rank_result(percentile_index, result):
+    """Percentile ranking of a prediction's WSS and P(High) in the roster"""
+    p_high = (result['probabilities'] or {}).get('High', 0.0)
+    return {'wss': result['wss_score'], 'p_high': p_high,
+            'scopes': percentile_index.percentiles(result['wss_score'], p_high)}
+
+def print_whatif_plans(planner, faculty_data, top_k=3):
+    """Show the cheapest workload changes that would lower the predicted level"""
+    result = planner.plan(faculty_data, top_k=top_k)
+    if result['target_level'] is None:
+        return
+    print(f"\nWhat-if: smallest changes to reach {result['target_level']} stress")
+    for plan in result['plans']:
+        print(f"  {format_plan(plan)}")
+    if not result['plans']:
+        print("  No plan found within the allowed number of changes.")
+
 def run_integrated_system():
     """Run the complete integrated system"""
     print_banner()
@@ -43,6 +74,11 @@ def run_integrated_system():
         X, y = predictor.load_and_prepare_data()
         predictor.train_model(X, y, model_type='random_forest')
         predictor.save_model(model_file)
+    planner = WhatIfPlanner(predictor)
+    import pandas as pd
+    roster = pd.read_csv(os.path.join(SCRIPT_DIR, 'dataset_with_labels.csv'))
+    peer_index = PeerIndex.from_frame(roster)
+    percentile_index = build_index(predictor, roster)
 
     while True:
         print("\n" + "-"*70)
@@ -66,16 +102,18 @@ def run_integrated_system():
             faculty_id = input("Faculty ID (e.g., F999): ").strip()
 
             print("\nEnter workload metrics:")
-            data = {}
-            data['Subjects_Handled'] = int(input("  Subjects handled (1-6): "))
-            data['Students_Total'] = int(input("  Total students (20-200): "))
-            data['Prep_Hours'] = int(input("  Preparation hours/week (3-15): "))
-            data['Research_Load_Hours'] = int(input("  Research hours/week (0-12): "))
-            data['Committee_Duties'] = int(input("  Committee duties (0-5): "))
-            data['Admin_Tasks'] = int(input("  Admin tasks (0-6): "))
-            data['Meeting_Hours'] = int(input("  Meeting hours/week (1-10): "))
-            data['Sleep_Hours'] = int(input("  Sleep hours/night (4-9): "))
-            data['Weekend_Work'] = int(input("  Weekend work frequency (0-5): "))
+            data = FacultyRecord(
+                faculty_id,
+                Subjects_Handled=prompt_feature("  Subjects handled (1-6): ", 'Subjects_Handled'),
+                Students_Total=prompt_feature("  Total students (20-200): ", 'Students_Total'),
+                Prep_Hours=prompt_feature("  Preparation hours/week (3-15): ", 'Prep_Hours'),
+                Research_Load_Hours=prompt_feature("  Research hours/week (0-12): ", 'Research_Load_Hours'),
+                Committee_Duties=prompt_feature("  Committee duties (0-5): ", 'Committee_Duties'),
+                Admin_Tasks=prompt_feature("  Admin tasks (0-6): ", 'Admin_Tasks'),
+                Meeting_Hours=prompt_feature("  Meeting hours/week (1-10): ", 'Meeting_Hours'),
+                Sleep_Hours=prompt_feature("  Sleep hours/night (4-9): ", 'Sleep_Hours'),
+                Weekend_Work=prompt_feature("  Weekend work frequency (0-5): ", 'Weekend_Work'),
+            )
 
             # ML Prediction
             result = predictor.predict_with_details(data)
@@ -93,12 +131,16 @@ def run_integrated_system():
                     bar = "#" * int(prob * 20)
                     print(f"  {level:6s}: {bar} {prob:.1%}")
 
+            print_explanation(result)
+            print_whatif_plans(planner, data)
+
             # Generate output file
             predictor.generate_prolog_output(faculty_id, result['ml_prediction'])
 
             # Run Expert System
+            peers = peer_index.compare(data, [result['ml_prediction']])[0]
             print("\nRunning Expert System for recommendations...")
-            expert_system.run()
+            expert_system.run(peers=peers, ranking=rank_result(percentile_index, result))
 
         elif choice == '2':
             # Select from dataset
@@ -114,7 +156,7 @@ def run_integrated_system():
 
             if faculty_id in df['Faculty_ID'].values:
                 faculty_row = df[df['Faculty_ID'] == faculty_id].iloc[0]
-                faculty_data = faculty_row[predictor.feature_columns].to_dict()
+                faculty_data = FacultyRecord.from_mapping(faculty_row)
 
                 # Display faculty data
                 print("\n" + "="*50)
@@ -142,10 +184,14 @@ def run_integrated_system():
                         bar = "#" * int(prob * 20)
                         print(f"  {level:6s}: {bar} {prob:.1%}")
 
+                print_explanation(result)
+                print_whatif_plans(planner, faculty_data)
+
                 # Generate output file and run expert system
                 predictor.generate_prolog_output(faculty_id, result['ml_prediction'])
+                peers = peer_index.compare(faculty_data, [result['ml_prediction']])[0]
                 print("\nRunning Expert System for recommendations...")
-                expert_system.run()
+                expert_system.run(peers=peers, ranking=rank_result(percentile_index, result))
             else:
                 print(f"Faculty ID '{faculty_id}' not found.")
 
@@ -170,9 +216,10 @@ def run_integrated_system():
                 bar = "#" * int(pct / 2)
                 print(f"  {level:6s}: {count:3d} ({pct:5.1f}%) {bar}")
 
-            # Predict all and show accuracy
-            X = df[predictor.feature_columns]
-            predictions = predictor.predict(X)
+            # Predict all and show accuracy; only new or changed rows hit the model
+            predictions, stats = rescore(predictor, df, os.path.join(SCRIPT_DIR, DEFAULT_STORE))
+            print(f"\nRe-scored {stats['changed'] + stats['new']} new/changed rows, "
+                  f"reused {stats['unchanged']} stored predictions")
             correct = sum(predictions == df['Stress_Level'])
             accuracy = correct / total * 100
 
@@ -183,13 +230,19 @@ def run_integrated_system():
             print("-"*60)
             print(f"{'ID':<6} {'Actual':<8} {'Predicted':<10} {'Result'}")
             print("-"*60)
-            for i in range(min(10, len(df))):
-                fid = df.iloc[i]['Faculty_ID']
-                actual = df.iloc[i]['Stress_Level']
-                pred = predictions[i]
+            sample = zip(df['Faculty_ID'].head(10), df['Stress_Level'].head(10), predictions[:10])
+            for fid, actual, pred in sample:
                 result = "OK" if actual == pred else "X"
                 print(f"{fid:<6} {actual:<8} {pred:<10} {result}")
 
+            # Roll-up per department when the dataset has one
+            rollup = CohortRollup('Department' if 'Department' in df.columns else None)
+            points = predictor.calculate_wss_points_batch(df)
+            rollup.update(df, predictions, points,
+                          predictor.get_stress_levels_from_wss_batch(points.sum(axis=1)))
+            print("\nCohort Summary:")
+            print(rollup.summary().to_string(index=False))
+
         elif choice == '4':
             # View model performance
             print("\n" + "="*50)
@@ -0,0 +1,293 @@
+"""
+Hot-path Instrumentation and Metrics Export
+
+Low-overhead timing spans and counters for the predictor and the expert
+system. Span durations are aggregated into fixed-bucket latency histograms
+(p50/p95/p99 are estimated from the buckets, so memory per span is
+constant) and can be exported as Prometheus text format or JSON snapshots.
+A sampling profiler can be switched on at runtime to see where time goes
+inside a span.
+
+Usage:
+    from metrics import METRICS, timed
+
+    @timed('predict')
+    def predict(...): ...
+
+    with METRICS.span('csv_load'):
+        ...
+
+    METRICS.count('rows_scored', len(df))
+    print(METRICS.to_prometheus())
+
+    METRICS.profiler.start()      # or send SIGUSR1 after install_signal_toggle()
+    ...
+    print(METRICS.profiler.report())
+"""
+
+import bisect
+import functools
+import json
+import math
+import signal
+import sys
+import threading
+import time
+from collections import Counter
+
+METRIC_PREFIX = 'stress'
+
+# Histogram upper bounds in seconds: 1us .. ~92s, each sqrt(2) apart
+LATENCY_BUCKETS = tuple(1e-6 * math.sqrt(2) ** i for i in range(54))
+
+
+class LatencyHistogram:
+    """Fixed-bucket histogram of durations in seconds"""
+
+    __slots__ = ('bounds', 'counts', 'total', 'count', 'max', '_lock')
+
+    def __init__(self, bounds=LATENCY_BUCKETS):
+        self.bounds = bounds
+        # One extra bucket for values above the last bound
+        self.counts = [0] * (len(bounds) + 1)
+        self.total = 0.0
+        self.count = 0
+        self.max = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, seconds):
+        """Record one duration"""
+        index = bisect.bisect_left(self.bounds, seconds)
+        with self._lock:
+            self.counts[index] += 1
+            self.total += seconds
+            self.count += 1
+            if seconds > self.max:
+                self.max = seconds
+
+    def quantile(self, q):
+        """Estimate a quantile by interpolating inside the matching bucket"""
+        if self.count == 0:
+            return None
+        rank = q * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            if bucket_count and seen + bucket_count >= rank:
+                lower = self.bounds[index - 1] if index > 0 else 0.0
+                upper = self.bounds[index] if index < len(self.bounds) else self.max
+                fraction = (rank - seen) / bucket_count
+                return min(lower + (upper - lower) * fraction, self.max)
+            seen += bucket_count
+        return self.max
+
+    def summary(self):
+        """Count, sum, mean, max and p50/p95/p99 in seconds"""
+        return {
+            'count': self.count,
+            'sum': self.total,
+            'mean': self.total / self.count if self.count else None,
+            'max': self.max if self.count else None,
+            'p50': self.quantile(0.50),
+            'p95': self.quantile(0.95),
+            'p99': self.quantile(0.99),
+        }
+
+
+class SamplingProfiler:
+    """
+    Statistical profiler that samples the stacks of all threads
+
+    Samples are aggregated as collapsed stacks ("outer;inner;leaf" -> count),
+    the format consumed by flame graph tools. Nothing runs while stopped.
+    """
+
+    def __init__(self, interval=0.005, max_depth=32):
+        self.interval = interval
+        self.max_depth = max_depth
+        self.stacks = Counter()
+        self.samples = 0
+        self._thread = None
+        self._stop = threading.Event()
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        """Begin sampling in a background daemon thread"""
+        if self.running:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='stress-profiler', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop sampling; collected stacks are kept until reset()"""
+        if not self.running:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+
+    def toggle(self, *_):
+        """Start if stopped, stop if running (usable as a signal handler)"""
+        if self.running:
+            self.stop()
+        else:
+            self.start()
+
+    def reset(self):
+        self.stacks.clear()
+        self.samples = 0
+
+    def _run(self):
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                names = []
+                while frame is not None and len(names) < self.max_depth:
+                    code = frame.f_code
+                    names.append(f"{code.co_name} ({code.co_filename.rsplit('/', 1)[-1]}:{frame.f_lineno})")
+                    frame = frame.f_back
+                self.stacks[';'.join(reversed(names))] += 1
+            self.samples += 1
+
+    def report(self, top=20):
+        """Most frequently sampled leaf functions, as text"""
+        leaves = Counter()
+        for stack, count in self.stacks.items():
+            leaves[stack.rsplit(';', 1)[-1]] += count
+        total = sum(leaves.values()) or 1
+        lines = [f"Sampling profile: {self.samples} samples every {self.interval * 1000:.1f} ms"]
+        for leaf, count in leaves.most_common(top):
+            lines.append(f"  {count / total:6.1%}  {leaf}")
+        return "\n".join(lines)
+
+    def collapsed(self):
+        """Collapsed-stack text for flame graph tools"""
+        return "\n".join(f"{stack} {count}" for stack, count in self.stacks.most_common())
+
+
+class MetricsRegistry:
+    """Process-wide spans (latency histograms) and counters"""
+
+    def __init__(self):
+        self.enabled = True
+        self.spans = {}
+        self.counters = Counter()
+        self.profiler = SamplingProfiler()
+        self._lock = threading.Lock()
+
+    def _histogram(self, name):
+        histogram = self.spans.get(name)
+        if histogram is None:
+            with self._lock:
+                histogram = self.spans.setdefault(name, LatencyHistogram())
+        return histogram
+
+    def observe(self, name, seconds):
+        """Record a span duration measured elsewhere"""
+        if self.enabled:
+            self._histogram(name).observe(seconds)
+
+    def count(self, name, value=1):
+        """Increment a counter"""
+        if self.enabled:
+            with self._lock:
+                self.counters[name] += value
+
+    def span(self, name):
+        """Context manager timing the enclosed block"""
+        return _Span(self, name)
+
+    def reset(self):
+        with self._lock:
+            self.spans = {}
+            self.counters = Counter()
+
+    def snapshot(self):
+        """Point-in-time copy of every span summary and counter"""
+        return {
+            'timestamp': time.time(),
+            'spans': {name: h.summary() for name, h in sorted(self.spans.items())},
+            'counters': dict(sorted(self.counters.items())),
+        }
+
+    def to_json(self):
+        return json.dumps(self.snapshot(), indent=2)
+
+    def to_prometheus(self):
+        """Render all metrics in the Prometheus text exposition format"""
+        family = f"{METRIC_PREFIX}_span_seconds"
+        lines = [
+            f"# HELP {family} Latency of instrumented pipeline stages.",
+            f"# TYPE {family} histogram",
+        ]
+        for name, histogram in sorted(self.spans.items()):
+            cumulative = 0
+            for bound, bucket_count in zip(histogram.bounds, histogram.counts):
+                cumulative += bucket_count
+                lines.append(f'{family}_bucket{{span="{name}",le="{bound:.9g}"}} {cumulative}')
+            lines.append(f'{family}_bucket{{span="{name}",le="+Inf"}} {histogram.count}')
+            lines.append(f'{family}_sum{{span="{name}"}} {histogram.total:.9g}')
+            lines.append(f'{family}_count{{span="{name}"}} {histogram.count}')
+
+        for name, value in sorted(self.counters.items()):
+            metric = f"{METRIC_PREFIX}_{name}_total"
+            lines.append(f"# TYPE {metric} counter")
+            lines.append(f"{metric} {value}")
+        return "\n".join(lines) + "\n"
+
+    def write(self, path):
+        """Write a snapshot; '.prom' / '.txt' files get Prometheus text, others JSON"""
+        text = self.to_prometheus() if path.endswith(('.prom', '.txt')) else self.to_json()
+        with open(path, 'w') as f:
+            f.write(text)
+
+    def install_signal_toggle(self, signum=None):
+        """Toggle the sampling profiler whenever the process receives signum"""
+        signum = signum if signum is not None else getattr(signal, 'SIGUSR1', None)
+        if signum is None:
+            raise RuntimeError("No default toggle signal on this platform; pass one explicitly")
+        signal.signal(signum, self.profiler.toggle)
+
+
+class _Span:
+    __slots__ = ('registry', 'name', 'start')
+
+    def __init__(self, registry, name):
+        self.registry = registry
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.registry.observe(self.name, time.perf_counter() - self.start)
+        if exc_type is not None:
+            self.registry.count(f"{self.name}_errors")
+
+
+METRICS = MetricsRegistry()
+
+
+def timed(name, registry=METRICS):
+    """Decorator recording every call of a function as a span"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not registry.enabled:
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            except BaseException:
+                registry.count(f"{name}_errors")
+                raise
+            finally:
+                registry.observe(name, time.perf_counter() - start)
+        return wrapper
+    return decorator
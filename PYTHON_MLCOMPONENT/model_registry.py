@@ -0,0 +1,328 @@
+"""
+Versioned Model Registry with Atomic Publish and Hot-swap
+
+Models are published into a registry directory instead of overwriting
+stress_model.joblib in place:
+
+    model_registry/
+        registry.json          current version, activation history, metadata
+        versions/v0001.joblib  one immutable file per published version
+
+Every write goes to a temporary file in the same directory, is flushed
+to disk and then renamed over the target (os.replace is atomic), so a
+reader sees either the old file or the new one, never a partial one.
+Version files are never modified after publish. A version name is
+reserved by creating its file exclusively (O_CREAT | O_EXCL), and every
+read-modify-write of registry.json holds an exclusive lock on
+registry.lock, so concurrent publishers in different processes each get
+their own version and none is lost.
+
+A long-running FacultyStressPredictor can follow the registry with a
+RegistryWatcher. The watcher polls registry.json from a background
+thread. When the current version changes, it loads the new model, warms
+it up (a test prediction plus the explainer tables) and only then swaps
+it into the predictor. Requests in flight keep using the model they
+started with. Rollback re-activates the previously active version.
+
+Usage:
+    python model_registry.py publish <model.joblib> [--note "retrained on May data"]
+    python model_registry.py list
+    python model_registry.py activate <version>
+    python model_registry.py rollback
+"""
+
+import argparse
+import contextlib
+import datetime
+import json
+import os
+import sys
+import threading
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+import joblib
+import pandas as pd
+
+from validation import FEATURE_RANGES
+
+DEFAULT_REGISTRY = 'model_registry'
+STATE_FILE = 'registry.json'
+LOCK_FILE = 'registry.lock'
+
+
+def atomic_write(path, write):
+    """
+    Write a file via a temporary sibling and an atomic rename
+
+    Args:
+        path: final file path
+        write: callable receiving the open binary file object
+    """
+    tmp_path = f"{path}.tmp.{os.getpid()}.{threading.get_ident()}"
+    try:
+        with open(tmp_path, 'wb') as f:
+            write(f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+class ModelRegistry:
+    """
+    Directory of immutable model versions plus an atomically replaced pointer
+
+    Args:
+        root: registry directory (created on first publish)
+    """
+
+    def __init__(self, root=DEFAULT_REGISTRY):
+        self.root = root
+        self.versions_dir = os.path.join(root, 'versions')
+        self.state_path = os.path.join(root, STATE_FILE)
+        self.lock_path = os.path.join(root, LOCK_FILE)
+        self._lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def _locked(self):
+        """Hold the registry lock against other threads and other processes"""
+        os.makedirs(self.root, exist_ok=True)
+        with self._lock, open(self.lock_path, 'a+b') as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            else:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+                else:
+                    lock_file.seek(0)
+                    msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+
+    def _read_state(self):
+        try:
+            with open(self.state_path) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {'current': None, 'history': [], 'versions': {}}
+
+    def _write_state(self, state):
+        data = json.dumps(state, indent=2).encode('utf-8')
+        atomic_write(self.state_path, lambda f: f.write(data))
+
+    def current_version(self):
+        """Version name currently active, or None for an empty registry"""
+        return self._read_state()['current']
+
+    def versions(self):
+        """Metadata of every published version, oldest first"""
+        state = self._read_state()
+        return [dict(info, version=name, active=name == state['current'])
+                for name, info in state['versions'].items()]
+
+    def path(self, version):
+        """File holding a published version"""
+        return os.path.join(self.versions_dir, f"{version}.joblib")
+
+    def publish(self, model, note=None, activate=True):
+        """
+        Publish a model as a new immutable version
+
+        Args:
+            model: fitted estimator
+            note: free-text description stored with the version
+            activate: make it the current version
+
+        Returns:
+            The new version name
+        """
+        from stress_predictor import _file_digest
+
+        os.makedirs(self.versions_dir, exist_ok=True)
+        version, path = self._reserve_version()
+        try:
+            atomic_write(path, lambda f: joblib.dump(model, f))
+            digest = _file_digest(path)
+        except BaseException:
+            os.remove(path)
+            raise
+        with self._locked():
+            state = self._read_state()
+            state['versions'][version] = {
+                'digest': digest,
+                'published': datetime.datetime.now().isoformat(timespec='seconds'),
+                'note': note,
+            }
+            if activate:
+                state['current'] = version
+                state['history'].append(version)
+            self._write_state(state)
+        return version
+
+    def _reserve_version(self):
+        """Claim the next free version name by creating its file exclusively"""
+        with self._locked():
+            number = len(self._read_state()['versions']) + 1
+        while True:
+            version = f"v{number:04d}"
+            path = self.path(version)
+            try:
+                os.close(os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+                return version, path
+            except FileExistsError:
+                # Taken by another publisher (possibly still writing it)
+                number += 1
+
+    def activate(self, version):
+        """Make a published version current"""
+        with self._locked():
+            state = self._read_state()
+            if version not in state['versions']:
+                raise ValueError(f"Unknown model version: {version}")
+            if state['current'] != version:
+                state['current'] = version
+                state['history'].append(version)
+                self._write_state(state)
+
+    def rollback(self):
+        """
+        Re-activate the version that was active before the current one
+
+        Returns:
+            The version now current
+        """
+        with self._locked():
+            state = self._read_state()
+            if len(state['history']) < 2:
+                raise ValueError("No earlier version to roll back to")
+            state['history'].pop()
+            state['current'] = state['history'][-1]
+            self._write_state(state)
+            return state['current']
+
+    def load(self, version=None):
+        """
+        Load a version (default: the current one)
+
+        Returns:
+            (model, version, digest)
+        """
+        state = self._read_state()
+        version = version or state['current']
+        if version is None:
+            raise ValueError(f"Registry {self.root} has no published model")
+        return joblib.load(self.path(version)), version, state['versions'][version]['digest']
+
+
+def warm_up(predictor, model):
+    """Run a prediction and build the explainer tables before a model serves"""
+    from explanations import ForestExplainer
+
+    sample = pd.DataFrame([{col: (low + high) / 2 for col, (low, high) in FEATURE_RANGES.items()}])
+    model.predict_proba(sample[predictor.feature_columns])
+    return ForestExplainer(model, predictor.feature_columns)
+
+
+class RegistryWatcher:
+    """
+    Background thread that hot-swaps a predictor to the registry's current model
+
+    Args:
+        predictor: FacultyStressPredictor to keep up to date
+        registry: ModelRegistry to follow
+        interval: seconds between checks of registry.json
+        on_swap: optional callback(version) after each swap
+    """
+
+    def __init__(self, predictor, registry, interval=5.0, on_swap=None):
+        self.predictor = predictor
+        self.registry = registry
+        self.interval = interval
+        self.on_swap = on_swap
+        self.version = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def check(self):
+        """Load, warm up and install the current version if it changed"""
+        version = self.registry.current_version()
+        if version is None or version == self.version:
+            return False
+        model, version, digest = self.registry.load(version)
+        explainer = warm_up(self.predictor, model)
+        self.predictor.install_model(model, digest, explainer)
+        self.version = version
+        if self.on_swap is not None:
+            self.on_swap(version)
+        return True
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.check()
+            except Exception as e:
+                # Keep serving the current model; retry on the next poll
+                print(f"Model registry: could not load new version: {e}", file=sys.stderr)
+
+    def start(self):
+        """Install the current version now, then follow changes in the background"""
+        self.check()
+        self._thread = threading.Thread(target=self._run, name='registry-watcher', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description="Versioned model registry")
+    parser.add_argument('--registry', default=DEFAULT_REGISTRY, help="Registry directory")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    publish = subparsers.add_parser('publish', help="Publish a model file as a new version")
+    publish.add_argument('model_file')
+    publish.add_argument('--note')
+    publish.add_argument('--no-activate', action='store_true')
+
+    subparsers.add_parser('list', help="List published versions")
+    activate = subparsers.add_parser('activate', help="Make a version current")
+    activate.add_argument('version')
+    subparsers.add_parser('rollback', help="Return to the previously active version")
+    args = parser.parse_args()
+
+    registry = ModelRegistry(args.registry)
+    try:
+        if args.command == 'publish':
+            version = registry.publish(joblib.load(args.model_file), args.note,
+                                       activate=not args.no_activate)
+            print(f"Published {args.model_file} as {version}")
+        elif args.command == 'list':
+            for info in registry.versions():
+                marker = '*' if info['active'] else ' '
+                print(f"{marker} {info['version']}  {info['published']}  {info['digest']}  "
+                      f"{info['note'] or ''}")
+        elif args.command == 'activate':
+            registry.activate(args.version)
+            print(f"Active version: {args.version}")
+        else:
+            print(f"Rolled back to {registry.rollback()}")
+    except ValueError as e:
+        sys.exit(f"Error: {e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,250 @@
+"""
+Multi-process Batch Scoring with Shared-Memory Model and Input Arrays
+
+FacultyStressPredictor.predict runs on one core, and handing the fitted
+forest to a multiprocessing pool would pickle it (300 KB+) to every worker
+along with each input chunk. Instead, the node tables of all trees are
+flattened once into two NumPy arrays, and those arrays, the input feature
+matrix and the output arrays all live in multiprocessing.shared_memory.
+Each worker rebuilds the trees from shared memory when it starts, then
+only receives small (start, stop) row ranges and writes labels and
+probabilities straight into the shared output arrays.
+
+Usage:
+    python parallel_scoring.py <input.csv> [workers]
+"""
+
+import os
+import sys
+import time
+from multiprocessing import Pool, shared_memory
+
+import numpy as np
+
+# Per-process state populated by the worker initializer
+_worker_trees = None
+_worker_forest_names = set()
+_worker_blocks = {}
+
+
+def flatten_forest(model):
+    """
+    Flatten a fitted RandomForestClassifier or DecisionTreeClassifier
+
+    The node tables and leaf values of every tree are concatenated into two
+    arrays; the per-tree metadata needed to rebuild the trees is small.
+    Node values are normalized to class probabilities up front so scoring
+    does not have to renormalize every tree's output.
+
+    Returns:
+        (arrays, tree_meta): arrays is a dict with 'nodes' and 'values';
+        tree_meta holds (tree_class, constructor_args, scalar_state,
+        node_offset, node_count) per tree
+    """
+    estimators = getattr(model, 'estimators_', [model])
+    nodes, values, tree_meta = [], [], []
+    offset = 0
+    for estimator in estimators:
+        tree_class, args, state = estimator.tree_.__reduce__()
+        scalar_state = {k: v for k, v in state.items() if k not in ('nodes', 'values')}
+        count = len(state['nodes'])
+        normalizer = state['values'].sum(axis=-1, keepdims=True)
+        normalizer[normalizer == 0.0] = 1.0
+        nodes.append(state['nodes'])
+        values.append(state['values'] / normalizer)
+        tree_meta.append((tree_class, args, scalar_state, offset, count))
+        offset += count
+    arrays = {'nodes': np.concatenate(nodes), 'values': np.concatenate(values)}
+    return arrays, tree_meta
+
+
+def rebuild_trees(arrays, tree_meta):
+    """Recreate the low-level sklearn Tree objects from flattened arrays"""
+    trees = []
+    for tree_class, args, scalar_state, offset, count in tree_meta:
+        tree = tree_class(*args)
+        state = dict(scalar_state)
+        state['nodes'] = np.ascontiguousarray(arrays['nodes'][offset:offset + count])
+        state['values'] = np.ascontiguousarray(arrays['values'][offset:offset + count])
+        tree.__setstate__(state)
+        trees.append(tree)
+    return trees
+
+
+def trees_predict_proba(trees, X):
+    """Average per-tree class probabilities, as sklearn's predict_proba does"""
+    X = np.ascontiguousarray(X, dtype=np.float32)
+    proba = None
+    for tree in trees:
+        tree_proba = tree.predict(X)
+        if tree_proba.ndim == 3:
+            # Older sklearn keeps the single-output axis
+            tree_proba = tree_proba[:, 0, :]
+        if proba is None:
+            proba = tree_proba
+        else:
+            proba += tree_proba
+    proba /= len(trees)
+    return proba
+
+
+def _share(array):
+    """Copy an array into a new shared memory block"""
+    block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+    shared = np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)
+    shared[...] = array
+    return block, (block.name, array.shape, array.dtype)
+
+
+def _attach(descriptor):
+    """Map a shared block described by (name, shape, dtype) in this process"""
+    name, shape, dtype = descriptor
+    block = _worker_blocks.get(name)
+    if block is None:
+        block = shared_memory.SharedMemory(name=name)
+        _worker_blocks[name] = block
+    return np.ndarray(shape, dtype=dtype, buffer=block.buf)
+
+
+def _init_worker(forest_descriptors, tree_meta):
+    """Pool initializer: rebuild the trees from shared memory once per worker"""
+    global _worker_trees, _worker_forest_names
+    arrays = {key: _attach(desc) for key, desc in forest_descriptors.items()}
+    _worker_trees = rebuild_trees(arrays, tree_meta)
+    _worker_forest_names = {desc[0] for desc in forest_descriptors.values()}
+
+
+def _score_range(task):
+    """Score rows [start, stop) of the shared input into the shared outputs"""
+    input_desc, proba_desc, label_desc, start, stop = task
+    # Unmap blocks left over from earlier calls before attaching this one's
+    keep = _worker_forest_names | {input_desc[0], proba_desc[0], label_desc[0]}
+    for name in list(_worker_blocks):
+        if name not in keep:
+            _worker_blocks.pop(name).close()
+
+    X = _attach(input_desc)
+    proba = _attach(proba_desc)
+    labels = _attach(label_desc)
+    proba[start:stop] = trees_predict_proba(_worker_trees, X[start:stop])
+    labels[start:stop] = proba[start:stop].argmax(axis=1)
+    return stop - start
+
+
+class ParallelScorer:
+    """
+    Scores large feature matrices across a process pool
+
+    The flattened model is placed in shared memory once and reused for
+    every call; each call shares its input and output arrays for the
+    duration of the call only.
+    """
+
+    def __init__(self, model, feature_columns, workers=None, chunk_rows=65536):
+        self.classes_ = np.asarray(model.classes_)
+        self.feature_columns = list(feature_columns)
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_rows = chunk_rows
+        self._forest_blocks = []
+        forest_descriptors = {}
+        arrays, tree_meta = flatten_forest(model)
+        for key, array in arrays.items():
+            block, descriptor = _share(array)
+            self._forest_blocks.append(block)
+            forest_descriptors[key] = descriptor
+        self._pool = Pool(self.workers, initializer=_init_worker,
+                          initargs=(forest_descriptors, tree_meta))
+
+    def predict_with_proba(self, faculty_data):
+        """
+        Predict labels and class probabilities for every row
+
+        Args:
+            faculty_data: DataFrame with the feature columns, or a 2-D array
+                          whose columns are in feature_columns order
+
+        Returns:
+            (labels, probabilities) NumPy arrays
+        """
+        if hasattr(faculty_data, 'columns'):
+            X = faculty_data[self.feature_columns].to_numpy(dtype=np.float32)
+        else:
+            X = np.ascontiguousarray(faculty_data, dtype=np.float32)
+        n_rows = X.shape[0]
+        n_classes = len(self.classes_)
+
+        input_block, input_desc = _share(X)
+        proba_block, proba_desc = _share(np.zeros((n_rows, n_classes), dtype=np.float64))
+        label_block, label_desc = _share(np.zeros(n_rows, dtype=np.int8))
+        try:
+            tasks = [
+                (input_desc, proba_desc, label_desc, start, min(start + self.chunk_rows, n_rows))
+                for start in range(0, n_rows, self.chunk_rows)
+            ]
+            self._pool.map(_score_range, tasks, chunksize=1)
+
+            proba = np.ndarray((n_rows, n_classes), dtype=np.float64, buffer=proba_block.buf).copy()
+            label_idx = np.ndarray(n_rows, dtype=np.int8, buffer=label_block.buf)
+            labels = self.classes_[label_idx]
+        finally:
+            for block in (input_block, proba_block, label_block):
+                block.close()
+                block.unlink()
+        return labels, proba
+
+    def predict(self, faculty_data):
+        """Predict stress levels for every row"""
+        return self.predict_with_proba(faculty_data)[0]
+
+    def predict_proba(self, faculty_data):
+        """Class probabilities for every row (columns follow classes_)"""
+        return self.predict_with_proba(faculty_data)[1]
+
+    def close(self):
+        """Stop the workers and free the shared model arrays"""
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+        for block in self._forest_blocks:
+            block.close()
+            block.unlink()
+        self._forest_blocks = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def main():
+    """Main entry point"""
+    import pandas as pd
+    from stress_predictor import FacultyStressPredictor
+
+    if len(sys.argv) < 2:
+        print(__doc__)
+        sys.exit(1)
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else None
+
+    predictor = FacultyStressPredictor()
+    predictor.load_model()
+    df = pd.read_csv(sys.argv[1])
+
+    start = time.perf_counter()
+    with ParallelScorer(predictor.model, predictor.feature_columns, workers) as scorer:
+        setup = time.perf_counter() - start
+        start = time.perf_counter()
+        labels = scorer.predict(df)
+        elapsed = time.perf_counter() - start
+        print(f"Workers: {scorer.workers} (setup {setup:.3f}s)")
+
+    rate = len(df) / elapsed if elapsed > 0 else float('inf')
+    print(f"Scored {len(df)} rows in {elapsed:.3f}s ({rate:,.0f} rows/sec)")
+    for level in ['Low', 'Medium', 'High']:
+        print(f"  {level:6s}: {int((labels == level).sum())}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,318 @@
+"""
+Similar-Faculty Peer Index
+
+Finds faculty whose workload profiles are closest to a given one, so a
+report can say how similar peers are doing and how those at a lower
+stress level differ, e.g. "similar peers at Low stress differ mainly in
+Meeting_Hours (7 vs 3.2) and Committee_Duties (4 vs 1.5)".
+
+Feature vectors are min-max scaled to their valid ranges (FEATURE_RANGES)
+so that no feature dominates the distance because of its units. Each
+stress level gets its own partition, which holds:
+
+    a KD-tree (sklearn.neighbors.KDTree) over the rows present at the
+    last build, and
+    a small pending buffer of rows inserted since, searched by brute force
+
+Queries search both and merge the results. When the buffer grows past
+`rebuild_fraction` of the tree (capped at MAX_PENDING rows), the
+partition is rebuilt. Inserts are
+therefore amortised O(log n), and a query is a tree descent instead of a
+scan of the whole roster.
+
+Usage:
+    python peer_index.py <faculty_id> [--data dataset_with_labels.csv] [--k 10]
+"""
+
+import argparse
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+from sklearn.neighbors import KDTree
+
+from records import is_record_input
+from validation import FEATURE_RANGES, STRESS_LEVELS
+
+FEATURE_COLUMNS = list(FEATURE_RANGES)
+_LOW = np.array([low for low, _ in FEATURE_RANGES.values()], dtype=np.float64)
+_SPAN = np.array([high - low for low, high in FEATURE_RANGES.values()], dtype=np.float64)
+
+LOWER_LEVELS = {'High': ('Low', 'Medium'), 'Medium': ('Low',), 'Low': ()}
+MIN_PENDING = 1024
+MAX_PENDING = 16384
+# Queries scanned against the pending buffer at a time (bounds memory)
+PENDING_QUERY_CHUNK = 256
+
+
+def scale_features(values):
+    """Min-max scale a (rows x 9) feature matrix to [0, 1] per feature"""
+    return (np.asarray(values, dtype=np.float64) - _LOW) / _SPAN
+
+
+def _feature_matrix(records):
+    """Feature matrix from a DataFrame, FacultyRecord/RecordBatch, one dict, a list of dicts or an array"""
+    if isinstance(records, pd.DataFrame):
+        return records[FEATURE_COLUMNS].to_numpy(dtype=np.float64)
+    if is_record_input(records):
+        return records.features(np.float64)
+    if isinstance(records, dict):
+        records = [records]
+    if len(records) and isinstance(records[0], dict):
+        return np.array([[r[col] for col in FEATURE_COLUMNS] for r in records], dtype=np.float64)
+    return np.atleast_2d(np.asarray(records, dtype=np.float64))
+
+
+def _append(buffer, count, new):
+    """Write `new` after the first `count` rows, growing the buffer geometrically"""
+    needed = count + len(new)
+    if needed > len(buffer):
+        grown = np.empty((max(needed, 2 * len(buffer), 64),) + buffer.shape[1:], dtype=buffer.dtype)
+        grown[:count] = buffer[:count]
+        buffer = grown
+    buffer[count:needed] = new
+    return buffer
+
+
+class _Partition:
+    """KD-tree over built rows plus a brute-force buffer of newer inserts"""
+
+    def __init__(self, leaf_size=40, rebuild_fraction=0.1):
+        self.leaf_size = leaf_size
+        self.rebuild_fraction = rebuild_fraction
+        self.points = np.empty((0, len(FEATURE_COLUMNS)))
+        self.rows = np.empty(0, dtype=np.int64)
+        self.count = 0
+        self.built = 0
+        self.tree = None
+
+    def insert(self, points, rows):
+        self.points = _append(self.points, self.count, points)
+        self.rows = _append(self.rows, self.count, rows)
+        self.count += len(points)
+        limit = min(max(MIN_PENDING, self.rebuild_fraction * self.built), MAX_PENDING)
+        if self.count - self.built > limit:
+            self.rebuild()
+
+    def rebuild(self):
+        self.tree = KDTree(self.points[:self.count], leaf_size=self.leaf_size) if self.count else None
+        self.built = self.count
+
+    def query(self, points, k):
+        """(distances, row ids) of the k nearest rows, nearest first"""
+        k = min(k, self.count)
+        if k == 0:
+            empty = np.empty((len(points), 0))
+            return empty, empty.astype(np.int64)
+        parts_d, parts_i = [], []
+        if self.built:
+            d, i = self.tree.query(points, k=min(k, self.built))
+            parts_d.append(d)
+            parts_i.append(i)
+        if self.count > self.built:
+            d, i = self._scan_pending(points, k)
+            parts_d.append(d)
+            parts_i.append(i)
+        d = np.concatenate(parts_d, axis=1)
+        i = np.concatenate(parts_i, axis=1)
+        order = np.argsort(d, axis=1, kind='stable')[:, :k]
+        return np.take_along_axis(d, order, axis=1), self.rows[np.take_along_axis(i, order, axis=1)]
+
+    def _scan_pending(self, points, k):
+        """Brute-force k-NN over rows inserted since the last build"""
+        pending = self.points[self.built:self.count]
+        pending_norms = (pending ** 2).sum(axis=1)
+        k = min(k, len(pending))
+        distances = np.empty((len(points), k))
+        rows = np.empty((len(points), k), dtype=np.int64)
+        for start in range(0, len(points), PENDING_QUERY_CHUNK):
+            chunk = points[start:start + PENDING_QUERY_CHUNK]
+            # |p - q|^2 = |p|^2 + |q|^2 - 2 p.q, one matrix product per chunk
+            d2 = (chunk ** 2).sum(axis=1)[:, None] + pending_norms - 2 * chunk @ pending.T
+            i = np.argpartition(d2, k - 1, axis=1)[:, :k]
+            distances[start:start + len(chunk)] = np.sqrt(np.maximum(
+                np.take_along_axis(d2, i, axis=1), 0))
+            rows[start:start + len(chunk)] = i + self.built
+        return distances, rows
+
+
+class PeerIndex:
+    """
+    k-nearest-neighbour index of faculty workload profiles
+
+    Args:
+        leaf_size: KD-tree leaf size
+        rebuild_fraction: rebuild a partition once its pending buffer
+            exceeds this fraction of the tree size
+    """
+
+    def __init__(self, leaf_size=40, rebuild_fraction=0.1):
+        self.partitions = {level: _Partition(leaf_size, rebuild_fraction) for level in STRESS_LEVELS}
+        self.ids = []
+        self.levels = []
+        self._values = np.empty((0, len(FEATURE_COLUMNS)))
+
+    def __len__(self):
+        return len(self.ids)
+
+    @property
+    def values(self):
+        """Raw feature values of the indexed faculty (rows x 9)"""
+        return self._values[:len(self.ids)]
+
+    @classmethod
+    def from_frame(cls, df, level_column='Stress_Level', **kwargs):
+        """Build an index from a DataFrame with Faculty_ID, features and levels"""
+        index = cls(**kwargs)
+        index.insert(df['Faculty_ID'].tolist(), df[FEATURE_COLUMNS], df[level_column].tolist())
+        for partition in index.partitions.values():
+            if partition.count > partition.built:
+                partition.rebuild()
+        return index
+
+    def insert(self, faculty_ids, records, levels):
+        """
+        Add faculty to the index
+
+        Args:
+            faculty_ids: sequence of Faculty IDs
+            records: DataFrame, dicts or array with the nine feature values
+            levels: stress level of each row ('Low', 'Medium', 'High')
+        """
+        values = _feature_matrix(records)
+        levels = [str(level).capitalize() for level in levels]
+        unknown = set(levels) - set(STRESS_LEVELS)
+        if unknown:
+            raise ValueError(f"Unknown stress level(s): {', '.join(sorted(unknown))}")
+        start = len(self.ids)
+        self._values = _append(self._values, start, values)
+        self.ids.extend(faculty_ids)
+        self.levels.extend(levels)
+        rows = np.arange(start, start + len(values))
+        scaled = scale_features(values)
+        level_array = np.array(levels)
+        for level, partition in self.partitions.items():
+            mask = level_array == level
+            if mask.any():
+                partition.insert(scaled[mask], rows[mask])
+
+    def query(self, records, k=10, levels=None):
+        """
+        Batch k-NN query
+
+        Args:
+            records: DataFrame, dicts or array of profiles to match
+            k: neighbours per profile
+            levels: restrict the peers to these stress levels (default: all)
+
+        Returns:
+            (distances, rows): arrays of shape (queries x k) with scaled
+            Euclidean distances and index rows, nearest first; rows map to
+            ids/levels/values of this index
+        """
+        points = scale_features(_feature_matrix(records))
+        parts_d, parts_r = [], []
+        for level in levels or STRESS_LEVELS:
+            d, r = self.partitions[level].query(points, k)
+            parts_d.append(d)
+            parts_r.append(r)
+        d = np.concatenate(parts_d, axis=1)
+        r = np.concatenate(parts_r, axis=1)
+        order = np.argsort(d, axis=1, kind='stable')[:, :k]
+        return np.take_along_axis(d, order, axis=1), np.take_along_axis(r, order, axis=1)
+
+    def compare(self, records, stress_levels, k=10, top_features=2):
+        """
+        How similar peers at a lower stress level differ, per profile
+
+        Args:
+            records: profiles to compare (DataFrame, dicts or array)
+            stress_levels: current level of each profile
+            k: number of lower-level peers to average
+            top_features: number of main differences to report
+
+        Returns:
+            list with, per profile, None (already Low or no peers) or a dict:
+            peer_levels, peers (Faculty IDs), mean_distance and differences,
+            a list of (feature, own value, peer mean) ordered by the size
+            of the scaled difference
+        """
+        values = _feature_matrix(records)
+        stress_levels = [str(level).capitalize() for level in stress_levels]
+        results = [None] * len(values)
+        # One batched query per target group
+        for current, lower in LOWER_LEVELS.items():
+            positions = [i for i, level in enumerate(stress_levels) if level == current]
+            if not lower or not positions:
+                continue
+            distances, rows = self.query(values[positions], k=k, levels=lower)
+            if rows.shape[1] == 0:
+                continue
+            peer_means = self.values[rows].mean(axis=1)
+            gaps = np.abs(scale_features(peer_means) - scale_features(values[positions]))
+            ranked = np.argsort(-gaps, axis=1, kind='stable')[:, :top_features]
+            for j, position in enumerate(positions):
+                differences = [
+                    (FEATURE_COLUMNS[f], _as_number(values[position, f]), round(float(peer_means[j, f]), 1))
+                    for f in ranked[j] if gaps[j, f] > 0
+                ]
+                results[position] = {
+                    'peer_levels': lower,
+                    'peers': [self.ids[r] for r in rows[j]],
+                    'mean_distance': float(distances[j].mean()),
+                    'differences': differences,
+                }
+        return results
+
+
+def _as_number(value):
+    return int(value) if float(value).is_integer() else float(value)
+
+
+def format_comparison(comparison):
+    """One sentence for a report, e.g. 'similar peers at Low stress differ mainly in ...'"""
+    if not comparison:
+        return None
+    levels = "/".join(comparison['peer_levels'])
+    lead = f"The {len(comparison['peers'])} most similar peers at {levels} stress"
+    if not comparison['differences']:
+        return f"{lead} have the same workload profile; the gap is not in the workload figures."
+    parts = [f"{feature} ({own} vs {peer} on average)" for feature, own, peer in comparison['differences']]
+    return f"{lead} differ mainly in {' and '.join(parts)}."
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description="Find faculty with similar workload profiles")
+    parser.add_argument('faculty_id')
+    parser.add_argument('--data', default='dataset_with_labels.csv')
+    parser.add_argument('--k', type=int, default=10)
+    args = parser.parse_args()
+
+    df = pd.read_csv(args.data)
+    rows = df[df['Faculty_ID'] == args.faculty_id]
+    if rows.empty:
+        sys.exit(f"Faculty ID '{args.faculty_id}' not found in {args.data}")
+
+    start = time.perf_counter()
+    index = PeerIndex.from_frame(df)
+    built = time.perf_counter()
+    distances, peer_rows = index.query(rows, k=args.k + 1)
+    comparison = index.compare(rows, rows['Stress_Level'].tolist(), k=args.k)[0]
+    elapsed = time.perf_counter() - built
+
+    print(f"Indexed {len(index)} faculty in {built - start:.3f}s; queries took {elapsed * 1000:.1f}ms")
+    print(f"{args.faculty_id}: {rows.iloc[0]['Stress_Level']}")
+    print("Most similar faculty:")
+    for distance, row in zip(distances[0], peer_rows[0]):
+        if index.ids[row] == args.faculty_id:
+            continue
+        print(f"  {index.ids[row]:<8} {index.levels[row]:<7} distance {distance:.3f}")
+    sentence = format_comparison(comparison)
+    if sentence:
+        print(sentence)
+
+
+if __name__ == "__main__":
+    main()
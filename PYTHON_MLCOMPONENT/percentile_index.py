@@ -0,0 +1,256 @@
+"""
+Percentile Ranking Index for WSS and P(High)
+
+Reports give absolute values only; a WSS of 19 means more when it is
+known to sit at the 85th percentile of the institution. This index places a
+faculty member's WSS and probability of High stress as a percentile
+within the whole institution and within their department.
+
+Each metric is bucketed and counted in a Fenwick (binary indexed) tree,
+one per scope:
+
+    WSS      integer 9-27, one bucket per score (exact)
+    P(High)  [0, 1] in steps of 1 / PROBABILITY_BUCKETS (a 100-tree
+             forest only produces multiples of 0.01, so also exact)
+
+Inserting, updating (remove old value, add new) and ranking are all
+O(log buckets), so a report never re-sorts the roster. Percentiles use
+the mid-rank convention: the share of faculty below the value, plus
+half of those tied with it.
+
+Usage:
+    python percentile_index.py <faculty_id> [--data dataset_with_labels.csv] [--by Department]
+"""
+
+import argparse
+import contextlib
+import sys
+
+import numpy as np
+
+MIN_WSS = 9
+MAX_WSS = 27
+PROBABILITY_BUCKETS = 10000
+INSTITUTION = 'institution'
+
+
+class FenwickTree:
+    """Prefix sums over `size` counters with O(log size) updates"""
+
+    __slots__ = ('size', 'tree')
+
+    def __init__(self, size, counts=None):
+        self.size = size
+        self.tree = np.zeros(size + 1, dtype=np.int64)
+        if counts is not None:
+            # O(size) construction: push each node into its parent once
+            self.tree[1:] = counts
+            for i in range(1, size + 1):
+                parent = i + (i & -i)
+                if parent <= size:
+                    self.tree[parent] += self.tree[i]
+
+    def add(self, index, delta):
+        """Add delta to counter `index` (0-based)"""
+        i = index + 1
+        while i <= self.size:
+            self.tree[i] += delta
+            i += i & -i
+
+    def prefix(self, index):
+        """Sum of counters 0..index inclusive (0 for index < 0)"""
+        total = 0
+        i = min(index, self.size - 1) + 1
+        while i > 0:
+            total += self.tree[i]
+            i -= i & -i
+        return int(total)
+
+
+class RankCounter:
+    """Bucketed value counts answering mid-rank percentile queries"""
+
+    __slots__ = ('low', 'high', 'buckets', 'tree', 'count')
+
+    def __init__(self, low, high, buckets):
+        self.low = low
+        self.high = high
+        self.buckets = buckets
+        self.tree = FenwickTree(buckets)
+        self.count = 0
+
+    def bucket(self, value):
+        scaled = (value - self.low) / (self.high - self.low) * (self.buckets - 1)
+        return int(min(max(round(scaled), 0), self.buckets - 1))
+
+    def buckets_of(self, values):
+        scaled = (np.asarray(values, dtype=np.float64) - self.low) / (self.high - self.low)
+        return np.clip(np.rint(scaled * (self.buckets - 1)), 0, self.buckets - 1).astype(np.int64)
+
+    def load(self, values):
+        """Replace the contents with an array of values in O(n + buckets)"""
+        counts = np.bincount(self.buckets_of(values), minlength=self.buckets)
+        self.tree = FenwickTree(self.buckets, counts)
+        self.count = len(values)
+
+    def add(self, value, delta=1):
+        self.tree.add(self.bucket(value), delta)
+        self.count += delta
+
+    def percentile(self, value):
+        """Percent of counted values below `value` (ties count half)"""
+        if self.count == 0:
+            return None
+        b = self.bucket(value)
+        below = self.tree.prefix(b - 1)
+        tied = self.tree.prefix(b) - below
+        return 100.0 * (below + 0.5 * tied) / self.count
+
+
+class PercentileIndex:
+    """
+    Institution- and department-level percentiles of WSS and P(High)
+
+    Args:
+        by: name of the grouping (e.g. 'Department'), for labels only
+    """
+
+    METRICS = ('wss', 'p_high')
+
+    def __init__(self, by=None):
+        self.by = by
+        self.entries = {}
+        self.scopes = {}
+
+    def _counters(self, scope):
+        counters = self.scopes.get(scope)
+        if counters is None:
+            counters = self.scopes[scope] = {
+                'wss': RankCounter(MIN_WSS, MAX_WSS, MAX_WSS - MIN_WSS + 1),
+                'p_high': RankCounter(0.0, 1.0, PROBABILITY_BUCKETS + 1),
+            }
+        return counters
+
+    def _scopes_of(self, group):
+        return (INSTITUTION,) if group is None else (INSTITUTION, group)
+
+    def load(self, faculty_ids, wss, p_high, groups=None):
+        """
+        Replace the index with a whole roster (bulk build, no re-sorting)
+
+        Args:
+            faculty_ids: sequence of Faculty IDs
+            wss: WSS per faculty member
+            p_high: probability of High per faculty member
+            groups: department/cohort per faculty member, or None
+        """
+        wss = np.asarray(wss)
+        p_high = np.asarray(p_high, dtype=np.float64)
+        groups = [None] * len(wss) if groups is None else list(groups)
+        self.entries = {fid: (g, int(w), float(p)) for fid, g, w, p in zip(faculty_ids, groups, wss, p_high)}
+        self.scopes = {}
+        self._counters(INSTITUTION)['wss'].load(wss)
+        self._counters(INSTITUTION)['p_high'].load(p_high)
+        group_array = np.asarray(groups, dtype=object)
+        for group in {g for g in groups if g is not None}:
+            mask = group_array == group
+            counters = self._counters(group)
+            counters['wss'].load(wss[mask])
+            counters['p_high'].load(p_high[mask])
+
+    def upsert(self, faculty_id, wss, p_high, group=None):
+        """Insert a faculty member or replace their previous values, O(log buckets)"""
+        old = self.entries.get(faculty_id)
+        if old is not None:
+            old_group, old_wss, old_p = old
+            for scope in self._scopes_of(old_group):
+                counters = self._counters(scope)
+                counters['wss'].add(old_wss, -1)
+                counters['p_high'].add(old_p, -1)
+        for scope in self._scopes_of(group):
+            counters = self._counters(scope)
+            counters['wss'].add(wss, 1)
+            counters['p_high'].add(p_high, 1)
+        self.entries[faculty_id] = (group, int(wss), float(p_high))
+
+    def remove(self, faculty_id):
+        """Drop a faculty member from every scope"""
+        group, wss, p_high = self.entries.pop(faculty_id)
+        for scope in self._scopes_of(group):
+            counters = self._counters(scope)
+            counters['wss'].add(wss, -1)
+            counters['p_high'].add(p_high, -1)
+
+    def percentiles(self, wss, p_high, group=None):
+        """
+        Percentiles of a WSS / P(High) pair in each scope
+
+        Returns:
+            dict scope -> {'wss': pct, 'p_high': pct, 'count': n}
+        """
+        result = {}
+        for scope in self._scopes_of(group):
+            counters = self.scopes.get(scope)
+            if counters is None or counters['wss'].count == 0:
+                continue
+            result[scope] = {
+                'wss': counters['wss'].percentile(wss),
+                'p_high': counters['p_high'].percentile(p_high),
+                'count': counters['wss'].count,
+            }
+        return result
+
+    def rank(self, faculty_id):
+        """Percentiles of an indexed faculty member (None if unknown)"""
+        entry = self.entries.get(faculty_id)
+        if entry is None:
+            return None
+        group, wss, p_high = entry
+        return {'wss': wss, 'p_high': p_high, 'scopes': self.percentiles(wss, p_high, group)}
+
+
+def build_index(predictor, df, by=None):
+    """
+    Index a roster: WSS from the formula, P(High) from the loaded model
+
+    Args:
+        predictor: FacultyStressPredictor with a loaded model
+        df: DataFrame with Faculty_ID and the feature columns
+        by: optional group column (e.g. 'Department')
+    """
+    wss = predictor.calculate_wss_batch(df)
+    proba = predictor.model.predict_proba(df[predictor.feature_columns])
+    p_high = proba[:, list(predictor.model.classes_).index('High')]
+    index = PercentileIndex(by)
+    groups = df[by].astype(str).tolist() if by else None
+    index.load(df['Faculty_ID'].tolist(), wss, p_high, groups)
+    return index
+
+
+def main():
+    """Main entry point"""
+    import pandas as pd
+    from stress_predictor import FacultyStressPredictor
+
+    parser = argparse.ArgumentParser(description="WSS and P(High) percentiles for a faculty member")
+    parser.add_argument('faculty_id')
+    parser.add_argument('--data', default='dataset_with_labels.csv')
+    parser.add_argument('--by', help="Department/cohort column")
+    parser.add_argument('--model', default='stress_model.joblib')
+    args = parser.parse_args()
+
+    predictor = FacultyStressPredictor()
+    with contextlib.redirect_stdout(sys.stderr):
+        predictor.load_model(args.model)
+    index = build_index(predictor, pd.read_csv(args.data), args.by)
+    ranking = index.rank(args.faculty_id)
+    if ranking is None:
+        sys.exit(f"Faculty ID '{args.faculty_id}' not found in {args.data}")
+    print(f"{args.faculty_id}: WSS {ranking['wss']}, P(High) {ranking['p_high']:.2f}")
+    for scope, values in ranking['scopes'].items():
+        print(f"  {scope} (n={values['count']}): WSS percentile {values['wss']:.0f}, "
+              f"P(High) percentile {values['p_high']:.0f}")
+
+
+if __name__ == "__main__":
+    main()
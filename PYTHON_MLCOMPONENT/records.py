@@ -0,0 +1,237 @@
+"""
+Compact Faculty Record Types
+
+Records used to travel as per-row dicts and pandas Series, which costs
+several hundred bytes and a handful of allocations per faculty member.
+This module provides two compact alternatives that FacultyStressPredictor
+and the WSS scorer accept directly, without building a DataFrame:
+
+    FacultyRecord   one faculty member; __slots__ only, with the nine
+                    features held as small ints (CPython shares the
+                    objects for values up to 256, so the fields cost one
+                    pointer each and nothing is allocated per value)
+    RecordBatch     many faculty in one contiguous NumPy structured array
+                    with narrow unsigned integer fields (RECORD_DTYPE):
+                    9 bytes of features plus a 16-byte ASCII ID per row
+
+Both support record['Subjects_Handled']-style access, so code written for
+dicts (calculate_wss, the what-if planner) keeps working.
+
+Usage:
+    python records.py [--rows 100000]    # memory/allocation comparison
+"""
+
+import argparse
+import time
+import tracemalloc
+
+import numpy as np
+from numpy.lib import recfunctions
+
+from validation import FEATURE_RANGES
+
+FEATURE_COLUMNS = tuple(FEATURE_RANGES)
+ID_LENGTH = 16
+
+# Narrowest unsigned type holding each feature's valid range
+RECORD_DTYPE = np.dtype(
+    [('Faculty_ID', f'S{ID_LENGTH}')]
+    + [(col, np.uint8 if high <= 255 else np.uint16) for col, (_, high) in FEATURE_RANGES.items()]
+)
+
+
+class FacultyRecord:
+    """One faculty member's workload as nine validated integer fields"""
+
+    __slots__ = ('Faculty_ID',) + FEATURE_COLUMNS
+
+    def __init__(self, faculty_id=None, **features):
+        self.Faculty_ID = faculty_id
+        for col in FEATURE_COLUMNS:
+            try:
+                value = features.pop(col)
+            except KeyError:
+                raise ValueError(f"Missing feature: {col}") from None
+            low, high = FEATURE_RANGES[col]
+            number = int(value)
+            if number != value or not low <= number <= high:
+                raise ValueError(f"{col} must be a whole number from {low} to {high}, got {value!r}")
+            setattr(self, col, number)
+        if features:
+            raise ValueError(f"Unknown field(s): {', '.join(sorted(features))}")
+
+    @classmethod
+    def from_mapping(cls, mapping, faculty_id=None):
+        """Build from a dict, pandas Series or any mapping with the feature keys"""
+        if faculty_id is None and 'Faculty_ID' in mapping:
+            faculty_id = mapping['Faculty_ID']
+        return cls(faculty_id, **{col: mapping[col] for col in FEATURE_COLUMNS})
+
+    def __getitem__(self, key):
+        if key not in self.__slots__:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __contains__(self, key):
+        return key in self.__slots__
+
+    def __eq__(self, other):
+        if not isinstance(other, FacultyRecord):
+            return NotImplemented
+        return self.Faculty_ID == other.Faculty_ID and self.values() == other.values()
+
+    def __repr__(self):
+        fields = ", ".join(f"{col}={getattr(self, col)}" for col in FEATURE_COLUMNS)
+        return f"FacultyRecord({self.Faculty_ID!r}, {fields})"
+
+    def keys(self):
+        return FEATURE_COLUMNS
+
+    def values(self):
+        """Feature values in FEATURE_COLUMNS order"""
+        return tuple(getattr(self, col) for col in FEATURE_COLUMNS)
+
+    def to_dict(self):
+        return {col: getattr(self, col) for col in FEATURE_COLUMNS}
+
+    def features(self, dtype=np.float32):
+        """1 x 9 feature matrix, ready for the model"""
+        return np.array([self.values()], dtype=dtype)
+
+
+class RecordBatch:
+    """
+    Many faculty records in one contiguous structured array
+
+    Args:
+        data: NumPy array of RECORD_DTYPE
+    """
+
+    __slots__ = ('data',)
+
+    def __init__(self, data):
+        if data.dtype != RECORD_DTYPE:
+            raise ValueError(f"RecordBatch needs dtype {RECORD_DTYPE}, got {data.dtype}")
+        self.data = data
+
+    @classmethod
+    def empty(cls, count):
+        return cls(np.zeros(count, dtype=RECORD_DTYPE))
+
+    @classmethod
+    def from_records(cls, records):
+        """Pack FacultyRecord objects (or feature mappings) into one array"""
+        records = [r if isinstance(r, FacultyRecord) else FacultyRecord.from_mapping(r) for r in records]
+        data = np.empty(len(records), dtype=RECORD_DTYPE)
+        data['Faculty_ID'] = _encode_ids([r.Faculty_ID or '' for r in records])
+        values = np.array([r.values() for r in records], dtype=np.int64).reshape(-1, len(FEATURE_COLUMNS))
+        for i, col in enumerate(FEATURE_COLUMNS):
+            data[col] = values[:, i]
+        return cls(data)
+
+    @classmethod
+    def from_frame(cls, df):
+        """Pack a DataFrame with the feature columns (and optionally Faculty_ID)"""
+        values = df[list(FEATURE_COLUMNS)].to_numpy()
+        if not np.array_equal(values, np.rint(values)):
+            raise ValueError("Feature values must be whole numbers")
+        _check_ranges(values)
+        data = np.empty(len(df), dtype=RECORD_DTYPE)
+        data['Faculty_ID'] = _encode_ids(df['Faculty_ID'].astype(str)) if 'Faculty_ID' in df.columns else b''
+        for i, col in enumerate(FEATURE_COLUMNS):
+            data[col] = values[:, i]
+        return cls(data)
+
+    def __len__(self):
+        return len(self.data)
+
+    def __getitem__(self, index):
+        """A FacultyRecord for an integer index, a RecordBatch for a slice or mask"""
+        if isinstance(index, (int, np.integer)):
+            row = self.data[index]
+            record = FacultyRecord.__new__(FacultyRecord)
+            record.Faculty_ID = row['Faculty_ID'].decode('ascii') or None
+            for col in FEATURE_COLUMNS:
+                setattr(record, col, int(row[col]))
+            return record
+        if isinstance(index, str):
+            return self.data[index]
+        return RecordBatch(self.data[index])
+
+    def __iter__(self):
+        for i in range(len(self.data)):
+            yield self[i]
+
+    @property
+    def ids(self):
+        """Faculty IDs as a string array"""
+        return self.data['Faculty_ID'].astype(str)
+
+    @property
+    def columns(self):
+        return FEATURE_COLUMNS
+
+    def features(self, dtype=np.float32):
+        """rows x 9 feature matrix in FEATURE_COLUMNS order (one conversion pass)"""
+        return recfunctions.structured_to_unstructured(self.data[list(FEATURE_COLUMNS)], dtype=dtype)
+
+    @property
+    def nbytes(self):
+        return self.data.nbytes
+
+
+def _encode_ids(ids):
+    """Faculty IDs as fixed-width ASCII bytes"""
+    encoded = []
+    for fid in ids:
+        fid = str(fid)
+        if len(fid) > ID_LENGTH or not fid.isascii():
+            raise ValueError(f"Faculty_ID must be at most {ID_LENGTH} ASCII characters, got {fid!r}")
+        encoded.append(fid.encode('ascii'))
+    return encoded
+
+
+def _check_ranges(values):
+    for i, (col, (low, high)) in enumerate(FEATURE_RANGES.items()):
+        column = values[:, i]
+        if len(column) and (column.min() < low or column.max() > high):
+            raise ValueError(f"{col} out of range {low}-{high}")
+
+
+def is_record_input(faculty_data):
+    """True for FacultyRecord / RecordBatch inputs"""
+    return isinstance(faculty_data, (FacultyRecord, RecordBatch))
+
+
+def main():
+    """Compare memory per record of dicts, FacultyRecord objects and a RecordBatch"""
+    import pandas as pd
+
+    parser = argparse.ArgumentParser(description="Memory footprint of record representations")
+    parser.add_argument('--rows', type=int, default=100000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({col: rng.integers(low, high + 1, args.rows)
+                       for col, (low, high) in FEATURE_RANGES.items()})
+    df.insert(0, 'Faculty_ID', [f"F{i:06d}" for i in range(args.rows)])
+
+    def measure(label, build):
+        tracemalloc.start()
+        start = time.perf_counter()
+        result = build()
+        elapsed = time.perf_counter() - start
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"  {label:<22s} {current / args.rows:8.1f} bytes/row  {elapsed:.3f}s")
+        return result
+
+    print(f"{args.rows} records:")
+    rows = df.to_dict('records')
+    measure("dict per row", lambda: df.to_dict('records'))
+    measure("FacultyRecord per row", lambda: [FacultyRecord.from_mapping(r) for r in rows])
+    measure("RecordBatch", lambda: RecordBatch.from_frame(df))
+
+
+if __name__ == "__main__":
+    main()
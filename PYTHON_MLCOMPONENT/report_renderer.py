@@ -0,0 +1,142 @@
+"""
+Bulk Wellness Report Renderer
+Batch report mode for the Faculty Wellness Expert System
+
+There are only three stress levels, so everything in a report except the
+faculty header is identical for every faculty member at the same level.
+This module renders that static body once per level and streams reports
+for a whole roster through a generator into one buffered output file,
+either as plain text (same layout as generate_report) or as JSONL.
+
+Usage:
+    python report_renderer.py <results.csv> <output_file> [text|jsonl]
+
+The results CSV must contain Faculty_ID and Stress_Level columns
+(e.g. dataset_with_labels.csv).
+"""
+
+import csv
+import json
+import os
+import sys
+import time
+
+from wellness_expert_python import WellnessExpertSystem
+
+STRESS_LEVELS = ('low', 'medium', 'high')
+OUTPUT_FORMATS = ('text', 'jsonl')
+
+
+class BatchReportRenderer:
+    def __init__(self, expert_system=None):
+        self.expert_system = expert_system or WellnessExpertSystem()
+        self._knowledge = None
+        self.refresh()
+
+    def refresh(self):
+        """Re-render the cached templates if the knowledge base was reloaded"""
+        knowledge = self.expert_system.knowledge
+        if knowledge is self._knowledge:
+            return
+        self._knowledge = knowledge
+        self._header = self.expert_system.format_report_header()
+        self._text_bodies = {}
+        self._json_bodies = {}
+        for level in STRESS_LEVELS:
+            self._text_bodies[level] = self.expert_system.format_report_body(level)
+            self._json_bodies[level] = self._render_json_body(level)
+
+    def _render_json_body(self, stress_level):
+        """Serialize the level-dependent part of a JSONL record once"""
+        body = json.dumps({
+            'stress_level': stress_level,
+            'indicators': self.expert_system.get_indicators(stress_level),
+            'recommendations': self.expert_system.get_recommendations(stress_level)
+        })
+        # Drop the opening brace so the faculty_id can be prepended
+        return body[1:]
+
+    def render_text(self, faculty_id, stress_level):
+        """Render one text report; identical to generate_report output"""
+        stress_level = stress_level.lower()
+        body = self._text_bodies.get(stress_level)
+        if body is None:
+            body = self.expert_system.format_report_body(stress_level)
+        return f"{self._header}\nFaculty ID: {faculty_id}\n{body}"
+
+    def render_json(self, faculty_id, stress_level):
+        """Render one JSONL record (including the trailing newline)"""
+        stress_level = stress_level.lower()
+        body = self._json_bodies.get(stress_level)
+        if body is None:
+            body = self._render_json_body(stress_level)
+        return '{"faculty_id": ' + json.dumps(str(faculty_id)) + ', ' + body + '\n'
+
+    def iter_reports(self, records, fmt='text'):
+        """
+        Lazily render reports for an iterable of records
+
+        Args:
+            records: iterable of (faculty_id, stress_level) pairs
+            fmt: 'text' or 'jsonl'
+
+        Yields:
+            Rendered report strings
+        """
+        if fmt not in OUTPUT_FORMATS:
+            raise ValueError(f"Unknown report format '{fmt}'. Use one of: {', '.join(OUTPUT_FORMATS)}")
+        self.refresh()
+        render = self.render_text if fmt == 'text' else self.render_json
+        for faculty_id, stress_level in records:
+            yield render(faculty_id, stress_level)
+
+    def write_reports(self, records, output_file, fmt='text', buffer_size=1 << 20):
+        """
+        Stream reports for all records into a single buffered file
+
+        Args:
+            records: iterable of (faculty_id, stress_level) pairs
+            output_file: path of the file to write
+            fmt: 'text' or 'jsonl'
+            buffer_size: size in bytes of the output buffer
+
+        Returns:
+            Number of reports written
+        """
+        count = 0
+        with open(output_file, 'w', encoding='utf-8', buffering=buffer_size) as f:
+            for report in self.iter_reports(records, fmt):
+                f.write(report)
+                count += 1
+        return count
+
+
+def read_result_records(filepath):
+    """Yield (faculty_id, stress_level) pairs from a results CSV"""
+    with open(filepath, 'r', newline='') as f:
+        for row in csv.DictReader(f):
+            yield row['Faculty_ID'], row['Stress_Level']
+
+
+def main():
+    """Main entry point"""
+    if len(sys.argv) < 3:
+        print(__doc__)
+        sys.exit(1)
+
+    input_file = sys.argv[1]
+    output_file = sys.argv[2]
+    fmt = sys.argv[3].lower() if len(sys.argv) > 3 else 'text'
+
+    renderer = BatchReportRenderer()
+    start = time.perf_counter()
+    count = renderer.write_reports(read_result_records(input_file), output_file, fmt=fmt)
+    elapsed = time.perf_counter() - start
+
+    rate = count / elapsed if elapsed > 0 else float('inf')
+    print(f"Wrote {count} {fmt} reports to {os.path.abspath(output_file)}")
+    print(f"Elapsed: {elapsed:.3f}s ({rate:,.0f} reports/sec)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,269 @@
+"""
+Sensitivity and Partial-dependence Engine for the Stress Model
+
+Answers policy questions such as "how does the predicted stress
+distribution shift if meeting hours rise by two across the board?".
+
+    partial_dependence   for every value of one feature over its valid
+                         range, set that feature for the whole roster
+                         and average the predicted class probabilities
+    shift                move one feature by +/- delta for everyone
+                         (clipped to its range) and compare the class
+                         distribution before and after
+    sensitivity_table    the shift for every feature in both directions
+
+Each query replicates the roster once per scenario and scores all
+scenarios in a few large predict_proba batches rather than row by row.
+Rosters above `sample_rows` are sampled (seeded), since every statistic
+is a mean. Results are memoized per model version and roster
+fingerprint, so repeated dashboard queries are served from the cache.
+Loading a different model invalidates it.
+
+Usage:
+    python sensitivity.py [--data dataset.csv] [--feature Meeting_Hours] [--shift 2]
+"""
+
+import argparse
+import contextlib
+import copy
+import hashlib
+import sys
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from incremental_scoring import row_fingerprints
+from validation import FEATURE_RANGES
+
+MAX_CACHE_ENTRIES = 256
+
+
+class SensitivityEngine:
+    """
+    Batched, memoized what-if analysis over a FacultyStressPredictor
+
+    Args:
+        predictor: FacultyStressPredictor with a loaded model
+        batch_rows: rows per predict_proba call
+        sample_rows: rosters larger than this are sampled
+        seed: sampling seed
+    """
+
+    def __init__(self, predictor, batch_rows=500000, sample_rows=50000, seed=42):
+        self.predictor = predictor
+        self.feature_columns = predictor.feature_columns
+        self.batch_rows = batch_rows
+        self.sample_rows = sample_rows
+        self.seed = seed
+        self._cache = {}
+        self._cache_model = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _model_key(self):
+        return self.predictor.model_version or id(self.predictor.model)
+
+    def _prepare(self, df):
+        """Feature matrix (sampled if large) and its fingerprint"""
+        values = df[self.feature_columns].to_numpy(dtype=np.float64)
+        if len(values) > self.sample_rows:
+            rng = np.random.default_rng(self.seed)
+            values = values[np.sort(rng.choice(len(values), self.sample_rows, replace=False))]
+        digest = hashlib.sha256(row_fingerprints(values).tobytes()).hexdigest()[:16]
+        return values, digest
+
+    def _cached(self, key, compute):
+        """Return a memoized result, computing it on a miss"""
+        model_key = self._model_key()
+        with self._lock:
+            if self._cache_model != model_key:
+                self._cache = {}
+                self._cache_model = model_key
+            if key in self._cache:
+                self.hits += 1
+                return self._cache[key]
+        result = compute()
+        with self._lock:
+            if self._cache_model == model_key:
+                if len(self._cache) >= MAX_CACHE_ENTRIES:
+                    # Evict the oldest entry (dicts keep insertion order)
+                    self._cache.pop(next(iter(self._cache)))
+                self._cache[key] = result
+            self.misses += 1
+        return result
+
+    def _score_scenarios(self, values, scenarios):
+        """
+        Class probabilities of the roster under several scenarios
+
+        Args:
+            values: roster feature matrix (rows x features)
+            scenarios: list of (feature index, new column values);
+                       a None feature leaves the roster unchanged
+
+        Returns:
+            array (scenarios x rows x classes)
+        """
+        model = self.predictor.model
+        n = len(values)
+        per_batch = max(1, self.batch_rows // max(n, 1))
+        out = np.empty((len(scenarios), n, len(model.classes_)))
+        for start in range(0, len(scenarios), per_batch):
+            group = scenarios[start:start + per_batch]
+            block = np.tile(values, (len(group), 1))
+            for j, (feature, column) in enumerate(group):
+                if feature is not None:
+                    block[j * n:(j + 1) * n, feature] = column
+            proba = model.predict_proba(pd.DataFrame(block, columns=self.feature_columns))
+            out[start:start + len(group)] = proba.reshape(len(group), n, -1)
+        return out
+
+    def _distribution(self, proba):
+        """Mean probability and share predicted per class, for each scenario"""
+        classes = self.predictor.model.classes_
+        predicted = proba.argmax(axis=-1)
+        shares = np.stack([(predicted == i).mean(axis=-1) for i in range(len(classes))], axis=-1)
+        return proba.mean(axis=-2), shares
+
+    def partial_dependence(self, df, feature, grid=None):
+        """
+        Partial dependence of the predicted classes on one feature
+
+        Args:
+            df: roster DataFrame with the feature columns
+            feature: feature name
+            grid: values to evaluate (default: every integer in its range)
+
+        Returns:
+            DataFrame with the feature value, P_<level> (mean probability)
+            and Pct_<level> (percent of the roster predicted at that level)
+        """
+        low, high = FEATURE_RANGES[feature]
+        grid = tuple(range(low, high + 1)) if grid is None else tuple(grid)
+        values, digest = self._prepare(df)
+
+        def compute():
+            f = self.feature_columns.index(feature)
+            scenarios = [(f, value) for value in grid]
+            mean_proba, shares = self._distribution(self._score_scenarios(values, scenarios))
+            table = pd.DataFrame({feature: grid})
+            for i, level in enumerate(self.predictor.model.classes_):
+                table[f'P_{level}'] = mean_proba[:, i].round(4)
+            for i, level in enumerate(self.predictor.model.classes_):
+                table[f'Pct_{level}'] = (100 * shares[:, i]).round(1)
+            return table
+
+        return self._cached(('pd', digest, feature, grid), compute).copy()
+
+    def shift(self, df, feature, delta):
+        """
+        Predicted distribution before and after moving one feature
+
+        Args:
+            df: roster DataFrame with the feature columns
+            feature: feature name
+            delta: change applied to every row (clipped to the valid range)
+
+        Returns:
+            dict with 'before' and 'after' percent predicted per level and
+            'changed' (percent of rows whose predicted level changed)
+        """
+        return self.sensitivity_table(df, deltas=(delta,), features=(feature,))[feature][delta]
+
+    def sensitivity_table(self, df, deltas=(-2, 2), features=None):
+        """
+        One-at-a-time sensitivity of the predicted distribution
+
+        Args:
+            df: roster DataFrame with the feature columns
+            deltas: shifts to apply to each feature
+            features: features to vary (default: all nine)
+
+        Returns:
+            dict feature -> delta -> {'before', 'after', 'changed'}
+        """
+        features = tuple(features or self.feature_columns)
+        deltas = tuple(deltas)
+        values, digest = self._prepare(df)
+
+        def compute():
+            classes = self.predictor.model.classes_
+            # Scenario 0 is the unchanged roster
+            scenarios = [(None, None)]
+            for feature in features:
+                f = self.feature_columns.index(feature)
+                low, high = FEATURE_RANGES[feature]
+                for delta in deltas:
+                    scenarios.append((f, np.clip(values[:, f] + delta, low, high)))
+            proba = self._score_scenarios(values, scenarios)
+            predicted = proba.argmax(axis=-1)
+            _, shares = self._distribution(proba)
+
+            def percents(i):
+                return {level: round(100 * float(shares[i, c]), 1) for c, level in enumerate(classes)}
+
+            result = {}
+            i = 1
+            for feature in features:
+                result[feature] = {}
+                for delta in deltas:
+                    result[feature][delta] = {
+                        'before': percents(0),
+                        'after': percents(i),
+                        'changed': round(100 * float((predicted[i] != predicted[0]).mean()), 1),
+                    }
+                    i += 1
+            return result
+
+        return copy.deepcopy(self._cached(('oat', digest, features, deltas), compute))
+
+
+def format_sensitivity(table, level='High'):
+    """Readable lines: how the share predicted at `level` moves per feature and shift"""
+    lines = []
+    for feature, by_delta in table.items():
+        parts = []
+        for delta, result in by_delta.items():
+            before, after = result['before'][level], result['after'][level]
+            parts.append(f"{delta:+d}: {after:5.1f}% ({after - before:+5.1f})")
+        lines.append(f"  {feature:<20s} " + "   ".join(parts))
+    return "\n".join(lines)
+
+
+def main():
+    """Main entry point"""
+    from stress_predictor import FacultyStressPredictor
+
+    parser = argparse.ArgumentParser(description="How the predicted stress distribution responds to workload")
+    parser.add_argument('--data', default='dataset.csv')
+    parser.add_argument('--feature', choices=list(FEATURE_RANGES),
+                        help="Partial dependence of one feature (default: all features)")
+    parser.add_argument('--shift', type=int, default=2, help="Shift applied in each direction")
+    parser.add_argument('--model', default='stress_model.joblib')
+    args = parser.parse_args()
+
+    predictor = FacultyStressPredictor()
+    with contextlib.redirect_stdout(sys.stderr):
+        predictor.load_model(args.model)
+    df = pd.read_csv(args.data)
+    engine = SensitivityEngine(predictor)
+
+    start = time.perf_counter()
+    if args.feature:
+        print(engine.partial_dependence(df, args.feature).to_string(index=False))
+        result = engine.shift(df, args.feature, args.shift)
+        print(f"\n{args.feature} {args.shift:+d} for everyone: {result['before']} -> {result['after']} "
+              f"({result['changed']}% of faculty change level)")
+    else:
+        table = engine.sensitivity_table(df, deltas=(-args.shift, args.shift))
+        print(f"Share predicted High after shifting each feature (baseline "
+              f"{next(iter(table.values()))[-args.shift]['before']['High']}%):")
+        print(format_sensitivity(table))
+    print(f"\n({time.perf_counter() - start:.3f}s)", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,221 @@
+"""
+Streaming Hand-off Between the ML Predictor and the Expert System
+Pipe/FIFO protocol mode for the Hybrid AI System
+
+Instead of writing stress_output.txt and having the expert system poll
+for it, the predictor writes one record per faculty member to stdout or a
+FIFO and a long-running consumer turns each record into a wellness report
+as it arrives. Thousands of faculty flow through one pair of processes
+without touching the filesystem per record.
+
+Each record uses the same text as stress_output.txt:
+    faculty_id:F001,stress_level:high
+
+Two framings are supported:
+    line    - record followed by a newline
+    length  - 4-byte big-endian payload length followed by the UTF-8 record
+
+Usage:
+    python stream_protocol.py produce dataset.csv | python stream_protocol.py consume
+    python stream_protocol.py produce dataset.csv --output /tmp/stress.fifo --framing length
+    python stream_protocol.py consume --input /tmp/stress.fifo --framing length --format jsonl
+"""
+
+import argparse
+import contextlib
+import struct
+import sys
+import time
+
+from report_renderer import BatchReportRenderer
+from wellness_expert_python import WellnessExpertSystem
+
+FRAMINGS = ('line', 'length')
+_LENGTH_PREFIX = struct.Struct('>I')
+
+
+def encode_record(faculty_id, stress_level, framing='line'):
+    """
+    Encode one prediction as a framed protocol record
+
+    Args:
+        faculty_id: faculty identifier
+        stress_level: predicted stress level (any case)
+        framing: 'line' or 'length'
+
+    Returns:
+        bytes ready to be written to the stream
+    """
+    payload = f"faculty_id:{faculty_id},stress_level:{stress_level.lower()}".encode('utf-8')
+    if framing == 'line':
+        return payload + b"\n"
+    if framing == 'length':
+        return _LENGTH_PREFIX.pack(len(payload)) + payload
+    raise ValueError(f"Unknown framing '{framing}'. Use one of: {', '.join(FRAMINGS)}")
+
+
+def iter_payloads(stream, framing='line'):
+    """
+    Yield decoded record payloads from a binary stream until EOF
+
+    Args:
+        stream: binary file-like object (stdin.buffer, FIFO, socket file)
+        framing: 'line' or 'length'
+    """
+    if framing == 'line':
+        for raw in stream:
+            line = raw.decode('utf-8').strip()
+            if line:
+                yield line
+    elif framing == 'length':
+        while True:
+            header = stream.read(_LENGTH_PREFIX.size)
+            if not header:
+                return
+            if len(header) < _LENGTH_PREFIX.size:
+                raise EOFError("Truncated length prefix at end of stream")
+            (length,) = _LENGTH_PREFIX.unpack(header)
+            payload = stream.read(length)
+            if len(payload) < length:
+                raise EOFError("Truncated record at end of stream")
+            yield payload.decode('utf-8')
+    else:
+        raise ValueError(f"Unknown framing '{framing}'. Use one of: {', '.join(FRAMINGS)}")
+
+
+class WellnessStreamConsumer:
+    """Reads prediction records continuously and emits one report per record"""
+
+    def __init__(self, expert_system=None, fmt='text', refresh_every=1000):
+        self.expert_system = expert_system or WellnessExpertSystem()
+        self.renderer = BatchReportRenderer(self.expert_system)
+        self.fmt = fmt
+        # How often (in records) to check for a reloaded knowledge base
+        self.refresh_every = refresh_every
+        self.records = 0
+        self.errors = 0
+
+    def iter_records(self, stream, framing='line'):
+        """Yield (faculty_id, stress_level) for every well-formed record"""
+        for payload in iter_payloads(stream, framing):
+            faculty_id, stress_level = self.expert_system.parse_stress_record(payload)
+            if faculty_id is None or stress_level is None:
+                self.errors += 1
+                print(f"Warning: skipping malformed record: {payload!r}", file=sys.stderr)
+                continue
+            yield faculty_id, stress_level
+
+    def consume(self, in_stream, out_stream, framing='line', flush_every=1):
+        """
+        Emit recommendations for every record until the input closes
+
+        Args:
+            in_stream: binary input stream carrying framed records
+            out_stream: text stream receiving the rendered reports
+            framing: 'line' or 'length'
+            flush_every: flush the output after this many reports
+
+        Returns:
+            Number of reports emitted
+        """
+        render = self.renderer.render_text if self.fmt == 'text' else self.renderer.render_json
+        for faculty_id, stress_level in self.iter_records(in_stream, framing):
+            out_stream.write(render(faculty_id, stress_level))
+            self.records += 1
+            if self.records % self.refresh_every == 0:
+                self.renderer.refresh()
+            if self.records % flush_every == 0:
+                out_stream.flush()
+        out_stream.flush()
+        return self.records
+
+
+def produce(predictor, faculty_data, out_stream, framing='line', chunk_size=10000):
+    """
+    Predict stress levels and write them to a stream as framed records
+
+    Args:
+        predictor: FacultyStressPredictor with a loaded model
+        faculty_data: DataFrame (or iterable of DataFrame chunks) with a
+                      Faculty_ID column and the nine feature columns
+        out_stream: binary output stream (stdout.buffer or an open FIFO)
+        framing: 'line' or 'length'
+        chunk_size: rows predicted per model call
+
+    Returns:
+        Number of records written
+    """
+    chunks = [faculty_data] if hasattr(faculty_data, 'iloc') else faculty_data
+    count = 0
+    for chunk in chunks:
+        for start in range(0, len(chunk), chunk_size):
+            part = chunk.iloc[start:start + chunk_size]
+            predictions = predictor.predict(part)
+            out_stream.write(b"".join(
+                encode_record(faculty_id, level, framing)
+                for faculty_id, level in zip(part['Faculty_ID'], predictions)
+            ))
+            out_stream.flush()
+            count += len(part)
+    return count
+
+
+def _open_binary(path, mode, default):
+    """Open a path (or FIFO) in binary mode, '-' or None meaning stdio"""
+    if path in (None, '-'):
+        return contextlib.nullcontext(default)
+    return open(path, mode)
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description="Streaming predictor/expert-system hand-off")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    producer = subparsers.add_parser('produce', help="Predict a CSV and stream records out")
+    producer.add_argument('input', help="Faculty workload CSV (with Faculty_ID)")
+    producer.add_argument('--output', default='-', help="FIFO or file to write ('-' = stdout)")
+    producer.add_argument('--framing', choices=FRAMINGS, default='line')
+    producer.add_argument('--model', default='stress_model.joblib')
+    producer.add_argument('--chunk-size', type=int, default=10000)
+
+    consumer = subparsers.add_parser('consume', help="Read records and emit wellness reports")
+    consumer.add_argument('--input', default='-', help="FIFO or file to read ('-' = stdin)")
+    consumer.add_argument('--output', default='-', help="Report output file ('-' = stdout)")
+    consumer.add_argument('--framing', choices=FRAMINGS, default='line')
+    consumer.add_argument('--format', choices=('text', 'jsonl'), default='text')
+
+    args = parser.parse_args()
+    start = time.perf_counter()
+
+    if args.command == 'produce':
+        import pandas as pd
+        from stress_predictor import FacultyStressPredictor
+
+        predictor = FacultyStressPredictor()
+        # Keep stdout clean for the record stream
+        with contextlib.redirect_stdout(sys.stderr):
+            predictor.load_model(args.model)
+        chunks = pd.read_csv(args.input, chunksize=args.chunk_size)
+        with _open_binary(args.output, 'wb', sys.stdout.buffer) as out_stream:
+            count = produce(predictor, chunks, out_stream, args.framing, args.chunk_size)
+        label = "records produced"
+    else:
+        stream_consumer = WellnessStreamConsumer(fmt=args.format)
+        with _open_binary(args.input, 'rb', sys.stdin.buffer) as in_stream:
+            if args.output == '-':
+                count = stream_consumer.consume(in_stream, sys.stdout, args.framing)
+            else:
+                with open(args.output, 'w', encoding='utf-8') as out_stream:
+                    # Nobody is watching a file live, so flush in larger batches
+                    count = stream_consumer.consume(in_stream, out_stream, args.framing,
+                                                    flush_every=1000)
+        label = "reports emitted"
+
+    elapsed = time.perf_counter() - start
+    rate = count / elapsed if elapsed > 0 else float('inf')
+    print(f"{count} {label} in {elapsed:.3f}s ({rate:,.0f}/sec)", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -15,12 +15,82 @@ from sklearn.model_selection import train_test_split
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.tree import DecisionTreeClassifier
 from sklearn.metrics import classification_report, accuracy_score, confusion_matrix
+import hashlib
 import joblib
 import os
+import sys
+import threading
+
+from drift_monitor import DriftMonitor, build_training_snapshot
+from explanations import ForestExplainer
+from metrics import METRICS, timed
+from parallel_scoring import ParallelScorer, flatten_forest, rebuild_trees, trees_predict_proba
+from records import FacultyRecord, RecordBatch, is_record_input
+from validation import prompt_feature, validate_frame, write_quarantine
+
+
+class ModelState:
+    """
+    A model and everything derived from it, swapped in as one object
+
+    model, version and drift_monitor never change after construction. The
+    rebuilt trees used to score records, and the explainer, are each built
+    at most once per state, on first use. A request
+    reads FacultyStressPredictor.state once and uses only that object, so
+    a concurrent install_model() cannot mix two models in one result.
+
+    Args:
+        model: fitted estimator, or None
+        version: content hash of its file; None for a model not yet saved
+        feature_columns: feature names in training order
+        explainer: ForestExplainer already built for the model, if any
+    """
+
+    __slots__ = ('model', 'version', 'drift_monitor', 'feature_columns', '_forest', '_explainer', '_lock')
+
+    def __init__(self, model, version, feature_columns, explainer=None):
+        snapshot = getattr(model, 'training_snapshot_', None)
+        self.model = model
+        self.version = version
+        self.feature_columns = feature_columns
+        self.drift_monitor = DriftMonitor(snapshot, feature_columns) if snapshot is not None else None
+        self._forest = None
+        self._explainer = explainer
+        self._lock = threading.Lock()
+
+    @property
+    def forest(self):
+        """(trees, classes): the model's trees rebuilt for direct scoring"""
+        if self._forest is None:
+            with self._lock:
+                if self._forest is None:
+                    self._forest = (rebuild_trees(*flatten_forest(self.model)),
+                                    np.asarray(self.model.classes_))
+        return self._forest
+
+    @property
+    def explainer(self):
+        if self._explainer is None:
+            with self._lock:
+                if self._explainer is None:
+                    self._explainer = ForestExplainer(self.model, self.feature_columns)
+        return self._explainer
+
+    def with_version(self, version):
+        """The same model (and its explainer) under a new version"""
+        state = ModelState.__new__(ModelState)
+        state.model = self.model
+        state.version = version
+        state.feature_columns = self.feature_columns
+        state.drift_monitor = self.drift_monitor
+        state._forest = self._forest
+        state._explainer = self._explainer
+        state._lock = threading.Lock()
+        return state
+
 
 class FacultyStressPredictor:
     def __init__(self):
-        self.model = None
         self.feature_columns = [
             'Subjects_Handled', 'Students_Total', 'Prep_Hours',
             'Research_Load_Hours', 'Committee_Duties', 'Admin_Tasks',
@@ -28,9 +98,25 @@ class FacultyStressPredictor:
         ]
         # Get the directory where this script is located
         self.script_dir = os.path.dirname(os.path.abspath(__file__))
+        # Current model, its version, drift monitor and explainer
+        self.state = ModelState(None, None, self.feature_columns)
+
+    @property
+    def model(self):
+        return self.state.model
+
+    @property
+    def model_version(self):
+        """Content hash of the model file; None for a model not yet saved"""
+        return self.state.version
+
+    @property
+    def drift_monitor(self):
+        """Set from the training snapshot stored with the model"""
+        return self.state.drift_monitor
 
     def calculate_wss(self, row):
-        """Calculate Workload Stress Score based on the formula"""
+        """Calculate Workload Stress Score based on the formula (dict, Series or FacultyRecord)"""
         points = 0
 
         # Subjects Handled: 1-2 = 1pt, 3-4 = 2pts, 5+ = 3pts
@@ -107,6 +193,59 @@ class FacultyStressPredictor:
 
         return points
 
+    def calculate_wss_batch(self, faculty_data):
+        """
+        Calculate the Workload Stress Score for many rows at once
+
+        Applies exactly the same point bands as calculate_wss, one whole
+        column at a time.
+
+        Args:
+            faculty_data: DataFrame with the feature columns, a RecordBatch
+                          or FacultyRecord, or a 2-D array whose columns
+                          are in feature_columns order
+
+        Returns:
+            NumPy integer array of WSS scores
+        """
+        return self.calculate_wss_points_batch(faculty_data).sum(axis=1)
+
+    def calculate_wss_points_batch(self, faculty_data):
+        """
+        Points (1-3) each feature adds to the WSS, for many rows at once
+
+        Args:
+            faculty_data: DataFrame with the feature columns, a RecordBatch
+                          or FacultyRecord, or a 2-D array whose columns
+                          are in feature_columns order
+
+        Returns:
+            NumPy integer array (rows x features) in feature_columns order
+        """
+        if isinstance(faculty_data, RecordBatch):
+            # Zero-copy views of the structured array's fields
+            columns = [faculty_data.data[col] for col in self.feature_columns]
+        elif isinstance(faculty_data, FacultyRecord):
+            columns = faculty_data.features(np.int64).T
+        elif hasattr(faculty_data, 'columns'):
+            columns = faculty_data[self.feature_columns].to_numpy().T
+        else:
+            columns = np.asarray(faculty_data).T
+        (subjects, students, prep, research, committee,
+         admin, meetings, sleep, weekend) = columns
+
+        points = np.ones((len(subjects), len(self.feature_columns)), dtype=np.int64)
+        points[:, 0] += (subjects > 2).astype(np.int64) + (subjects > 4)
+        points[:, 1] += (students >= 60).astype(np.int64) + (students > 100)
+        points[:, 2] += (prep >= 6).astype(np.int64) + (prep > 10)
+        points[:, 3] += (research >= 4).astype(np.int64) + (research > 6)
+        points[:, 4] += (committee > 1).astype(np.int64) + ((committee > 1) & (committee != 2))
+        points[:, 5] += (admin > 1).astype(np.int64) + (admin > 3)
+        points[:, 6] += (meetings >= 3).astype(np.int64) + (meetings > 6)
+        points[:, 7] += (sleep < 7).astype(np.int64) + ((sleep < 7) & (sleep != 6))
+        points[:, 8] += (weekend != 0).astype(np.int64) + (weekend > 2)
+        return points
+
     def get_stress_level_from_wss(self, wss):
         """Convert WSS score to stress level"""
         if wss <= 14:
@@ -116,14 +255,34 @@ class FacultyStressPredictor:
         else:
             return "High"
 
-    def load_and_prepare_data(self, filepath='dataset_with_labels.csv'):
-        """Load dataset and prepare for training"""
+    def get_stress_levels_from_wss_batch(self, wss):
+        """Convert an array of WSS scores to stress levels"""
+        wss = np.asarray(wss)
+        return np.where(wss <= 14, "Low", np.where(wss <= 20, "Medium", "High"))
+
+    @timed('load_and_prepare_data')
+    def load_and_prepare_data(self, filepath='dataset_with_labels.csv', quarantine_file=None):
+        """
+        Load dataset and prepare for training
+
+        Rows failing schema validation (out-of-range values, non-integers,
+        duplicate Faculty_IDs, unknown labels) are dropped and, if
+        quarantine_file is given, appended there with the reason.
+        """
         print("Loading dataset...")
         # If relative path, make it relative to script directory
         if not os.path.isabs(filepath):
             filepath = os.path.join(self.script_dir, filepath)
         df = pd.read_csv(filepath)
 
+        result = validate_frame(df, require_id='Faculty_ID' in df.columns)
+        if result.rejected_count:
+            print(f"Rejected {result.rejected_count} invalid rows")
+            if quarantine_file:
+                write_quarantine(result.rejected, quarantine_file)
+                print(f"Rejected rows written to: {quarantine_file}")
+        df = result.valid
+
         # Features and target
         X = df[self.feature_columns]
         y = df['Stress_Level']
@@ -151,96 +310,208 @@ class FacultyStressPredictor:
 
         # Select model
         if model_type == 'random_forest':
-            self.model = RandomForestClassifier(
+            model = RandomForestClassifier(
                 n_estimators=100,
                 max_depth=10,
                 random_state=42,
                 class_weight='balanced'
             )
         else:
-            self.model = DecisionTreeClassifier(
+            model = DecisionTreeClassifier(
                 max_depth=10,
                 random_state=42,
                 class_weight='balanced'
             )
 
         # Train
-        self.model.fit(X_train, y_train)
+        model.fit(X_train, y_train)
+        self.install_model(model, None)
+        self.attach_training_snapshot(X_train)
 
         # Evaluate
-        y_pred = self.model.predict(X_test)
-        accuracy = accuracy_score(y_test, y_pred)
+        accuracy = self.evaluate_model(X_test, y_test)
+
+        # Feature importance
+        # if hasattr(self.model, 'feature_importances_'):
+        #     print("\nFeature Importance:")
+        #     importance = dict(zip(self.feature_columns, self.model.feature_importances_))
+        #     for feature, imp in sorted(importance.items(), key=lambda x: x[1], reverse=True):
+        #         print(f"  {feature}: {imp:.3f}")
+
+        return accuracy
+
+    def evaluate_model(self, X, y):
+        """Print accuracy, classification report and confusion matrix"""
+        y_pred = self.model.predict(X)
+        accuracy = accuracy_score(y, y_pred)
 
         print(f"\n{'='*50}")
         print("Model Evaluation Results")
         print(f"{'='*50}")
         print(f"Accuracy: {accuracy:.2%}")
         print("\nClassification Report:")
-        print(classification_report(y_test, y_pred))
+        print(classification_report(y, y_pred))
 
         print("\nConfusion Matrix:")
-        cm = confusion_matrix(y_test, y_pred, labels=['Low', 'Medium', 'High'])
+        cm = confusion_matrix(y, y_pred, labels=['Low', 'Medium', 'High'])
         print(f"           Predicted")
         print(f"           Low  Med  High")
         print(f"Actual Low  {cm[0][0]:3d}  {cm[0][1]:3d}  {cm[0][2]:3d}")
         print(f"       Med  {cm[1][0]:3d}  {cm[1][1]:3d}  {cm[1][2]:3d}")
         print(f"       High {cm[2][0]:3d}  {cm[2][1]:3d}  {cm[2][2]:3d}")
 
-        # Feature importance
-        # if hasattr(self.model, 'feature_importances_'):
-        #     print("\nFeature Importance:")
-        #     importance = dict(zip(self.feature_columns, self.model.feature_importances_))
-        #     for feature, imp in sorted(importance.items(), key=lambda x: x[1], reverse=True):
-        #         print(f"  {feature}: {imp:.3f}")
-
         return accuracy
 
+    def attach_training_snapshot(self, X):
+        """
+        Store the training feature/prediction distribution on the model
+
+        The snapshot is saved inside the joblib file and is what the drift
+        monitor compares live traffic against.
+        """
+        state = self.state
+        predictions = state.model.predict(X[self.feature_columns])
+        formula_levels = self.get_stress_levels_from_wss_batch(self.calculate_wss_batch(X))
+        state.model.training_snapshot_ = build_training_snapshot(
+            X, predictions, formula_levels, self.feature_columns, state.model.classes_
+        )
+        self.install_model(state.model, state.version)
+
     def save_model(self, filepath='stress_model.joblib'):
-        """Save trained model to file"""
+        """Save trained model to file (written to a temp file, then renamed)"""
+        from model_registry import atomic_write
+
         # If relative path, make it relative to script directory
         if not os.path.isabs(filepath):
             filepath = os.path.join(self.script_dir, filepath)
-        joblib.dump(self.model, filepath)
+        state = self.state
+        atomic_write(filepath, lambda f: joblib.dump(state.model, f))
+        self.state = state.with_version(_file_digest(filepath))
         print(f"\nModel saved to: {filepath}")
 
+    @timed('load_model')
     def load_model(self, filepath='stress_model.joblib'):
         """Load trained model from file"""
         # If relative path, make it relative to script directory
         if not os.path.isabs(filepath):
             filepath = os.path.join(self.script_dir, filepath)
-        self.model = joblib.load(filepath)
+        self.install_model(joblib.load(filepath), _file_digest(filepath))
         print(f"Model loaded from: {filepath}")
+        if self.drift_monitor is None:
+            print("No training snapshot in model; drift monitoring is off "
+                  "(run 'python drift_monitor.py snapshot' to add one)", file=sys.stderr)
+
+    def install_model(self, model, version, explainer=None):
+        """
+        Switch to a fully loaded model
+
+        The new ModelState is built completely and then replaces the old
+        one in a single assignment, so a concurrent request uses either the
+        old model or the new one, never a mix (model_registry.RegistryWatcher).
+
+        Args:
+            model: fitted estimator
+            version: content hash of its file
+            explainer: ForestExplainer already built for the model, if any
+        """
+        self.state = ModelState(model, version, self.feature_columns, explainer)
 
+    def get_explainer(self):
+        """ForestExplainer for the current model, precomputed once per model"""
+        return self.state.explainer
+
+    @timed('predict')
     def predict(self, faculty_data):
         """
         Predict stress level for faculty member(s)
 
         Args:
-            faculty_data: dict or DataFrame with faculty workload data
+            faculty_data: dict, DataFrame, FacultyRecord or RecordBatch
+                          with faculty workload data
 
         Returns:
             Predicted stress level(s)
         """
-        if isinstance(faculty_data, dict):
-            df = pd.DataFrame([faculty_data])
+        state = self.state
+        if is_record_input(faculty_data):
+            X, _, predictions = self._predict_records(state, faculty_data)
         else:
-            df = faculty_data
-
-        X = df[self.feature_columns]
-        predictions = self.model.predict(X)
+            df = pd.DataFrame([faculty_data]) if isinstance(faculty_data, dict) else faculty_data
+            X = df[self.feature_columns]
+            predictions = state.model.predict(X)
+        METRICS.count('rows_predicted', len(X))
+        self.observe_drift(X, predictions, state)
 
         return predictions
 
+    def _predict_records(self, state, faculty_data):
+        """
+        Score a FacultyRecord or RecordBatch without building a DataFrame
+
+        The trees are walked directly (rebuilt once per model, see
+        ModelState.forest), so a plain feature matrix needs no column names
+        and gives the same probabilities and labels as
+        model.predict_proba / model.predict.
+
+        Returns:
+            (X, proba, predictions): float32 feature matrix, class
+            probabilities and predicted stress levels
+        """
+        X = faculty_data.features()
+        trees, classes = state.forest
+        proba = trees_predict_proba(trees, X)
+        return X, proba, classes.take(proba.argmax(axis=1))
+
+    def observe_drift(self, faculty_data, predictions, state=None):
+        """Feed scored rows to the drift monitor (no-op without a snapshot)"""
+        monitor = (state or self.state).drift_monitor
+        if monitor is None:
+            return
+        if not hasattr(faculty_data, 'columns'):
+            values = np.asarray(faculty_data)
+        elif list(faculty_data.columns) != self.feature_columns:
+            # Column selection dominates the cost for single-row requests
+            values = faculty_data[self.feature_columns].to_numpy()
+        else:
+            values = faculty_data.to_numpy()
+        formula_levels = self.get_stress_levels_from_wss_batch(self.calculate_wss_batch(values))
+        monitor.observe(values, predictions, formula_levels)
+
+    def predict_parallel(self, faculty_data, workers=None):
+        """
+        Predict stress levels for a large batch using several processes
+
+        The model and input are shared with the workers through shared
+        memory; use parallel_scoring.ParallelScorer directly to keep the
+        worker pool alive across several calls.
+
+        Args:
+            faculty_data: DataFrame with faculty workload data
+            workers: number of worker processes (default: all cores)
+
+        Returns:
+            Predicted stress levels
+        """
+        with ParallelScorer(self.model, self.feature_columns, workers) as scorer:
+            return scorer.predict(faculty_data)
+
+    @timed('predict_with_details')
     def predict_with_details(self, faculty_data):
         """
         Predict stress level with detailed breakdown
 
         Args:
-            faculty_data: dict with faculty workload data
+            faculty_data: dict or FacultyRecord with faculty workload data
 
         Returns:
-            dict with prediction details
+            dict with prediction details, including the WSS points per
+            feature and the features contributing most to the prediction
         """
+        # One model for the whole request, even if another is installed meanwhile
+        state = self.state
+        if isinstance(faculty_data, FacultyRecord):
+            return self._record_details(state, faculty_data)
+
         if isinstance(faculty_data, dict):
             df = pd.DataFrame([faculty_data])
         else:
@@ -251,24 +522,57 @@ class FacultyStressPredictor:
         formula_stress = self.get_stress_level_from_wss(wss)
 
         # ML Prediction
-        ml_prediction = self.predict(faculty_data)[0]
+        X = df[self.feature_columns]
+        predictions = state.model.predict(X)
+        METRICS.count('rows_predicted', len(X))
+        self.observe_drift(X, predictions, state)
+        ml_prediction = predictions[0]
 
         # Get probability if available
-        X = df[self.feature_columns]
-        if hasattr(self.model, 'predict_proba'):
-            proba = self.model.predict_proba(X)[0]
-            classes = self.model.classes_
+        if hasattr(state.model, 'predict_proba'):
+            proba = state.model.predict_proba(X)[0]
+            classes = state.model.classes_
             probabilities = dict(zip(classes, proba))
         else:
             probabilities = None
 
+        # Per-row explanation: WSS points per feature and path contributions
+        points = self.calculate_wss_points_batch(X.iloc[:1])[0]
+        explainer = state.explainer
+        _, contributions = explainer.explain(X.iloc[:1])
+        class_index = int(np.searchsorted(explainer.classes_, ml_prediction))
+
         return {
             'wss_score': wss,
             'formula_stress_level': formula_stress,
             'ml_prediction': ml_prediction,
-            'probabilities': probabilities
+            'probabilities': probabilities,
+            'wss_breakdown': dict(zip(self.feature_columns, points.tolist())),
+            'ml_factors': explainer.top_factors(contributions, class_index)[0]
+        }
+
+    def _record_details(self, state, record):
+        """predict_with_details for a FacultyRecord: one feature matrix, no DataFrame"""
+        wss = self.calculate_wss(record)
+        X, proba, predictions = self._predict_records(state, record)
+        METRICS.count('rows_predicted', 1)
+        self.observe_drift(X, predictions, state)
+        ml_prediction = predictions[0]
+
+        explainer = state.explainer
+        _, contributions = explainer.explain(X)
+        class_index = int(np.searchsorted(explainer.classes_, ml_prediction))
+
+        return {
+            'wss_score': wss,
+            'formula_stress_level': self.get_stress_level_from_wss(wss),
+            'ml_prediction': ml_prediction,
+            'probabilities': dict(zip(state.forest[1], proba[0])),
+            'wss_breakdown': dict(zip(self.feature_columns, self.calculate_wss_points_batch(record)[0].tolist())),
+            'ml_factors': explainer.top_factors(contributions, class_index)[0]
         }
 
+    @timed('generate_prolog_output')
     def generate_prolog_output(self, faculty_id, stress_level, output_file='stress_output.txt'):
         """Generate output file for Visual Prolog integration"""
         # Write to script directory (CS18A-FINALPROJECT)
@@ -306,27 +610,35 @@ class FacultyStressPredictor:
         #     print(f"  - {exe64_output} (for Visual Prolog exe64)")
         # print(f"Content: faculty_id={faculty_id}, stress_level={stress_level.lower()}")
 
+def _file_digest(filepath):
+    """Short SHA-256 of a file's contents, used as the model version"""
+    digest = hashlib.sha256()
+    with open(filepath, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()[:16]
+
 def get_user_input():
-    """Get faculty data from user input"""
+    """Get faculty data from user input as a FacultyRecord"""
     print("\n" + "="*50)
     print("Enter Faculty Workload Data")
     print("="*50)
 
-    data = {}
-    data['Faculty_ID'] = input("Faculty ID (e.g., F001): ").strip()
+    faculty_id = input("Faculty ID (e.g., F001): ").strip()
 
     print("\nEnter workload metrics:")
-    data['Subjects_Handled'] = int(input("Number of subjects handled (1-6): "))
-    data['Students_Total'] = int(input("Total number of students (20-200): "))
-    data['Prep_Hours'] = int(input("Preparation hours per week (3-15): "))
-    data['Research_Load_Hours'] = int(input("Research load hours per week (0-12): "))
-    data['Committee_Duties'] = int(input("Number of committee duties (0-5): "))
-    data['Admin_Tasks'] = int(input("Number of admin tasks (0-6): "))
-    data['Meeting_Hours'] = int(input("Meeting hours per week (1-10): "))
-    data['Sleep_Hours'] = int(input("Average sleep hours per night (4-9): "))
-    data['Weekend_Work'] = int(input("Weekend work frequency (0-5): "))
-
-    return data
+    return FacultyRecord(
+        faculty_id,
+        Subjects_Handled=prompt_feature("Number of subjects handled (1-6): ", 'Subjects_Handled'),
+        Students_Total=prompt_feature("Total number of students (20-200): ", 'Students_Total'),
+        Prep_Hours=prompt_feature("Preparation hours per week (3-15): ", 'Prep_Hours'),
+        Research_Load_Hours=prompt_feature("Research load hours per week (0-12): ", 'Research_Load_Hours'),
+        Committee_Duties=prompt_feature("Number of committee duties (0-5): ", 'Committee_Duties'),
+        Admin_Tasks=prompt_feature("Number of admin tasks (0-6): ", 'Admin_Tasks'),
+        Meeting_Hours=prompt_feature("Meeting hours per week (1-10): ", 'Meeting_Hours'),
+        Sleep_Hours=prompt_feature("Average sleep hours per night (4-9): ", 'Sleep_Hours'),
+        Weekend_Work=prompt_feature("Weekend work frequency (0-5): ", 'Weekend_Work'),
+    )
 
 def main():
     """Main function to run the stress prediction system"""
@@ -364,7 +676,7 @@ def main():
         if choice == '1':
             # Get user input
             faculty_data = get_user_input()
-            faculty_id = faculty_data.pop('Faculty_ID')
+            faculty_id = faculty_data.Faculty_ID
 
             # Make prediction
             result = predictor.predict_with_details(faculty_data)
@@ -393,7 +705,7 @@ def main():
 
             if faculty_id in df['Faculty_ID'].values:
                 faculty_row = df[df['Faculty_ID'] == faculty_id].iloc[0]
-                faculty_data = faculty_row[predictor.feature_columns].to_dict()
+                faculty_data = FacultyRecord.from_mapping(faculty_row)
 
                 result = predictor.predict_with_details(faculty_data)
 
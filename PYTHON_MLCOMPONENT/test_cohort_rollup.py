@@ -0,0 +1,49 @@
+"""Regression tests for cohort_rollup"""
+
+import contextlib
+import io
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from cohort_rollup import MISSING_GROUP, CohortRollup
+from stress_predictor import FacultyStressPredictor
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+@pytest.fixture(scope='module')
+def predictor():
+    predictor = FacultyStressPredictor()
+    with contextlib.redirect_stdout(io.StringIO()):
+        predictor.load_model(os.path.join(SCRIPT_DIR, 'stress_model.joblib'))
+    return predictor
+
+
+def _update(rollup, predictor, chunk):
+    points = predictor.calculate_wss_points_batch(chunk)
+    rollup.update(chunk, predictor.predict(chunk), points,
+                  predictor.get_stress_levels_from_wss_batch(points.sum(axis=1)))
+
+
+def test_missing_group_gets_its_own_row_and_shards_merge(predictor):
+    roster = pd.read_csv(os.path.join(SCRIPT_DIR, 'dataset.csv')).head(40)
+    roster['Department'] = np.array(['CS', 'Math', None], dtype=object)[np.arange(len(roster)) % 3]
+
+    single = CohortRollup('Department')
+    _update(single, predictor, roster)
+    table = single.summary().set_index('Department')
+    assert table.loc[MISSING_GROUP, 'Rows'] == roster['Department'].isna().sum()
+    assert table.loc['CS', 'Rows'] == (roster['Department'] == 'CS').sum()
+    assert table['Rows'].sum() == len(roster)
+
+    # Shards saved and reloaded as JSON state, one of them with no group values at all
+    merged = None
+    for part in (roster.iloc[:14], roster.iloc[14:15], roster.iloc[15:]):
+        shard = CohortRollup('Department')
+        _update(shard, predictor, part)
+        shard = CohortRollup.from_state(shard.to_state())
+        merged = shard if merged is None else merged.merge(shard)
+    pd.testing.assert_frame_equal(merged.summary(), single.summary())
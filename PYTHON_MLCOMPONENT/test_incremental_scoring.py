@@ -0,0 +1,50 @@
+"""Regression tests for incremental_scoring"""
+
+import contextlib
+import io
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from incremental_scoring import PredictionStore, rescore
+from stress_predictor import FacultyStressPredictor
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+@pytest.fixture(scope='module')
+def predictor():
+    predictor = FacultyStressPredictor()
+    with contextlib.redirect_stdout(io.StringIO()):
+        predictor.load_model(os.path.join(SCRIPT_DIR, 'stress_model.joblib'))
+    return predictor
+
+
+@pytest.fixture(scope='module')
+def roster():
+    return pd.read_csv(os.path.join(SCRIPT_DIR, 'dataset.csv'))
+
+
+def test_repeated_faculty_id_keeps_store_usable(predictor, roster, tmp_path):
+    store_path = str(tmp_path / 'store.npz')
+    repeated = pd.concat([roster.head(20), roster.iloc[[5]]], ignore_index=True)
+    repeated.loc[20, 'Meeting_Hours'] = 10
+
+    labels, stats = rescore(predictor, repeated, store_path)
+    assert len(labels) == stats['rows'] == 21
+    store = PredictionStore.load(store_path)
+    assert len(store) == 20
+
+    # A different roster used to fail reindexing against duplicate keys
+    labels, stats = rescore(predictor, roster.iloc[10:40], store_path)
+    assert list(labels) == list(predictor.predict(roster.iloc[10:40]))
+    # Rows 10-19 were stored by the first run, rows 20-39 are new
+    assert stats['new'] == 20
+
+
+def test_store_refuses_repeated_keys(tmp_path):
+    store = PredictionStore(np.array([1, 2, 1], dtype=np.uint64), [0, 0, 0], [0, 0, 0], ['Low'])
+    with pytest.raises(ValueError):
+        store.save(str(tmp_path / 'store.npz'))
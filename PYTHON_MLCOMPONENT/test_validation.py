@@ -0,0 +1,22 @@
+"""Regression tests for validation"""
+
+import os
+
+import pandas as pd
+
+from validation import REASON_COLUMN, FrameValidator
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def test_all_blank_faculty_ids_are_rejected(tmp_path):
+    roster = pd.read_csv(os.path.join(SCRIPT_DIR, 'dataset.csv')).head(10)
+    roster['Faculty_ID'] = ''
+    path = tmp_path / 'noid.csv'
+    roster.to_csv(path, index=False)
+
+    validator = FrameValidator()
+    for chunk in pd.read_csv(path, chunksize=4):
+        result = validator.validate(chunk)
+        assert len(result.valid) == 0
+        assert (result.rejected[REASON_COLUMN] == "Faculty_ID missing").all()
@@ -0,0 +1,20 @@
+"""Regression tests for wellness_expert_python"""
+
+from wellness_expert_python import WellnessExpertSystem
+from workload_history import FacultyTrend
+
+
+def test_rising_trend_escalates_only_the_recommendations():
+    expert = WellnessExpertSystem()
+    trend = FacultyTrend()
+    for week, wss in enumerate([15, 17, 19, 21], start=1):
+        trend.add(week, wss, 'Medium')
+    assert expert.assess_trend('medium', trend)[0] == 'high'
+
+    report = expert.format_report('F001', 'medium', trend)
+    assert "Stress Level: MEDIUM\n" in report
+    for indicator in expert.get_indicators('medium').values():
+        assert f": {indicator}\n" in report
+    assert expert.get_indicators('high')['sleep_indicator'] not in report
+    for recommendation in expert.get_recommendations('high').values():
+        assert f"   {recommendation}\n" in report
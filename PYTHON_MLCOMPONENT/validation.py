@@ -0,0 +1,225 @@
+"""
+Schema Validation for Faculty Workload Data
+
+The valid ranges documented in the input prompts (subjects 1-6, students
+20-200, sleep 4-9, ...) are enforced here. Bulk input is checked one
+whole column at a time with NumPy masks, so validating a million-row file
+costs a small fraction of scoring it. Rejected rows keep their original
+values plus a Rejection_Reason and can be written to a quarantine CSV
+instead of reaching the model.
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+
+# Inclusive valid range for every model feature
+FEATURE_RANGES = {
+    'Subjects_Handled': (1, 6),
+    'Students_Total': (20, 200),
+    'Prep_Hours': (3, 15),
+    'Research_Load_Hours': (0, 12),
+    'Committee_Duties': (0, 5),
+    'Admin_Tasks': (0, 6),
+    'Meeting_Hours': (1, 10),
+    'Sleep_Hours': (4, 9),
+    'Weekend_Work': (0, 5),
+}
+STRESS_LEVELS = ('Low', 'Medium', 'High')
+REASON_COLUMN = 'Rejection_Reason'
+
+
+class ValidationResult:
+    """Rows that passed validation and rows routed to quarantine"""
+
+    def __init__(self, valid, rejected):
+        self.valid = valid
+        self.rejected = rejected
+
+    @property
+    def rejected_count(self):
+        return len(self.rejected)
+
+
+class FrameValidator:
+    """
+    Validates workload DataFrames column-wise
+
+    One instance can validate a file chunk by chunk; Faculty_IDs seen in
+    earlier chunks are remembered so duplicates across chunks are caught.
+    """
+
+    def __init__(self, require_id=True):
+        self.require_id = require_id
+        # Sorted runs of the IDs accepted in earlier chunks (largest first,
+        # merged like a binary counter so there are O(log chunks) runs);
+        # the last chunk's IDs are added only when another chunk arrives
+        self._seen_runs = []
+        self._pending_ids = None
+
+    def _mark_duplicates(self, codes, uniques, bad):
+        """
+        Flag IDs already accepted in this or an earlier chunk
+
+        Works on the factorized IDs (codes into uniques), so the strings
+        are hashed once per chunk, and earlier chunks are checked with a
+        binary search per distinct ID in each sorted run. Only IDs of rows
+        that are otherwise valid are remembered, so the first valid
+        occurrence of an ID wins.
+        """
+        n = len(codes)
+        positions = np.arange(n)
+        accepted = ~bad & (codes >= 0)
+        # Row of the first valid occurrence of every distinct ID (n if none)
+        first = np.full(len(uniques), n, dtype=np.int64)
+        np.minimum.at(first, codes[accepted], positions[accepted])
+
+        self._merge_pending()
+        if self._seen_runs:
+            uniques = np.asarray(uniques, dtype=str)
+            earlier = np.zeros(len(uniques), dtype=bool)
+            for run in self._seen_runs:
+                index = np.minimum(np.searchsorted(run, uniques), len(run) - 1)
+                earlier |= run[index] == uniques
+            first[earlier] = -1
+
+        # Missing IDs (code -1) are never duplicates; index only known codes
+        duplicate = np.zeros(n, dtype=bool)
+        known = codes >= 0
+        duplicate[known] = positions[known] > first[codes[known]]
+        self._pending_ids = uniques[(first >= 0) & (first < n)]
+        return duplicate
+
+    def _merge_pending(self):
+        """Add the previous chunk's accepted IDs as a sorted run"""
+        if self._pending_ids is None or len(self._pending_ids) == 0:
+            return
+        run = np.sort(np.asarray(self._pending_ids, dtype=str))
+        self._pending_ids = None
+        runs = self._seen_runs
+        while runs and len(runs[-1]) <= len(run):
+            # Both halves are sorted, so the stable sort is a linear merge
+            run = np.sort(np.concatenate([runs.pop(), run]), kind='stable')
+        runs.append(run)
+
+    def validate(self, df):
+        """
+        Split a DataFrame into valid and rejected rows
+
+        Args:
+            df: DataFrame with the nine feature columns (and Faculty_ID)
+
+        Returns:
+            ValidationResult; rejected rows carry a Rejection_Reason column
+        """
+        missing = [col for col in FEATURE_RANGES if col not in df.columns]
+        if self.require_id and 'Faculty_ID' not in df.columns:
+            missing.insert(0, 'Faculty_ID')
+        if missing:
+            raise ValueError(f"Input is missing required column(s): {', '.join(missing)}")
+
+        checks = []
+        for col, (low, high) in FEATURE_RANGES.items():
+            values = df[col]
+            if pd.api.types.is_integer_dtype(values.dtype):
+                as_int = values.to_numpy()
+                checks.append((f"{col} out of range {low}-{high}", (as_int < low) | (as_int > high)))
+                continue
+            numeric = pd.to_numeric(values, errors='coerce').to_numpy(dtype=np.float64)
+            not_integer = np.isnan(numeric) | (numeric != np.floor(numeric))
+            checks.append((f"{col} not an integer", not_integer))
+            checks.append((f"{col} out of range {low}-{high}",
+                           ~not_integer & ((numeric < low) | (numeric > high))))
+
+        if 'Stress_Level' in df.columns:
+            checks.append(("Stress_Level not Low/Medium/High",
+                           ~df['Stress_Level'].isin(STRESS_LEVELS).to_numpy()))
+
+        if 'Faculty_ID' in df.columns:
+            # Missing IDs get code -1
+            codes, uniques = pd.factorize(df['Faculty_ID'])
+            empty = np.asarray(np.asarray(uniques, dtype=object) == '', dtype=bool)
+            missing_id = codes < 0
+            missing_id[~missing_id] |= empty[codes[~missing_id]]
+            checks.append(("Faculty_ID missing", missing_id))
+
+        bad = np.zeros(len(df), dtype=bool)
+        for _, mask in checks:
+            bad |= mask
+
+        if 'Faculty_ID' in df.columns:
+            duplicate = self._mark_duplicates(codes, uniques, bad)
+            checks.append(("Faculty_ID duplicated", duplicate))
+            bad |= duplicate
+
+        valid = df[~bad]
+        rejected = df[bad].copy()
+        if len(rejected):
+            # Reasons are only assembled for the (few) rejected rows
+            rejected_checks = [(reason, mask[bad]) for reason, mask in checks if mask.any()]
+            rejected[REASON_COLUMN] = [
+                '; '.join(reason for reason, mask in rejected_checks if mask[i])
+                for i in range(len(rejected))
+            ]
+        else:
+            rejected[REASON_COLUMN] = pd.Series(dtype=object)
+
+        return ValidationResult(valid, rejected)
+
+
+def validate_frame(df, require_id=True):
+    """Validate a single DataFrame (see FrameValidator.validate)"""
+    return FrameValidator(require_id=require_id).validate(df)
+
+
+def write_quarantine(rejected, path):
+    """Append rejected rows (with reasons) to a quarantine CSV"""
+    if rejected is None or len(rejected) == 0:
+        return 0
+    write_header = not os.path.exists(path) or os.path.getsize(path) == 0
+    rejected.to_csv(path, mode='a', index=False, header=write_header)
+    return len(rejected)
+
+
+def validate_value(column, value):
+    """
+    Check one feature value
+
+    Returns:
+        Error message, or None if the value is valid
+    """
+    low, high = FEATURE_RANGES[column]
+    if not isinstance(value, (int, np.integer)) or isinstance(value, bool):
+        return f"{column} must be a whole number"
+    if not low <= value <= high:
+        return f"{column} must be between {low} and {high}"
+    return None
+
+
+def validate_record(record):
+    """Validate a single faculty dict; returns a list of error messages"""
+    errors = []
+    for column in FEATURE_RANGES:
+        if column not in record:
+            errors.append(f"{column} is missing")
+            continue
+        error = validate_value(column, record[column])
+        if error:
+            errors.append(error)
+    return errors
+
+
+def prompt_feature(prompt, column):
+    """Ask for one feature value until a whole number in range is entered"""
+    while True:
+        raw = input(prompt).strip()
+        try:
+            value = int(raw)
+        except ValueError:
+            print(f"  Invalid input '{raw}'. Please enter a whole number.")
+            continue
+        error = validate_value(column, value)
+        if error is None:
+            return value
+        print(f"  {error}.")
@@ -12,114 +12,107 @@ and generates personalized wellness recommendations using rules.
 
 import os
 
+from knowledge_base import load_knowledge_base
+from metrics import METRICS, timed
+
 class WellnessExpertSystem:
-    def __init__(self):
+    # Display labels used when rendering reports
+    STRESS_DISPLAY = {
+        'low': 'LOW',
+        'medium': 'MEDIUM',
+        'high': 'HIGH - ATTENTION REQUIRED'
+    }
+
+    INDICATOR_LABELS = {
+        'sleep_indicator': 'Sleep',
+        'workload_indicator': 'Workload',
+        'wellness_indicator': 'Wellness',
+        'meeting_indicator': 'Meetings',
+        'research_indicator': 'Research',
+        'committee_indicator': 'Committee',
+        'admin_indicator': 'Admin Tasks',
+        'balance_indicator': 'Work-Life Balance',
+        'productivity_indicator': 'Productivity',
+        'health_indicator': 'Health Risk'
+    }
+
+    RECOMMENDATION_LABELS = [
+        ('primary_recommendation', '1. PRIMARY ACTION'),
+        ('workload_recommendation', '2. WORKLOAD MANAGEMENT'),
+        ('wellness_recommendation', '3. WELLNESS ACTIVITIES'),
+        ('time_management_recommendation', '4. TIME MANAGEMENT'),
+        ('social_recommendation', '5. SOCIAL SUPPORT'),
+        ('preventive_recommendation', '6. PREVENTIVE MEASURES')
+    ]
+
+    # Trend thresholds used to escalate a single-week prediction
+    HIGH_STREAK_ALERT = 3        # consecutive weeks predicted High
+    RISING_SLOPE = 1.0           # WSS points per week
+    # Recent average WSS above which a rising trend escalates the level
+    RISING_AVERAGE = {'low': 12, 'medium': 17}
+    ESCALATION = {'low': 'medium', 'medium': 'high', 'high': 'high'}
+
+    def __init__(self, knowledge_file=None):
         # Get the directory where this script is located
         self.script_dir = os.path.dirname(os.path.abspath(__file__))
-        # Knowledge Base - Facts (10+ facts about faculty well-being)
-        self.knowledge_base = {
-            # Fact 1: Sleep indicators
-            'sleep_indicator': {
-                'low': "Adequate sleep (7+ hours) - Good recovery pattern",
-                'medium': "Moderate sleep (6 hours) - Recovery may be compromised",
-                'high': "Insufficient sleep (<6 hours) - Severe recovery deficit"
-            },
-            # Fact 2: Workload indicators
-            'workload_indicator': {
-                'low': "Manageable workload - Within sustainable limits",
-                'medium': "Elevated workload - Approaching capacity limits",
-                'high': "Excessive workload - Beyond sustainable capacity"
-            },
-            # Fact 3: Wellness state indicators
-            'wellness_indicator': {
-                'low': "Good overall wellness - Balanced lifestyle",
-                'medium': "Moderate wellness concerns - Some imbalance detected",
-                'high': "Critical wellness state - Immediate intervention needed"
-            },
-            # Fact 4: Meeting load indicators
-            'meeting_indicator': {
-                'low': "Reasonable meeting schedule - Adequate focus time",
-                'medium': "Moderate meeting load - Some fragmentation of work time",
-                'high': "Excessive meetings - Significant work fragmentation"
-            },
-            # Fact 5: Research load indicators
-            'research_indicator': {
-                'low': "Light research commitment - Time for other activities",
-                'medium': "Moderate research load - Balanced with teaching",
-                'high': "Heavy research demands - May conflict with teaching duties"
-            },
-            # Fact 6: Committee involvement indicators
-            'committee_indicator': {
-                'low': "Minimal committee duties - Focus on core responsibilities",
-                'medium': "Standard committee involvement - Manageable service load",
-                'high': "Heavy committee burden - Service overload risk"
-            },
-            # Fact 7: Administrative task indicators
-            'admin_indicator': {
-                'low': "Light administrative load - Focus on academic work",
-                'medium': "Moderate admin tasks - Balance maintained",
-                'high': "Heavy administrative burden - Core duties may suffer"
-            },
-            # Fact 8: Work-life balance indicators
-            'balance_indicator': {
-                'low': "Healthy work-life balance - Personal time preserved",
-                'medium': "Strained balance - Weekend work occurring",
-                'high': "Poor work-life balance - Chronic weekend work"
-            },
-            # Fact 9: Productivity state indicators
-            'productivity_indicator': {
-                'low': "Optimal productivity zone - Sustainable performance",
-                'medium': "Productivity at risk - Efficiency may decline",
-                'high': "Productivity compromised - Burnout likely"
-            },
-            # Fact 10: Physical health risk indicators
-            'health_indicator': {
-                'low': "Low health risk - Stress within healthy limits",
-                'medium': "Moderate health risk - Monitor for symptoms",
-                'high': "High health risk - Physical symptoms likely"
-            }
-        }
-
-        # Rules - Recommendations (6+ rules mapping stress to actions)
-        self.rules = {
-            # Rule 1: Primary action recommendations
-            'primary_recommendation': {
-                'low': "MAINTAIN: Continue current routine and practices. Your stress management is effective.",
-                'medium': "MONITOR: Implement time-blocking strategies. Track your energy levels throughout the week.",
-                'high': "URGENT: Request immediate workload adjustment. Consider delegating tasks and reducing commitments."
-            },
-            # Rule 2: Workload management recommendations
-            'workload_recommendation': {
-                'low': "Keep workload at current levels. Consider taking on mentorship roles.",
-                'medium': "Review task priorities weekly. Identify tasks that can be delegated or postponed.",
-                'high': "Request reduction in teaching load or number of advisees. Decline new committee assignments."
-            },
-            # Rule 3: Wellness activity recommendations
-            'wellness_recommendation': {
-                'low': "Continue regular exercise and social activities. Consider preventive health checkups.",
-                'medium': "Schedule 15-minute breaks every 2 hours. Add one wellness activity per week.",
-                'high': "Implement daily wellness breaks. Consider counseling services. Schedule health assessment."
-            },
-            # Rule 4: Time management recommendations
-            'time_management_recommendation': {
-                'low': "Optimize your schedule for long-term sustainability. Build buffer time for unexpected tasks.",
-                'medium': "Use calendar blocking for focused work. Batch similar tasks together. Set meeting-free days.",
-                'high': "Audit all time commitments immediately. Cancel non-essential meetings. Request deadline extensions."
-            },
-            # Rule 5: Social and support recommendations
-            'social_recommendation': {
-                'low': "Maintain professional networks. Share best practices with colleagues.",
-                'medium': "Connect with peer support groups. Discuss workload concerns with department head.",
-                'high': "Seek immediate supervisor support. Contact faculty wellness resources. Consider professional counseling."
-            },
-            # Rule 6: Preventive measures recommendations
-            'preventive_recommendation': {
-                'low': "Plan ahead for busy periods. Build resilience through varied activities.",
-                'medium': "Establish early warning signs for stress. Create contingency plans for high-demand periods.",
-                'high': "Immediate stress intervention needed. Establish recovery plan with clear milestones."
-            }
-        }
+        # Knowledge Base (facts) and Rules are loaded from knowledge_base.json
+        # and shared by every instance; edits to the file are picked up live
+        self.knowledge_file = knowledge_file
+
+    @property
+    def knowledge(self):
+        """Current shared KnowledgeBase snapshot (reloaded if the file changed)"""
+        return load_knowledge_base(self.knowledge_file)
+
+    @property
+    def knowledge_base(self):
+        """Facts - condition indicators keyed by name, then stress level"""
+        return self.knowledge.facts
+
+    @property
+    def rules(self):
+        """Rules - recommendations keyed by name, then stress level"""
+        return self.knowledge.rules
+
+    def parse_stress_record(self, line):
+        """
+        Parse one record written by the ML component
 
+        Args:
+            line: "faculty_id:XXX,stress_level:YYY", or a single
+                  "faculty_id:XXX" / "stress_level:YYY" line
+
+        Returns:
+            (faculty_id, stress_level) tuple; missing values are None
+        """
+        faculty_id = None
+        stress_level = None
+        line = line.strip()
+        if not line:
+            return faculty_id, stress_level
+
+        # Handle comma-separated format: "faculty_id:XXX,stress_level:YYY"
+        if ',' in line:
+            # Split by comma and parse each part
+            parts = line.split(',')
+            for part in parts:
+                part = part.strip()
+                if part.startswith('faculty_id:'):
+                    # Extract value after "faculty_id:" and before any trailing comma/whitespace
+                    faculty_id = part.split(':', 1)[1].strip()
+                elif part.startswith('stress_level:'):
+                    # Extract value after "stress_level:"
+                    stress_level = part.split(':', 1)[1].strip()
+        else:
+            # Handle separate line format: "faculty_id:XXX" or "stress_level:YYY"
+            if line.startswith('faculty_id:'):
+                faculty_id = line.split(':', 1)[1]
+            elif line.startswith('stress_level:'):
+                stress_level = line.split(':', 1)[1]
+
+        return faculty_id, stress_level
+
+    @timed('read_stress_file')
     def read_stress_file(self, filepath='stress_output.txt'):
         """Read stress level from Python ML output file"""
         try:
@@ -152,28 +145,11 @@ class WellnessExpertSystem:
             stress_level = None
 
             for line in lines:
-                line = line.strip()
-                if not line:
-                    continue
-                
-                # Handle comma-separated format: "faculty_id:XXX,stress_level:YYY"
-                if ',' in line:
-                    # Split by comma and parse each part
-                    parts = line.split(',')
-                    for part in parts:
-                        part = part.strip()
-                        if part.startswith('faculty_id:'):
-                            # Extract value after "faculty_id:" and before any trailing comma/whitespace
-                            faculty_id = part.split(':', 1)[1].strip()
-                        elif part.startswith('stress_level:'):
-                            # Extract value after "stress_level:"
-                            stress_level = part.split(':', 1)[1].strip()
-                else:
-                    # Handle separate line format: "faculty_id:XXX" or "stress_level:YYY"
-                    if line.startswith('faculty_id:'):
-                        faculty_id = line.split(':', 1)[1]
-                    elif line.startswith('stress_level:'):
-                        stress_level = line.split(':', 1)[1]
+                line_faculty_id, line_stress_level = self.parse_stress_record(line)
+                if line_faculty_id is not None:
+                    faculty_id = line_faculty_id
+                if line_stress_level is not None:
+                    stress_level = line_stress_level
 
             # Validate that we got both values
             if faculty_id is None or stress_level is None:
@@ -205,82 +181,167 @@ class WellnessExpertSystem:
             recommendations[rule_name] = values.get(stress_level, "No recommendation available")
         return recommendations
 
-    def generate_report(self, faculty_id, stress_level):
-        """Generate complete wellness recommendation report"""
-        # Header
-        print("\n" + "="*60)
-        print("    FACULTY WELLNESS RECOMMENDATION SYSTEM")
-        print("    Expert System Analysis Report")
-        print("="*60)
-        print(f"\nFaculty ID: {faculty_id}")
-
-        stress_display = {
-            'low': 'LOW',
-            'medium': 'MEDIUM',
-            'high': 'HIGH - ATTENTION REQUIRED'
-        }
-        print(f"Stress Level: {stress_display.get(stress_level, stress_level.upper())}")
+    def assess_trend(self, stress_level, trend):
+        """
+        Escalate a prediction using the faculty member's rolling trend
+
+        Uses only the trend's running aggregates, so the cost is the same
+        however many weeks of history exist.
+
+        Args:
+            stress_level: 'low', 'medium' or 'high' for the current week
+            trend: workload_history.FacultyTrend, or None
+
+        Returns:
+            (effective stress level, list of trend notes)
+        """
+        if trend is None or trend.count < 2:
+            return stress_level, []
+        notes = []
+        level = stress_level
+        slope = trend.slope
+        average = trend.moving_average
+
+        if trend.high_streak >= self.HIGH_STREAK_ALERT:
+            notes.append(f"SUSTAINED: High stress for {trend.high_streak} consecutive weeks. "
+                         "Refer to faculty wellness services and review the workload "
+                         "allocation with the department head.")
+        elif slope >= self.RISING_SLOPE:
+            if average > self.RISING_AVERAGE.get(stress_level, float('inf')):
+                level = self.ESCALATION[stress_level]
+                notes.append(f"RISING: WSS increasing by {slope:.1f} points/week "
+                             f"(recent average {average:.1f}). Recommendations raised to "
+                             f"{level.upper()} to act before the next assessment.")
+            else:
+                notes.append(f"RISING: WSS increasing by {slope:.1f} points/week. "
+                             "Monitor closely over the coming weeks.")
+        elif slope <= -self.RISING_SLOPE:
+            notes.append(f"IMPROVING: WSS falling by {-slope:.1f} points/week. "
+                         "Keep the adjustments that are working.")
+        return level, notes
+
+    def format_trend_section(self, trend, notes):
+        """Report lines describing the workload trend"""
+        lines = ["\n" + "-"*60, "WORKLOAD TREND (Weekly History)", "-"*60]
+        lines.append(f"* Weeks recorded: {trend.count}")
+        lines.append(f"* Recent average WSS: {trend.moving_average:.1f}")
+        lines.append(f"* WSS trend: {trend.slope:+.1f} points/week")
+        lines.append(f"* Consecutive weeks High: {trend.high_streak}")
+        for note in notes:
+            lines.append(f"\n{note}")
+        return "\n".join(lines) + "\n\n"
+
+    def format_peer_section(self, comparison):
+        """Report lines comparing the faculty member with similar lower-stress peers"""
+        from peer_index import format_comparison
+        lines = ["\n" + "-"*60, "SIMILAR PEERS (Workload Profile Comparison)", "-"*60]
+        lines.append(f"* Peers compared: {', '.join(comparison['peers'])}")
+        lines.append(f"\n{format_comparison(comparison)}")
+        return "\n".join(lines) + "\n\n"
+
+    def format_ranking_section(self, ranking):
+        """Report lines placing WSS and P(High) as percentiles (percentile_index)"""
+        lines = ["\n" + "-"*60, "PEER RANKING (Percentiles)", "-"*60]
+        for scope, values in ranking['scopes'].items():
+            lines.append(f"* {str(scope).capitalize()} ({values['count']} faculty): "
+                         f"WSS {ranking['wss']} is at percentile {values['wss']:.0f}; "
+                         f"P(High) {ranking['p_high']:.0%} is at percentile {values['p_high']:.0f} "
+                         f"(ties count half)")
+        return "\n".join(lines) + "\n\n"
+
+    def format_report_header(self):
+        """Static banner printed at the top of every report"""
+        return (
+            "\n" + "="*60 + "\n"
+            "    FACULTY WELLNESS RECOMMENDATION SYSTEM\n"
+            "    Expert System Analysis Report\n"
+            + "="*60 + "\n"
+        )
+
+    def format_report_body(self, stress_level, recommendation_level=None):
+        """
+        Everything in a report that depends only on the stress level
+
+        Args:
+            stress_level: predicted level; sets the Stress Level line and
+                          the condition indicators
+            recommendation_level: level the recommendations are drawn
+                          from, if a trend escalated it (default: stress_level)
+        """
+        lines = []
+        lines.append(f"Stress Level: {self.STRESS_DISPLAY.get(stress_level, stress_level.upper())}")
 
         # Indicators from Knowledge Base
-        print("\n" + "-"*60)
-        print("CONDITION INDICATORS (Knowledge Base Facts)")
-        print("-"*60)
+        lines.append("\n" + "-"*60)
+        lines.append("CONDITION INDICATORS (Knowledge Base Facts)")
+        lines.append("-"*60)
 
         indicators = self.get_indicators(stress_level)
-        indicator_labels = {
-            'sleep_indicator': 'Sleep',
-            'workload_indicator': 'Workload',
-            'wellness_indicator': 'Wellness',
-            'meeting_indicator': 'Meetings',
-            'research_indicator': 'Research',
-            'committee_indicator': 'Committee',
-            'admin_indicator': 'Admin Tasks',
-            'balance_indicator': 'Work-Life Balance',
-            'productivity_indicator': 'Productivity',
-            'health_indicator': 'Health Risk'
-        }
-
-        for key, label in indicator_labels.items():
-            print(f"* {label}: {indicators[key]}")
+        for key, label in self.INDICATOR_LABELS.items():
+            lines.append(f"* {label}: {indicators[key]}")
 
         # Recommendations from Rules
-        print("\n" + "-"*60)
-        print("PERSONALIZED RECOMMENDATIONS (Rule-Based Reasoning)")
-        print("-"*60)
-
-        recommendations = self.get_recommendations(stress_level)
-        rec_labels = [
-            ('primary_recommendation', '1. PRIMARY ACTION'),
-            ('workload_recommendation', '2. WORKLOAD MANAGEMENT'),
-            ('wellness_recommendation', '3. WELLNESS ACTIVITIES'),
-            ('time_management_recommendation', '4. TIME MANAGEMENT'),
-            ('social_recommendation', '5. SOCIAL SUPPORT'),
-            ('preventive_recommendation', '6. PREVENTIVE MEASURES')
-        ]
-
-        for key, label in rec_labels:
-            print(f"\n{label}:")
-            print(f"   {recommendations[key]}")
+        lines.append("\n" + "-"*60)
+        lines.append("PERSONALIZED RECOMMENDATIONS (Rule-Based Reasoning)")
+        lines.append("-"*60)
+
+        recommendations = self.get_recommendations(recommendation_level or stress_level)
+        for key, label in self.RECOMMENDATION_LABELS:
+            lines.append(f"\n{label}:")
+            lines.append(f"   {recommendations[key]}")
 
         # Footer with rule explanation
-        print("\n" + "-"*60)
-        print("RULE EXPLANATION:")
-        print("The above recommendations were generated by matching the")
-        print("predicted stress level against our expert knowledge base.")
-        print("Each recommendation rule considers workload patterns,")
-        print("wellness indicators, and evidence-based interventions.")
-        print("-"*60)
-        print("\nReport generated by Faculty Wellness Expert System")
-        print("="*60)
-
-    def run(self):
-        """Main execution - read stress file and generate recommendations"""
+        lines.append("\n" + "-"*60)
+        lines.append("RULE EXPLANATION:")
+        lines.append("The above recommendations were generated by matching the")
+        lines.append("predicted stress level against our expert knowledge base.")
+        lines.append("Each recommendation rule considers workload patterns,")
+        lines.append("wellness indicators, and evidence-based interventions.")
+        lines.append("-"*60)
+        lines.append("\nReport generated by Faculty Wellness Expert System")
+        lines.append("="*60)
+        return "\n".join(lines) + "\n"
+
+    def format_report(self, faculty_id, stress_level, trend=None, peers=None, ranking=None):
+        """Build the complete wellness recommendation report as a string"""
+        level, notes = self.assess_trend(stress_level, trend)
+        report = self.format_report_header() + f"\nFaculty ID: {faculty_id}\n"
+        if trend is not None:
+            report += self.format_trend_section(trend, notes)
+        if ranking and ranking['scopes']:
+            report += self.format_ranking_section(ranking)
+        if peers:
+            report += self.format_peer_section(peers)
+        return report + self.format_report_body(stress_level, level)
+
+    @timed('generate_report')
+    def generate_report(self, faculty_id, stress_level, trend=None, peers=None, ranking=None):
+        """
+        Generate complete wellness recommendation report
+
+        With a workload_history.FacultyTrend the report gains a trend
+        section and the recommendations may be escalated (see assess_trend).
+        With a peer_index comparison it also says how similar peers at a
+        lower stress level differ, and with a percentile_index ranking
+        where the WSS and P(High) fall among peers.
+        """
+        print(self.format_report(faculty_id, stress_level, trend, peers, ranking), end='')
+        METRICS.count('reports_generated')
+
+    def run(self, peers=None, ranking=None):
+        """
+        Main execution - read stress file and generate recommendations
+
+        Args:
+            peers: optional peer_index comparison for the faculty member
+            ranking: optional percentile_index ranking for the faculty member
+        """
         print("Reading stress prediction from Python ML component...")
 
         faculty_id, stress_level = self.read_stress_file()
 
         if faculty_id and stress_level:
-            self.generate_report(faculty_id, stress_level)
+            self.generate_report(faculty_id, stress_level, peers=peers, ranking=ranking)
         else:
             print("Error: Could not read stress level from file.")
             print("Please run the stress_predictor.py first to generate the output file.")
@@ -0,0 +1,250 @@
+"""
+Counterfactual "What-if" Planner
+
+For a faculty member predicted High or Medium, finds the cheapest
+workload changes that bring the ML prediction down a level, e.g. "one
+fewer committee duty and two fewer meeting hours".
+
+The search works in WSS bin space. Each feature contributes 1-3 points,
+and moving a value inside its bin does not change the formula, so the
+only candidate edits per feature are the smallest changes that reach
+each lower-scoring bin. The full cross product of those edits (at most
+3^9 rows) is built as one array. Edit sets whose formula WSS cannot
+reach the target level, or that change too many features, are pruned.
+The survivors are then scored cheapest first, in large predict_proba
+batches, until the best plans are settled.
+
+Usage:
+    python whatif_planner.py <faculty_id> [--data dataset_with_labels.csv] [--top 5]
+"""
+
+import argparse
+import contextlib
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from validation import FEATURE_RANGES
+
+# Cost of changing each feature by one unit. None freezes a feature.
+DEFAULT_COSTS = {
+    'Subjects_Handled': 4.0,
+    'Students_Total': 0.05,
+    'Prep_Hours': 0.5,
+    'Research_Load_Hours': 0.75,
+    'Committee_Duties': 1.0,
+    'Admin_Tasks': 1.0,
+    'Meeting_Hours': 0.5,
+    'Sleep_Hours': 1.5,
+    'Weekend_Work': 1.0,
+}
+
+# Direction that lowers stress: more sleep, less of everything else
+IMPROVING_DIRECTION = {col: -1 for col in FEATURE_RANGES}
+IMPROVING_DIRECTION['Sleep_Hours'] = 1
+
+# Highest WSS of each level (see get_stress_level_from_wss)
+LEVEL_MAX_WSS = {'Low': 14, 'Medium': 20, 'High': 27}
+LOWER_LEVEL = {'High': 'Medium', 'Medium': 'Low'}
+LEVEL_RANK = {'Low': 0, 'Medium': 1, 'High': 2}
+
+
+class WhatIfPlanner:
+    """
+    Searches minimal-cost feature edits that lower the predicted level
+
+    Args:
+        predictor: FacultyStressPredictor with a loaded model
+        costs: per-unit cost of each feature (None = not changeable)
+        max_changes: most features a single plan may change
+        batch_size: rows per predict_proba call
+    """
+
+    def __init__(self, predictor, costs=None, max_changes=3, batch_size=4096):
+        self.predictor = predictor
+        self.costs = dict(DEFAULT_COSTS, **(costs or {}))
+        self.max_changes = max_changes
+        self.batch_size = batch_size
+        self.feature_columns = predictor.feature_columns
+
+    def candidate_edits(self, record):
+        """
+        Smallest value change reaching each lower-scoring WSS bin, per feature
+
+        Returns:
+            list (in feature order) of arrays of candidate values; the
+            first entry is always the current value
+        """
+        base = np.array([record[col] for col in self.feature_columns], dtype=np.float64)
+        candidates = []
+        for i, col in enumerate(self.feature_columns):
+            current = base[i]
+            options = [current]
+            if self.costs.get(col) is not None:
+                low, high = FEATURE_RANGES[col]
+                step = IMPROVING_DIRECTION[col]
+                end = low - 1 if step < 0 else high + 1
+                values = np.arange(current + step, end, step, dtype=np.float64)
+                if len(values):
+                    # Vary only this feature and score every reachable value at once
+                    rows = np.repeat(base[None, :], len(values), axis=0)
+                    rows[:, i] = values
+                    points = self.predictor.calculate_wss_batch(rows)
+                    current_points = self.predictor.calculate_wss_batch(base[None, :])[0]
+                    seen = {current_points}
+                    for value, score in zip(values, points):
+                        # Values are ordered by distance, so the first hit per score is cheapest
+                        if score < current_points and score not in seen:
+                            seen.add(score)
+                            options.append(value)
+            candidates.append(np.array(options))
+        return candidates
+
+    def plan(self, record, target=None, top_k=5):
+        """
+        Rank minimal-change plans that bring the prediction down
+
+        Args:
+            record: dict with the nine feature values
+            target: level to reach or beat (default: one below the current)
+            top_k: number of plans to return
+
+        Returns:
+            dict with the current prediction and a list of plans, each
+            with its changes, cost, WSS, formula level, ML prediction and
+            probabilities; plans that just add edits to a cheaper
+            successful plan are dropped
+        """
+        base = np.array([record[col] for col in self.feature_columns], dtype=np.float64)
+        current = self._predict(base[None, :])
+        current_level = current[0][0]
+        target = target or LOWER_LEVEL.get(current_level)
+        result = {
+            'current_level': current_level,
+            'current_wss': int(self.predictor.calculate_wss_batch(base[None, :])[0]),
+            'target_level': target,
+            'candidates': 0,
+            'scored': 0,
+            'plans': [],
+        }
+        if target is None:
+            return result
+
+        # Cross product of per-feature options, as indices into each option list
+        options = self.candidate_edits(record)
+        grids = np.meshgrid(*[np.arange(len(o)) for o in options], indexing='ij')
+        choice = np.stack([g.ravel() for g in grids], axis=1)
+        values = np.stack([options[i][choice[:, i]] for i in range(len(options))], axis=1)
+        changed = choice > 0
+        result['candidates'] = len(values)
+
+        # Prune in WSS bin space: too many edits, or formula cannot reach the target
+        keep = changed.any(axis=1) & (changed.sum(axis=1) <= self.max_changes)
+        wss = self.predictor.calculate_wss_batch(values)
+        keep &= wss <= LEVEL_MAX_WSS[target]
+        values, changed, wss = values[keep], changed[keep], wss[keep]
+
+        unit_costs = np.array([self.costs.get(col) or 0.0 for col in self.feature_columns])
+        cost = (np.abs(values - base) * unit_costs).sum(axis=1)
+        order = np.lexsort((changed.sum(axis=1), cost))
+        values, changed, wss, cost = values[order], changed[order], wss[order], cost[order]
+
+        plans = []
+        accepted_masks = []
+        target_rank = LEVEL_RANK[target]
+        for start in range(0, len(values), self.batch_size):
+            stop = start + self.batch_size
+            if len(plans) >= top_k and cost[start] > plans[-1]['cost']:
+                break
+            labels, proba = self._predict(values[start:stop])
+            result['scored'] += min(stop, len(values)) - start
+            for j, label in enumerate(labels):
+                if LEVEL_RANK[label] > target_rank:
+                    continue
+                row = start + j
+                mask = changed[row]
+                if any(not (accepted & ~mask).any() for accepted in accepted_masks):
+                    # Superset of a cheaper plan that already works
+                    continue
+                accepted_masks.append(mask)
+                plans.append(self._describe(base, values[row], cost[row], wss[row], label, proba[j]))
+                if len(plans) >= top_k:
+                    break
+        result['plans'] = plans[:top_k]
+        return result
+
+    def _predict(self, values):
+        """Labels and class-probability dicts for a feature matrix"""
+        model = self.predictor.model
+        frame = pd.DataFrame(values, columns=self.feature_columns)
+        proba = model.predict_proba(frame)
+        labels = model.classes_[proba.argmax(axis=1)]
+        return labels, [dict(zip(model.classes_, p)) for p in proba]
+
+    def _describe(self, base, values, cost, wss, label, probabilities):
+        changes = {
+            col: (_as_number(base[i]), _as_number(values[i]))
+            for i, col in enumerate(self.feature_columns) if values[i] != base[i]
+        }
+        return {
+            'changes': changes,
+            'cost': float(cost),
+            'wss': int(wss),
+            'formula_level': self.predictor.get_stress_level_from_wss(wss),
+            'ml_prediction': label,
+            'probabilities': probabilities,
+        }
+
+
+def _as_number(value):
+    return int(value) if float(value).is_integer() else float(value)
+
+
+def format_plan(plan):
+    """One readable line per plan"""
+    edits = ", ".join(f"{col} {old} -> {new}" for col, (old, new) in plan['changes'].items())
+    return (f"cost {plan['cost']:5.2f}  WSS {plan['wss']:2d}  ML {plan['ml_prediction']:<6s}  "
+            f"{edits}")
+
+
+def main():
+    """Main entry point"""
+    from stress_predictor import FacultyStressPredictor
+
+    parser = argparse.ArgumentParser(description="Smallest workload changes that lower stress")
+    parser.add_argument('faculty_id')
+    parser.add_argument('--data', default='dataset_with_labels.csv')
+    parser.add_argument('--model', default='stress_model.joblib')
+    parser.add_argument('--top', type=int, default=5)
+    parser.add_argument('--max-changes', type=int, default=3)
+    args = parser.parse_args()
+
+    predictor = FacultyStressPredictor()
+    with contextlib.redirect_stdout(sys.stderr):
+        predictor.load_model(args.model)
+    df = pd.read_csv(args.data)
+    rows = df[df['Faculty_ID'] == args.faculty_id]
+    if rows.empty:
+        sys.exit(f"Faculty ID '{args.faculty_id}' not found in {args.data}")
+    record = rows.iloc[0][predictor.feature_columns].to_dict()
+
+    start = time.perf_counter()
+    result = WhatIfPlanner(predictor, max_changes=args.max_changes).plan(record, top_k=args.top)
+    elapsed = time.perf_counter() - start
+
+    print(f"{args.faculty_id}: {result['current_level']} (WSS {result['current_wss']})")
+    if result['target_level'] is None:
+        print("Already at Low stress; nothing to plan.")
+        return
+    print(f"Plans to reach {result['target_level']} or lower "
+          f"({result['candidates']} edit sets, {result['scored']} scored, {elapsed:.3f}s):")
+    for plan in result['plans']:
+        print("  " + format_plan(plan))
+    if not result['plans']:
+        print("  No plan found within the allowed number of changes.")
+
+
+if __name__ == "__main__":
+    main()
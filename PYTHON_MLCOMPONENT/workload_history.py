@@ -0,0 +1,366 @@
+"""
+Longitudinal Workload History with Rolling Stress Trends
+
+Stress is a trend, not a single snapshot. Weekly workload snapshots (the
+nine features, the WSS and the ML prediction) are appended to one
+append-only CSV log per deployment, and every append updates that
+faculty member's rolling aggregates in O(1):
+
+    moving average WSS   over the last `window` weeks (running sum)
+    WSS slope            least-squares slope per week over the same window
+                         (running sums of t, t^2, y and t*y)
+    High streak          consecutive weeks predicted High
+
+Trends are never rebuilt by re-reading old CSVs. checkpoint() saves the
+aggregates together with the log offset they cover, so opening the
+history replays only the records appended after the last checkpoint.
+
+Usage:
+    python workload_history.py record <workload.csv> [--week 2026-10-12] [--history workload_history.csv]
+    python workload_history.py show <faculty_id> [--history workload_history.csv]
+"""
+
+import argparse
+import contextlib
+import csv
+import datetime
+import io
+import json
+import os
+import sys
+from collections import deque
+
+from validation import FEATURE_RANGES
+
+DEFAULT_HISTORY = 'workload_history.csv'
+DEFAULT_WINDOW = 4
+
+FEATURE_COLUMNS = list(FEATURE_RANGES)
+LOG_COLUMNS = ['Faculty_ID', 'Week'] + FEATURE_COLUMNS + ['WSS', 'Stress_Level']
+
+
+def week_start(week):
+    """
+    Monday of the week containing `week`
+
+    Args:
+        week: datetime.date/datetime or 'YYYY-MM-DD' string
+    """
+    if isinstance(week, str):
+        week = datetime.date.fromisoformat(week)
+    elif isinstance(week, datetime.datetime):
+        week = week.date()
+    return week - datetime.timedelta(days=week.weekday())
+
+
+def week_number(week):
+    """Consecutive integer per week (Monday's ordinal // 7)"""
+    return week_start(week).toordinal() // 7
+
+
+def week_date(number):
+    """Monday of a week_number (day ordinal 1 is a Monday)"""
+    return datetime.date.fromordinal(number * 7 + 1)
+
+
+class FacultyTrend:
+    """Rolling aggregates for one faculty member, updated in O(1) per week"""
+
+    __slots__ = ('window', 'values', 'sum_t', 'sum_tt', 'sum_y', 'sum_ty',
+                 'first_week', 'last_week', 'last_level', 'high_streak', 'count')
+
+    def __init__(self, window=DEFAULT_WINDOW):
+        self.window = window
+        # (relative week, WSS) pairs inside the window
+        self.values = deque()
+        self.sum_t = self.sum_tt = self.sum_y = self.sum_ty = 0
+        self.first_week = None
+        self.last_week = None
+        self.last_level = None
+        self.high_streak = 0
+        self.count = 0
+
+    def add(self, week, wss, stress_level):
+        """
+        Add the next weekly snapshot
+
+        Args:
+            week: week_number of the snapshot; must be after the last one
+            wss: Workload Stress Score
+            stress_level: predicted level ('Low', 'Medium', 'High')
+        """
+        if self.last_week is not None and week <= self.last_week:
+            raise ValueError(f"History is append-only: week {week} is not after {self.last_week}")
+        if self.first_week is None:
+            self.first_week = week
+        t = week - self.first_week
+
+        # Weeks outside the window (including skipped weeks) drop out
+        while self.values and self.values[0][0] <= t - self.window:
+            old_t, old_y = self.values.popleft()
+            self._accumulate(old_t, old_y, -1)
+        self.values.append((t, wss))
+        self._accumulate(t, wss, 1)
+
+        consecutive = self.last_week is not None and week == self.last_week + 1
+        if str(stress_level).lower() == 'high':
+            self.high_streak = self.high_streak + 1 if consecutive or self.high_streak == 0 else 1
+        else:
+            self.high_streak = 0
+        self.last_week = week
+        self.last_level = stress_level
+        self.count += 1
+
+    def _accumulate(self, t, y, sign):
+        self.sum_t += sign * t
+        self.sum_tt += sign * t * t
+        self.sum_y += sign * y
+        self.sum_ty += sign * t * y
+
+    @property
+    def moving_average(self):
+        """Mean WSS over the weeks in the window"""
+        return self.sum_y / len(self.values) if self.values else None
+
+    @property
+    def slope(self):
+        """Least-squares WSS change per week over the window (0 with one point)"""
+        n = len(self.values)
+        denominator = n * self.sum_tt - self.sum_t * self.sum_t
+        if n < 2 or denominator == 0:
+            return 0.0
+        return (n * self.sum_ty - self.sum_t * self.sum_y) / denominator
+
+    @property
+    def last_wss(self):
+        return self.values[-1][1] if self.values else None
+
+    def summary(self):
+        """Plain dict of the current aggregates"""
+        return {
+            'weeks_recorded': self.count,
+            'last_week': None if self.last_week is None
+            else week_date(self.last_week).isoformat(),
+            'last_level': self.last_level,
+            'last_wss': self.last_wss,
+            'moving_average_wss': self.moving_average,
+            'wss_slope': self.slope,
+            'high_streak': self.high_streak,
+        }
+
+    def to_state(self):
+        return [self.window, list(self.values), self.first_week, self.last_week,
+                self.last_level, self.high_streak, self.count]
+
+    @classmethod
+    def from_state(cls, state):
+        window, values, first_week, last_week, last_level, high_streak, count = state
+        trend = cls(window)
+        for t, y in values:
+            trend.values.append((t, y))
+            trend._accumulate(t, y, 1)
+        trend.first_week = first_week
+        trend.last_week = last_week
+        trend.last_level = last_level
+        trend.high_streak = high_streak
+        trend.count = count
+        return trend
+
+
+class WorkloadHistory:
+    """
+    Append-only weekly history log with per-faculty rolling trends
+
+    Only the trends are kept in memory; the raw snapshots stay in the log.
+    """
+
+    def __init__(self, path=DEFAULT_HISTORY, window=DEFAULT_WINDOW):
+        self.path = path
+        self.state_path = f"{path}.state.json"
+        self.window = window
+        self.trends = {}
+        self._offset = 0
+        self._load()
+
+    def _load(self):
+        """Restore the last checkpoint, then replay records appended since"""
+        if os.path.exists(self.state_path):
+            with open(self.state_path) as f:
+                state = json.load(f)
+            if state.get('window') == self.window and state.get('offset', 0) <= _file_size(self.path):
+                self.trends = {fid: FacultyTrend.from_state(s) for fid, s in state['trends'].items()}
+                self._offset = state['offset']
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, newline='', encoding='utf-8') as f:
+            if self._offset:
+                f.seek(self._offset)
+                reader = csv.DictReader(f, fieldnames=LOG_COLUMNS)
+            else:
+                reader = csv.DictReader(f)
+            for row in reader:
+                self._update(row['Faculty_ID'], week_number(row['Week']),
+                             int(row['WSS']), row['Stress_Level'])
+        self._offset = _file_size(self.path)
+
+    def _update(self, faculty_id, week, wss, stress_level):
+        trend = self.trends.get(faculty_id)
+        if trend is None:
+            trend = self.trends[faculty_id] = FacultyTrend(self.window)
+        trend.add(week, wss, stress_level)
+        return trend
+
+    def append(self, faculty_id, week, features, wss, stress_level):
+        """
+        Record one weekly snapshot and update the faculty member's trend
+
+        Args:
+            faculty_id: Faculty ID
+            week: any date in the week (date or 'YYYY-MM-DD')
+            features: dict with the nine feature values
+            wss: Workload Stress Score
+            stress_level: predicted stress level
+
+        Returns:
+            The updated FacultyTrend
+        """
+        return self.append_many([faculty_id], week, [features], [wss], [stress_level])[0]
+
+    def append_many(self, faculty_ids, week, features, wss, stress_levels):
+        """
+        Record one week for many faculty with a single write
+
+        Args:
+            faculty_ids: sequence of Faculty IDs
+            week: any date in the week (date or 'YYYY-MM-DD')
+            features: sequence of dicts (or a DataFrame) with the feature values
+            wss: sequence of WSS scores
+            stress_levels: sequence of predicted levels
+
+        Returns:
+            List of updated FacultyTrend objects
+        """
+        start = week_start(week)
+        number = start.toordinal() // 7
+        if hasattr(features, 'columns'):
+            features = features[FEATURE_COLUMNS].to_numpy().tolist()
+        else:
+            features = [[row[col] for col in FEATURE_COLUMNS] for row in features]
+
+        # Validate against the trends first so a rejected batch writes nothing
+        if len(set(faculty_ids)) != len(faculty_ids):
+            raise ValueError("A week can hold only one snapshot per faculty member")
+        for faculty_id in faculty_ids:
+            trend = self.trends.get(faculty_id)
+            if trend is not None and number <= trend.last_week:
+                raise ValueError(f"History is append-only: {faculty_id} already has week "
+                                 f"{week_date(trend.last_week)}")
+
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        new_file = _file_size(self.path) == 0
+        if new_file:
+            writer.writerow(LOG_COLUMNS)
+        week_text = start.isoformat()
+        for faculty_id, values, score, level in zip(faculty_ids, features, wss, stress_levels):
+            writer.writerow([faculty_id, week_text, *values, int(score), level])
+        with open(self.path, 'a', newline='', encoding='utf-8') as f:
+            f.write(buffer.getvalue())
+        self._offset = _file_size(self.path)
+
+        return [self._update(fid, number, int(score), level)
+                for fid, score, level in zip(faculty_ids, wss, stress_levels)]
+
+    def trend(self, faculty_id):
+        """Current FacultyTrend, or None for an unknown faculty member"""
+        return self.trends.get(faculty_id)
+
+    def records(self, faculty_id):
+        """All logged snapshots of one faculty member (reads the log)"""
+        if not os.path.exists(self.path):
+            return []
+        with open(self.path, newline='', encoding='utf-8') as f:
+            return [row for row in csv.DictReader(f) if row['Faculty_ID'] == faculty_id]
+
+    def checkpoint(self):
+        """Save the trends and the log offset they cover"""
+        state = {
+            'window': self.window,
+            'offset': self._offset,
+            'trends': {fid: trend.to_state() for fid, trend in self.trends.items()},
+        }
+        tmp_path = f"{self.state_path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(state, f)
+        os.replace(tmp_path, self.state_path)
+
+
+def _file_size(path):
+    return os.path.getsize(path) if os.path.exists(path) else 0
+
+
+def record_week(predictor, history, df, week):
+    """
+    Score a week's workload roster and append it to the history
+
+    Args:
+        predictor: FacultyStressPredictor with a loaded model
+        history: WorkloadHistory
+        df: DataFrame with Faculty_ID and the feature columns
+        week: any date in the week
+
+    Returns:
+        List of updated FacultyTrend objects
+    """
+    wss = predictor.calculate_wss_batch(df)
+    predictions = predictor.predict(df)
+    return history.append_many(df['Faculty_ID'].tolist(), week, df, wss, predictions)
+
+
+def main():
+    """Main entry point"""
+    import pandas as pd
+    from stress_predictor import FacultyStressPredictor
+    from wellness_expert_python import WellnessExpertSystem
+
+    parser = argparse.ArgumentParser(description="Weekly workload history and stress trends")
+    parser.add_argument('--history', default=DEFAULT_HISTORY)
+    parser.add_argument('--window', type=int, default=DEFAULT_WINDOW, help="Rolling window (weeks)")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    record = subparsers.add_parser('record', help="Score a roster and append it as one week")
+    record.add_argument('input', help="Workload CSV with Faculty_ID")
+    record.add_argument('--week', default=datetime.date.today().isoformat(),
+                        help="Any date in the week (default: today)")
+    record.add_argument('--model', default='stress_model.joblib')
+
+    show = subparsers.add_parser('show', help="Print a faculty member's trend and report")
+    show.add_argument('faculty_id')
+    args = parser.parse_args()
+
+    history = WorkloadHistory(args.history, args.window)
+
+    if args.command == 'record':
+        predictor = FacultyStressPredictor()
+        with contextlib.redirect_stdout(sys.stderr):
+            predictor.load_model(args.model)
+        df = pd.read_csv(args.input)
+        trends = record_week(predictor, history, df, args.week)
+        history.checkpoint()
+        rising = sum(1 for t in trends if t.slope > 0)
+        streaks = sum(1 for t in trends if t.high_streak >= 2)
+        print(f"Recorded week of {week_start(args.week)} for {len(trends)} faculty "
+              f"({rising} rising, {streaks} with 2+ weeks High)")
+        return
+
+    trend = history.trend(args.faculty_id)
+    if trend is None:
+        sys.exit(f"No history for faculty '{args.faculty_id}'")
+    for key, value in trend.summary().items():
+        print(f"  {key}: {value}")
+    expert_system = WellnessExpertSystem()
+    expert_system.generate_report(args.faculty_id, trend.last_level.lower(), trend=trend)
+
+
+if __name__ == "__main__":
+    main()
@@ -48,6 +48,22 @@ FACTS
     wellness_indicator(medium, "Moderate wellness concerns - Some imbalance detected").
     wellness_indicator(high, "Critical wellness state - Immediate intervention needed").
 
+    meeting_indicator(low, "Reasonable meeting schedule - Adequate focus time").
+    meeting_indicator(medium, "Moderate meeting load - Some fragmentation of work time").
+    meeting_indicator(high, "Excessive meetings - Significant work fragmentation").
+
+    research_indicator(low, "Light research commitment - Time for other activities").
+    research_indicator(medium, "Moderate research load - Balanced with teaching").
+    research_indicator(high, "Heavy research demands - May conflict with teaching duties").
+
+    committee_indicator(low, "Minimal committee duties - Focus on core responsibilities").
+    committee_indicator(medium, "Standard committee involvement - Manageable service load").
+    committee_indicator(high, "Heavy committee burden - Service overload risk").
+
+    admin_indicator(low, "Light administrative load - Focus on academic work").
+    admin_indicator(medium, "Moderate admin tasks - Balance maintained").
+    admin_indicator(high, "Heavy administrative burden - Core duties may suffer").
+
     balance_indicator(low, "Healthy work-life balance - Personal time preserved").
     balance_indicator(medium, "Strained balance - Weekend work occurring").
     balance_indicator(high, "Poor work-life balance - Chronic weekend work").
@@ -60,45 +76,29 @@ FACTS
     health_indicator(medium, "Moderate health risk - Monitor for symptoms").
     health_indicator(high, "High health risk - Physical symptoms likely").
 
-    meeting_indicator(low, "Reasonable meeting load - Time for focused work").
-    meeting_indicator(medium, "High meeting frequency - Limited focused work time").
-    meeting_indicator(high, "Excessive meetings - Minimal time for core responsibilities").
-
-    research_indicator(low, "Adequate research time - Progress on scholarly work").
-    research_indicator(medium, "Limited research time - Scholarly work at risk").
-    research_indicator(high, "Insufficient research time - Scholarly productivity compromised").
-
-    committee_indicator(low, "Manageable committee load - Service commitments balanced").
-    committee_indicator(medium, "High committee involvement - Service time increasing").
-    committee_indicator(high, "Excessive committee work - Service overwhelming core duties").
-
-    admin_indicator(low, "Reasonable administrative load - Administrative tasks manageable").
-    admin_indicator(medium, "Elevated administrative tasks - Administrative burden growing").
-    admin_indicator(high, "Excessive administrative load - Administrative work dominating schedule").
-
-    primary_recommendation(low, "MAINTAIN: Continue current routine and practices.").
-    primary_recommendation(medium, "MONITOR: Implement time-blocking strategies.").
-    primary_recommendation(high, "URGENT: Request immediate workload adjustment.").
+    primary_recommendation(low, "MAINTAIN: Continue current routine and practices. Your stress management is effective.").
+    primary_recommendation(medium, "MONITOR: Implement time-blocking strategies. Track your energy levels throughout the week.").
+    primary_recommendation(high, "URGENT: Request immediate workload adjustment. Consider delegating tasks and reducing commitments.").
 
-    workload_recommendation(low, "Keep workload at current levels.").
-    workload_recommendation(medium, "Review task priorities weekly.").
-    workload_recommendation(high, "Request reduction in teaching load or number of advisees.").
+    workload_recommendation(low, "Keep workload at current levels. Consider taking on mentorship roles.").
+    workload_recommendation(medium, "Review task priorities weekly. Identify tasks that can be delegated or postponed.").
+    workload_recommendation(high, "Request reduction in teaching load or number of advisees. Decline new committee assignments.").
 
-    wellness_recommendation(low, "Continue regular exercise and social activities.").
-    wellness_recommendation(medium, "Schedule 15-minute breaks every 2 hours.").
-    wellness_recommendation(high, "Implement daily wellness breaks. Consider counseling services.").
+    wellness_recommendation(low, "Continue regular exercise and social activities. Consider preventive health checkups.").
+    wellness_recommendation(medium, "Schedule 15-minute breaks every 2 hours. Add one wellness activity per week.").
+    wellness_recommendation(high, "Implement daily wellness breaks. Consider counseling services. Schedule health assessment.").
 
-    time_management_recommendation(low, "Optimize your schedule for long-term sustainability.").
-    time_management_recommendation(medium, "Use calendar blocking for focused work.").
-    time_management_recommendation(high, "Audit all time commitments immediately.").
+    time_management_recommendation(low, "Optimize your schedule for long-term sustainability. Build buffer time for unexpected tasks.").
+    time_management_recommendation(medium, "Use calendar blocking for focused work. Batch similar tasks together. Set meeting-free days.").
+    time_management_recommendation(high, "Audit all time commitments immediately. Cancel non-essential meetings. Request deadline extensions.").
 
-    social_recommendation(low, "Maintain professional networks.").
-    social_recommendation(medium, "Connect with peer support groups.").
-    social_recommendation(high, "Seek immediate supervisor support. Contact wellness resources.").
+    social_recommendation(low, "Maintain professional networks. Share best practices with colleagues.").
+    social_recommendation(medium, "Connect with peer support groups. Discuss workload concerns with department head.").
+    social_recommendation(high, "Seek immediate supervisor support. Contact faculty wellness resources. Consider professional counseling.").
 
-    preventive_recommendation(low, "Plan ahead for busy periods.").
-    preventive_recommendation(medium, "Establish early warning signs for stress.").
-    preventive_recommendation(high, "Immediate stress intervention needed.").
+    preventive_recommendation(low, "Plan ahead for busy periods. Build resilience through varied activities.").
+    preventive_recommendation(medium, "Establish early warning signs for stress. Create contingency plans for high-demand periods.").
+    preventive_recommendation(high, "Immediate stress intervention needed. Establish recovery plan with clear milestones.").
 
 /* --------------------------
 DISPLAY PREDICATES